@@ -24,6 +24,7 @@ setup(
     url=GIT_REPO,
     packages=find_packages(),
     install_requires=reqs,
+    extras_require={"parquet": ["pyarrow"], "zarr": ["zarr>=3"]},
     tests_require=["pytest", "pytest-cov", "nccmp", "ImageHash"],
     classifiers=[
         "Development Status :: 2 - ???",
@@ -1,8 +1,14 @@
+import hashlib
+import json
+
 from ukcp_dp.constants import (
     InputType,
     INPUT_TYPES,
     INPUT_TYPES_FLOAT,
     INPUT_TYPES_FREE_TEXT,
+    INPUT_TYPES_ORDERED,
+    INPUT_TYPES_OUTPUT_FORMAT,
+    INPUT_TYPES_RENDERING,
     INPUT_TYPES_SINGLE_VALUE,
     INPUT_TYPES_MULTI_VALUE,
     FONT_SIZE_SMALL,
@@ -128,19 +134,57 @@ class InputData:
 
         for input_type in INPUT_TYPES:
             try:
-                if input_type in INPUT_TYPES_SINGLE_VALUE:
-                    self.set_value(input_type, inputs[input_type])
-                elif input_type in INPUT_TYPES_MULTI_VALUE:
-                    self.set_values(input_type, inputs[input_type])
-                elif input_type == InputType.AREA:
-                    self._set_area(inputs[InputType.AREA])
-                elif input_type in INPUT_TYPES_FREE_TEXT:
-                    self.set_text(input_type, inputs[input_type])
-                elif input_type in INPUT_TYPES_FLOAT:
-                    self.set_float(input_type, inputs[input_type])
+                value = inputs[input_type]
             except KeyError:
                 # looks like this 'type' was not set
-                pass
+                continue
+            self._set_input(input_type, value)
+
+    def derive(self, **overrides):
+        """
+        Get a new InputData based on this one, with some of the inputs changed.
+
+        The new instance shares the vocabulary, the allowed values and the
+        already validated values of the unchanged inputs with this instance.
+        Only the overridden inputs are validated. This instance is not
+        altered.
+
+        @param overrides: the inputs to change, keyed by the value of the
+            InputType, i.e. time_period="jan"
+
+        @return a new InputData
+
+        @throws Exception
+        """
+        derived = InputData(self.vocab)
+        derived.allowed_values = dict(self.allowed_values)
+        derived.validated_inputs = dict(self.validated_inputs)
+        for input_type, value in overrides.items():
+            if input_type not in INPUT_TYPES:
+                raise Exception("Unknown input type: {}.".format(input_type))
+            derived._set_input(input_type, value)
+        return derived
+
+    def _set_input(self, input_type, value):
+        """
+        Validate and set the value(s) for the given type, using the setter
+        that is appropriate for the type.
+
+        @param input_type (InputType): the type of the value(s) to set
+        @param value (obj): the value(s) to set
+
+        @throws Exception
+        """
+        if input_type in INPUT_TYPES_SINGLE_VALUE:
+            self.set_value(input_type, value)
+        elif input_type in INPUT_TYPES_MULTI_VALUE:
+            self.set_values(input_type, value)
+        elif input_type == InputType.AREA:
+            self._set_area(value)
+        elif input_type in INPUT_TYPES_FREE_TEXT:
+            self.set_text(input_type, value)
+        elif input_type in INPUT_TYPES_FLOAT:
+            self.set_float(input_type, value)
 
     def set_value(self, value_type, value):
         """
@@ -344,10 +388,11 @@ class InputData:
 
                 # currently the names are stored as 'labels' in the shape files
                 # so need to convert the label to the value
-                area_label = area_name
-                area_name = self.vocab.get_collection_term_value(area_type, area_name)
-                if area_name is None:
+                area_value = self.vocab.get_collection_term_value(area_type, area_name)
+                if area_value is None:
                     raise Exception("Unknown area name: {}.".format(area_name))
+                area_name = area_value
+                area_label = self.vocab.get_collection_term_label(area_type, area_name)
 
             self.validated_inputs[InputType.AREA] = [
                 area_type,
@@ -407,6 +452,80 @@ class InputData:
             return FONT_SIZE_LARGE
         return None
 
+    def get_data_selection_fingerprint(self):
+        """
+        Get a fingerprint of the inputs that select and process the data, i.e.
+        all of the inputs other than those used for rendering and output
+        formats.
+
+        Two sets of inputs that select the same data will have the same
+        fingerprint, irrespective of the order in which the values were
+        provided. This should be called after the inputs have been validated,
+        as the validator may set default values.
+
+        @return a str containing a hex digest
+        """
+        return self._get_fingerprint(
+            [
+                input_type
+                for input_type in self.validated_inputs
+                if input_type not in INPUT_TYPES_RENDERING
+                and input_type not in INPUT_TYPES_OUTPUT_FORMAT
+            ]
+        )
+
+    def get_rendering_fingerprint(self):
+        """
+        Get a fingerprint of the inputs that only alter the appearance of a
+        plot, see INPUT_TYPES_RENDERING.
+
+        @return a str containing a hex digest
+        """
+        return self._get_fingerprint(INPUT_TYPES_RENDERING)
+
+    def get_output_format_fingerprint(self):
+        """
+        Get a fingerprint of the inputs that set the format of the output
+        files, see INPUT_TYPES_OUTPUT_FORMAT.
+
+        @return a str containing a hex digest
+        """
+        return self._get_fingerprint(INPUT_TYPES_OUTPUT_FORMAT)
+
+    def _get_fingerprint(self, input_types):
+        """
+        Get a fingerprint of the values of the given input types.
+
+        The values of multi value inputs are sorted, unless their order is
+        significant, see INPUT_TYPES_ORDERED. Input types that have not been
+        set are ignored.
+
+        @param input_types (list(InputType)): the input types to include
+
+        @return a str containing a hex digest
+        """
+        values = {}
+        for input_type in input_types:
+            if input_type not in self.validated_inputs:
+                continue
+            if input_type == InputType.AREA:
+                area = self.get_area()
+                if isinstance(area, list):
+                    # the coordinates of a point or bbox, i.e. 100 and 100.0
+                    # select the same data
+                    area = [float(coordinate) for coordinate in area]
+                value = [self.get_area_type(), area]
+            else:
+                value = self.get_value(input_type)
+                if isinstance(value, list) and input_type not in INPUT_TYPES_ORDERED:
+                    value = sorted(value, key=str)
+            values[input_type] = value
+
+        canonical = json.dumps(
+            values, sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
     def _set_allowed_values(self, allowed_values):
         for key in allowed_values.keys():
             if key in INPUT_TYPES:
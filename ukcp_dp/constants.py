@@ -109,6 +109,27 @@ INPUT_TYPES.append(InputType.PLOT_TITLE)
 INPUT_TYPES.append(InputType.Y_AXIS_MAX)
 INPUT_TYPES.append(InputType.Y_AXIS_MIN)
 
+# inputs that only alter the appearance of a plot
+INPUT_TYPES_RENDERING = [
+    InputType.COLOUR_MODE,
+    InputType.FONT_SIZE,
+    InputType.HIGHLIGHTED_ENSEMBLE_MEMBERS,
+    InputType.IMAGE_SIZE,
+    InputType.LEGEND_POSITION,
+    InputType.ORDER_BY_MEAN,
+    InputType.PLOT_TITLE,
+    InputType.SHOW_BOUNDARIES,
+    InputType.SHOW_LABELS,
+    InputType.Y_AXIS_MAX,
+    InputType.Y_AXIS_MIN,
+]
+
+# inputs that only alter the format of the output files
+INPUT_TYPES_OUTPUT_FORMAT = [InputType.DATA_FORMAT, InputType.IMAGE_FORMAT]
+
+# multi value inputs where the order of the values is significant
+INPUT_TYPES_ORDERED = [InputType.VARIABLE]
+
 IRIS_LOAD_TIMEOUT_SECONDS = 300
 
 FONT_SIZE_SMALL = 12
@@ -218,7 +239,9 @@ PlotType = enum(
 )
 
 # Data formats
-DataFormat = enum(CSV="csv", NET_CDF="netcdf", SHAPEFILE="shp")
+DataFormat = enum(
+    CSV="csv", NET_CDF="netcdf", PARQUET="parquet", SHAPEFILE="shp", ZARR="zarr"
+)
 
 # Data types
 DataType = enum(CDF="cdf", PDF="pdf")
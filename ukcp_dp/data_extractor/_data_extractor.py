@@ -35,7 +35,11 @@ from ukcp_dp.exception import (
     UKCPDPDataNotFoundException,
     UKCPDPInvalidParameterException,
 )
-from ukcp_dp.utils import get_baseline_range, get_spatial_resolution_m
+from ukcp_dp.utils import (
+    get_baseline_range,
+    get_netcdf_region_name,
+    get_spatial_resolution_m,
+)
 from ukcp_dp.vocab_manager import get_months
 
 
@@ -48,7 +52,7 @@ class DataExtractor:
     criteria.
     """
 
-    def __init__(self, file_lists, input_data, plot_settings):
+    def __init__(self, file_lists, input_data, plot_settings, cube_cache=None):
         """
         Initialise the DataExtractor.
 
@@ -61,10 +65,15 @@ class DataExtractor:
                     full paths
         @param input_data (InputData) an object containing user defined values
         @param plot_settings (StandardMap): an object containing plot settings
+        @param cube_cache (dict): optional, a dict used to hold the cubes loaded
+            from the files. If the same dict is passed to a number of
+            DataExtractors, i.e. for inputs that only differ in their
+            selection criteria, then each set of files is only loaded once.
         """
         self.file_lists = file_lists
         self.input_data = input_data
         self.plot_settings = plot_settings
+        self.cube_cache = cube_cache
         self.cubes = self._get_main_cubes()
         self.overlay_cube = self._get_overlay_cube()
         LOG.debug("DataExtractor __init__ finished")
@@ -302,6 +311,44 @@ class DataExtractor:
 
         LOG.debug("_load_cubes from %s file paths", len(file_list))
 
+        if self.cube_cache is None:
+            return self._load_cubes_from_files(
+                file_list, overlay_probability_levels, collection
+            )
+
+        # the loaded cube also depends on the inputs used when loading
+        key = (
+            tuple(file_list),
+            overlay_probability_levels,
+            collection,
+            self.input_data.get_value(InputType.GWL),
+            self.input_data.get_value(InputType.TEMPORAL_AVERAGE_TYPE),
+        )
+        try:
+            cube = self.cube_cache[key]
+            LOG.debug("_load_cubes, using cached cube")
+        except KeyError:
+            cube = self._load_cubes_from_files(
+                file_list, overlay_probability_levels, collection
+            )
+            self.cube_cache[key] = cube
+
+        if cube is None:
+            return None
+        # the cached cube must not be altered by the subsequent processing
+        return cube.copy()
+
+    def _load_cubes_from_files(self, file_list, overlay_probability_levels, collection):
+        """
+        Get an iris cube based on the given files.
+
+        @param file_list (list[str]): a list of file name to retrieve data from
+        @param overlay_probability_levels (boolean): if True only include the
+            10th, 50th and 90th percentile data
+        @param collection(str): the name of the collection being processed
+
+        @return an iris cube, maybe 'None' if overlay_probability_levels=True
+        """
         if (
             collection == COLLECTION_PROB
             and self.input_data.get_value(InputType.GWL) is not None
@@ -590,10 +637,7 @@ class DataExtractor:
         elif self.input_data.get_area_type() == AreaType.RIVER_BASIN:
             if self.input_data.get_area() != "all":
 
-                if self.input_data.get_area_label() == "Orkney and Shetland":
-                    basin = "Orkney and Shetlands"
-                else:
-                    basin = self.input_data.get_area_label()
+                basin = get_netcdf_region_name(self.input_data.get_area_label())
 
                 if collection in [
                     COLLECTION_CPM,
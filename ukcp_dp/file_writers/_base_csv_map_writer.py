@@ -8,6 +8,7 @@ import logging
 import numpy as np
 from ukcp_dp.constants import InputType, COLLECTION_OBS
 from ukcp_dp.file_writers._base_csv_writer import BaseCsvWriter
+from ukcp_dp.file_writers._utils import write_rows
 
 
 LOG = logging.getLogger(__name__)
@@ -62,34 +63,31 @@ class BaseCsvMapWriter(BaseCsvWriter):
         end_time = datetime.now()
         LOG.debug("data extracted from cube in %s", end_time - start_time)
 
-        geo_region_coords = cube.coord(var_name="geo_region")[:]
+        geo_region_coords = cube.coord(var_name="geo_region").points
 
         data = np.transpose(data)
 
-        with open(output_data_file_path, "a") as output_data_file:
+        with self.sink.open(output_data_file_path, "a") as output_data_file:
 
-            for geo_region in range(data.shape[0] - 1, -1, -1):
-                if self.input_data.get_value(InputType.COLLECTION) == COLLECTION_OBS:
+            if self.input_data.get_value(InputType.COLLECTION) == COLLECTION_OBS:
+                for geo_region in range(data.shape[0] - 1, -1, -1):
                     output_data_file.write(
-                        f"{geo_region_coords[geo_region].cell(0).point},"
+                        f"{geo_region_coords[geo_region]},"
                         f"{data[:][geo_region]}"
                         "\n"
                     )
-                else:
-                    output_data_file.write(
-                        f"{geo_region_coords[geo_region].cell(0).point},"
-                        f"{','.join(['%s' % num for num in data[:][geo_region]])}"
-                        "\n"
-                    )
+            else:
+                write_rows(output_data_file, geo_region_coords[::-1], data[::-1])
 
         LOG.debug("data written to file")
 
 
-def _write_xy_data(cube, output_data_file_path):
+def _write_xy_data(cube, sink, output_data_file_path):
     """
     Write out x y data from the cube.
 
     @param cube (iris cube): the cube containing the x y data
+    @param sink (OutputSink): the sink to write the file to
     @param output_data_file_path (str): the file path and name to write the data to
 
     """
@@ -99,13 +97,27 @@ def _write_xy_data(cube, output_data_file_path):
     end_time = datetime.now()
     LOG.debug("data extracted from cube in %s", end_time - start_time)
 
-    y_coords = cube.coord("projection_y_coordinate")[:]
+    y_coords = cube.coord("projection_y_coordinate").points
+
+    with sink.open(output_data_file_path, "a") as output_data_file:
+        # rows of data, from north to south
+        write_rows(output_data_file, y_coords[::-1], data[::-1])
+
 
-    with open(output_data_file_path, "a") as output_data_file:
-        # rows of data
-        for y_coord in range(data.shape[0] - 1, -1, -1):
-            output_data_file.write(
-                f"{y_coords[y_coord].cell(0).point},"
-                f"{','.join(['%s' % num for num in data[:][y_coord]])}"
-                "\n"
-            )
+def _write_xy_file(data, sink, output_data_file_path, file_header, y_labels):
+    """
+    Write a file of x y data, the file header followed by the rows of data from
+    north to south. This is a module level function so that it can be run by a
+    worker process.
+
+    @param data (numpy array or masked array): the data, with the dimensions
+        (y, x)
+    @param sink (OutputSink): the sink to write the file to
+    @param output_data_file_path (str): the file path and name to write the data to
+    @param file_header (str): the header lines for the file
+    @param y_labels (numpy array): the y coordinates from north to south
+
+    """
+    with sink.open(output_data_file_path, "w") as output_data_file:
+        output_data_file.write(file_header)
+        write_rows(output_data_file, y_labels, data[::-1])
@@ -5,12 +5,18 @@ This module contains the BaseCsvWriter, a base class for CSV writers.
 
 import collections
 import logging
-import os
 from time import gmtime, strftime
 
+import numpy as np
+from ukcp_dp.file_writers._utils import array_to_strings, write_rows
+from ukcp_dp.utils import get_output_sink
+
 
 LOG = logging.getLogger(__name__)
 
+# the maximum number of values to format at once when writing columns
+CHUNK_SIZE = 100000
+
 
 # pylint: disable=R0903
 class BaseCsvWriter:
@@ -25,10 +31,13 @@ class BaseCsvWriter:
         self.overlay_cube
         self.vocab
         self.data_dict
+        self.columns
         self.header
         self.output_data_file_path
+        self.sink
         self.plot_type
         self.process_version
+        self.max_workers
         self.timestamp
 
     """
@@ -48,11 +57,14 @@ class BaseCsvWriter:
         self.overlay_cube = None
         self.vocab = None
         self.data_dict = None
+        self.columns = None
         self.header = None
         self.output_data_file_path = None
+        self.sink = None
         self.timestamp = None
         self.plot_type = None
         self.process_version = None
+        self.max_workers = None
 
     def write_csv(
         self,
@@ -63,6 +75,7 @@ class BaseCsvWriter:
         plot_type,
         process_version,
         overlay_cube=None,
+        max_workers=None,
     ):
         """
         Write a CSV file.
@@ -70,13 +83,17 @@ class BaseCsvWriter:
         @param input_data (InputData): an object containing user defined values
         @param cube_list (iris cube list): a list of cubes containing the
             selected data, one cube per scenario, per variable
-        @param output_data_file_path (str): the full path to the file
+        @param output_data_file_path (str or OutputSink): the full path to
+            the output directory or the sink to write the files to
         @param vocab (Vocab): an instance of the ukcp_dp Vocab class
         @param plot_type (PlotType): the type of the plot
         @param process_version (str): the version of the process generating
             this output
         @param overlay_cube (iris cube): a cube containing the data for
             the overlay
+        @param max_workers (int): the maximum number of worker processes to use
+            when writing one file per ensemble, if None the files are written
+            in turn
 
         """
         LOG.info("write_csv, %s", plot_type)
@@ -87,29 +104,113 @@ class BaseCsvWriter:
         self.overlay_cube = overlay_cube
         self.vocab = vocab
         self.data_dict = collections.OrderedDict()
+        self.columns = []
         self.header = []
-        self.output_data_file_path = output_data_file_path.split("output.csv")[0]
+        if isinstance(output_data_file_path, str):
+            output_data_file_path = output_data_file_path.split("output.csv")[0]
+        self.output_data_file_path = output_data_file_path
+        self.sink = get_output_sink(output_data_file_path)
         self.timestamp = strftime("%Y-%m-%dT%H-%M-%S", gmtime())
         self.plot_type = plot_type
         self.process_version = process_version
+        # worker processes can only be used when writing to a directory
+        self.max_workers = max_workers if self.sink.supports_workers else None
         return self._write_csv()
 
     def _write_csv(self):
         """
         This method should be overridden to produce the column headers in
-        self.header and put the data in self.data_dict.
+        self.header and put the data in self.data_dict or, via _add_column, in
+        self.columns.
 
         It should write the data to one or more files and pass back a list of
-        file names. The _write_data_dict method has been provided to write the
-        data to a file
+        file names. The _write_data_dict and _write_columns methods have been
+        provided to write the data to a file
 
         self._write_data_dict(output_data_file_path)
+        self._write_columns(output_data_file_path)
 
         @return a list of file names
 
         """
         raise NotImplementedError
 
+    def _add_column(self, keys, values, variable=None):
+        """
+        Add a column of data to self.columns.
+
+        The values are not converted to strings until they are written by
+        _write_columns.
+
+        @param keys (list or numpy array): the key of the row for each value,
+            i.e. a date
+        @param values (numpy array): the values, the first dimension should
+            correspond to the keys
+        @param variable (str): the name of the variable that the values
+            represent, see value_to_string
+        """
+        self.columns.append((keys, values, variable))
+
+    def _write_columns(self, output_data_file_path):
+        """
+        Write out the column headers and the columns of data in self.columns.
+
+        There is a row for each key and the rows are written in the order that
+        the keys first appear in the columns. Where the columns share the same
+        keys the rows are formatted and written in chunks of at most CHUNK_SIZE
+        values.
+
+        """
+        self._write_headers(output_data_file_path)
+
+        columns = self.columns
+        # reset the columns
+        self.columns = []
+
+        if len(columns) == 0:
+            return
+
+        if not _have_same_unique_keys(columns):
+            self._write_columns_by_key(output_data_file_path, columns)
+            return
+
+        keys = columns[0][0]
+        chunk_rows = max(1, CHUNK_SIZE // len(columns))
+        with self.sink.open(output_data_file_path, "a") as output_data_file:
+            for start in range(0, len(keys), chunk_rows):
+                stop = start + chunk_rows
+                values = np.column_stack(
+                    [
+                        values_to_strings(column_values[start:stop], variable)
+                        for _, column_values, variable in columns
+                    ]
+                )
+                write_rows(output_data_file, np.asarray(keys[start:stop]), values)
+
+    def _write_columns_by_key(self, output_data_file_path, columns):
+        """
+        Write out columns that do not share the same keys.
+
+        The values are grouped by key, so a row contains the values for the
+        key from each of the columns that include the key.
+
+        """
+        key_list = []
+        for keys, values, variable in columns:
+            for key, value in zip(keys, values_to_strings(values, variable)):
+                try:
+                    self.data_dict[key].append(value)
+                except KeyError:
+                    key_list.append(key)
+                    self.data_dict[key] = [value]
+
+        with self.sink.open(output_data_file_path, "a") as output_data_file:
+            for key in key_list:
+                output_data_file.write(f"{key},{','.join(self.data_dict[key])}\n")
+
+        # reset the data dict
+        self.data_dict = collections.OrderedDict()
+
     def _write_data_dict(self, output_data_file_path, key_list):
         """
         Write out the column headers and data_dict.
@@ -117,7 +218,7 @@ class BaseCsvWriter:
         """
         self._write_headers(output_data_file_path)
 
-        with open(output_data_file_path, "a", encoding="utf-8") as output_data_file:
+        with self.sink.open(output_data_file_path, "a") as output_data_file:
             for key in key_list:
                 line_out = f"{key},{','.join(self.data_dict[key])}\n"
                 output_data_file.write(line_out)
@@ -129,6 +230,16 @@ class BaseCsvWriter:
         """
         Write out the column headers.
 
+        """
+        with self.sink.open(output_data_file_path, "w") as output_data_file:
+            output_data_file.write(self._get_headers())
+
+    def _get_headers(self):
+        """
+        Get the header lines of a file, the user inputs followed by the column
+        headers.
+
+        @return a str
         """
         user_inputs = {}
         all_user_inputs = self.input_data.get_user_inputs()
@@ -140,12 +251,12 @@ class BaseCsvWriter:
         header_string = ",".join(self.header)
         header_string = header_string.replace("\n,", "\n")
         header_length = len(header_string.split("\n")) + len(user_inputs.keys()) + 1
-        with open(output_data_file_path, "w", encoding="utf8") as output_data_file:
-            output_data_file.write(f"header length,{header_length}\n")
-            for key in sorted(user_inputs.keys()):
-                output_data_file.write(f"{key},{user_inputs[key]}\n")
-            output_data_file.write(header_string)
-            output_data_file.write("\n")
+        lines = [f"header length,{header_length}\n"]
+        for key in sorted(user_inputs.keys()):
+            lines.append(f"{key},{user_inputs[key]}\n")
+        lines.append(header_string)
+        lines.append("\n")
+        return "".join(lines)
 
     def _get_full_file_name(self, file_name_suffix=None):
         if file_name_suffix is None:
@@ -155,7 +266,7 @@ class BaseCsvWriter:
         except AttributeError:
             plot_type = "subset"
         file_name = f"{plot_type}_{self.timestamp}{file_name_suffix}.csv"
-        return os.path.join(self.output_data_file_path, file_name)
+        return self.sink.get_path(file_name)
 
 
 def value_to_string(value, variable=None):
@@ -176,3 +287,39 @@ def value_to_string(value, variable=None):
         return str(round(value, 3))
 
     return str(value)
+
+
+def values_to_strings(values, variable=None):
+    """
+    Format the values dependent on the contents of variable.
+
+    The values are formatted in the same way as value_to_string.
+
+    @param values(numpy array): the values to format
+    @param variable(str): the name of the variable that the values represent.
+
+    @return a 1D numpy array of str, one per value in the first dimension
+    """
+    if np.ndim(values) != 1:
+        return np.array([value_to_string(value, variable) for value in values])
+
+    if variable == "extremeSeaLevel":
+        # The value is in metres and we want to the nearest mm
+        values = np.round(values, 3)
+
+    return array_to_strings(values)
+
+
+def _have_same_unique_keys(columns):
+    """
+    Check if all of the columns have the same keys and the keys are unique.
+
+    @param columns (list): a list of (keys, values, variable) tuples
+
+    @return True if all of the columns have the same, unique keys
+    """
+    keys = columns[0][0]
+    for column_keys, _, _ in columns[1:]:
+        if column_keys is not keys and not np.array_equal(column_keys, keys):
+            return False
+    return len(set(keys)) == len(keys)
@@ -2,11 +2,12 @@
 This module contains the BaseShpWriter, a base class for shapefile writers.
 
 """
+import io
 import logging
-import os
 from time import gmtime, strftime
 
 from iris.exceptions import CoordinateNotFoundError
+import numpy as np
 import numpy.ma as ma
 import shapefile as shp
 from ukcp_dp.constants import AreaType, InputType, COLLECTION_MARINE
@@ -18,6 +19,7 @@ from ukcp_dp.spatial_files import (
     OVERLAY_RIVER,
     OVERLAY_COUNTRY_UNITED_KINGDOM,
 )
+from ukcp_dp.utils import get_output_sink
 
 
 LOG = logging.getLogger(__name__)
@@ -29,6 +31,9 @@ REGION = "geo_region"
 VAR_NAME = "var_name"
 VAR_VALUE = "var_value"
 
+# the files of a shapefile that are written by pyshp
+SHAPEFILE_EXTENSIONS = ["shp", "shx", "dbf"]
+
 
 # pylint: disable=R0903
 class BaseShpWriter:
@@ -41,8 +46,10 @@ class BaseShpWriter:
         self.input_data
         self.cube_list
         self.output_data_file_path
+        self.sink
         self.plot_type
         self.timestamp
+        self.max_workers
 
     """
 
@@ -50,18 +57,26 @@ class BaseShpWriter:
         self.input_data = None
         self.cube_list = None
         self.output_data_file_path = None
+        self.sink = None
         self.timestamp = None
         self.plot_type = None
+        self.max_workers = None
 
-    def write_shp(self, input_data, cube_list, output_data_file_path, plot_type):
+    def write_shp(
+        self, input_data, cube_list, output_data_file_path, plot_type, max_workers=None
+    ):
         """
         Write a shapefile file.
 
         @param input_data (InputData): an object containing user defined values
         @param cube_list (iris cube list): a list of cubes containing the
             selected data, one cube per scenario, per variable
-        @param output_data_file_path (str): the full path to the file
+        @param output_data_file_path (str or OutputSink): the full path to
+            the output directory or the sink to write the files to
         @param plot_type (PlotType): the type of the plot
+        @param max_workers (int): the maximum number of worker processes to use
+            when writing one file per ensemble, if None the files are written
+            in turn
 
         @return a list of file paths/names
 
@@ -72,8 +87,11 @@ class BaseShpWriter:
         # an iris cube list
         self.cube_list = cube_list
         self.output_data_file_path = output_data_file_path
+        self.sink = get_output_sink(output_data_file_path)
         self.timestamp = strftime("%Y-%m-%dT%H-%M-%S", gmtime())
         self.plot_type = plot_type
+        # worker processes can only be used when writing to a directory
+        self.max_workers = max_workers if self.sink.supports_workers else None
 
         return self._write_shp()
 
@@ -105,7 +123,7 @@ class BaseShpWriter:
             plot_type = "subset"
 
         file_name = f"{plot_type}_{self.timestamp}{file_name_suffix}"
-        return os.path.join(self.output_data_file_path, file_name)
+        return self.sink.get_path(file_name)
 
     def _get_region_shape_files(self):
         """
@@ -147,9 +165,9 @@ class BaseShpWriter:
 
         """
         if self.input_data.get_value(InputType.COLLECTION) == COLLECTION_MARINE:
-            _write_marine_prj_file(prj_file)
+            _write_marine_prj_file(self.sink, prj_file)
         else:
-            _write_land_prj_file(cube, prj_file)
+            _write_land_prj_file(cube, self.sink, prj_file)
 
     def _write_bbox_data(
         self, cube, half_grid_size, output_data_file, output_file_list, var_label
@@ -165,39 +183,29 @@ class BaseShpWriter:
         @param var_label (str): the label to use for the variable in the shapefile
 
         """
-        # get the numpy representation of the sub-cube
-        data = cube.data
-        # get the coordinates for the sub-cube
-        y_coords = cube.coord("projection_y_coordinate").points
-        x_coords = cube.coord("projection_x_coordinate").points
-
-        try:
-            shape_writer = shp.Writer(output_data_file)
-            _write_bbox_field_desc(shape_writer)
+        _write_bbox_shapes(
+            cube.data,
+            self.sink,
+            output_data_file,
+            cube.coord("projection_x_coordinate").points,
+            cube.coord("projection_y_coordinate").points,
+            half_grid_size,
+            var_label,
+        )
+        self._add_file_names(cube, output_data_file, output_file_list)
 
-            # rows of data
-            for y_coord in range(0, y_coords.shape[0]):
-                # columns of data
-                for x_coord in range(0, x_coords.shape[0]):
-
-                    if not ma.is_masked(data[y_coord, x_coord]):
-                        _write_polygon(
-                            shape_writer,
-                            x_coords[x_coord],
-                            y_coords[y_coord],
-                            half_grid_size,
-                        )
-                        _write_bbox_record(
-                            shape_writer,
-                            x_coords[x_coord],
-                            y_coords[y_coord],
-                            var_label,
-                            data[y_coord, x_coord],
-                        )
+    def _add_file_names(self, cube, output_data_file, output_file_list):
+        """
+        Add the names of the files of a shapefile to the list and write the
+        projection file.
 
-        finally:
-            shape_writer.close()
+        @param cube (iris cube): a cube containing the selected data
+        @param output_data_file (str): the full path to the file, without an
+            extension
+        @param output_file_list (list): the list to add the file paths of the new files
+                to
 
+        """
         output_file_list.append(f"{output_data_file}.dbf")
         output_file_list.append(f"{output_data_file}.shp")
         output_file_list.append(f"{output_data_file}.shx")
@@ -214,81 +222,123 @@ class BaseShpWriter:
         Write the data for a region to a shapefile.
 
         @param cube (iris cube): a cube containing the selected data
-        @param half_grid_size (float): half the width of the grid square
         @param output_data_file (str): the full path to the file
         @param output_file_list (list): the list to add the file paths of the new files
                 to
-        @param region_shape_file(shp.Reader):the region shapefile
+        @param region_shape_file (RegionShapefile): the region shapefile, as
+                returned by get_region_shapefile
         @param var_label (str): the label to use for the variable in the shapefile
 
         """
+        shape_writer, shape_files = _new_shape_writer()
         try:
             # define the shapefile fields
-            shape_writer = shp.Writer(output_data_file)
             _write_region_field_desc(shape_writer)
 
             # rows of data
             for region_slice in cube.slices_over("region"):
 
-                region = str(region_slice.coords(var_name="geo_region")[0].points[0])
-                # correct for error in net-cdf files
-                if region == "Orkney and Shetlands":
-                    region = "Orkney and Shetland"
-
-                region_record = _get_region_record_from_shapefile(
-                    region_shape_file, region
-                )
+                region = region_slice.coords(var_name="geo_region")[0].points[0]
+                region_shape_record = region_shape_file.get(region)
 
-                if region_record is None:
+                if region_shape_record is None:
+                    LOG.error("region: %s not found in shape file", region)
                     continue
 
-                region_geometry = region_shape_file.shapeRecord(region_record.oid).shape
-
                 if not ma.is_masked(region_slice.data):
                     _write_region_record(
                         shape_writer,
-                        region_geometry,
-                        region_record,
+                        region_shape_record.shape,
+                        region_shape_record.record,
                         var_label,
                         region_slice.data,
                     )
         finally:
             shape_writer.close()
 
-        output_file_list.append(f"{output_data_file}.dbf")
-        output_file_list.append(f"{output_data_file}.shp")
-        output_file_list.append(f"{output_data_file}.shx")
+        _save_shape_files(self.sink, output_data_file, shape_files)
+        self._add_file_names(cube, output_data_file, output_file_list)
 
-        # add the prj file
-        prj_file = f"{output_data_file}.prj"
-        self._write_prj_file(cube, prj_file)
-        output_file_list.append(prj_file)
 
+def _write_bbox_shapes(
+    data, sink, output_data_file, x_coords, y_coords, half_grid_size, var_label
+):
+    """
+    Write the data for a bbox to the .shp, .shx and .dbf files of a shapefile.
+    This is a module level function so that it can be run by a worker process.
+
+    @param data (numpy array or masked array): the data, with the dimensions
+        (y, x)
+    @param sink (OutputSink): the sink to write the files to
+    @param output_data_file (str): the full path to the file, without an
+        extension
+    @param x_coords (numpy array): the x coordinates of the data
+    @param y_coords (numpy array): the y coordinates of the data
+    @param half_grid_size (float): half the width of the grid square
+    @param var_label (str): the label to use for the variable in the shapefile
 
-def _get_region_record_from_shapefile(region_shape_file, region):
-    for record in region_shape_file.records():
-        if region in record:
-            return record
-    LOG.error("region: %s not found in shape file", region)
-    return None
+    """
+    # the indices of the unmasked grid squares, in row order
+    y_indices, x_indices = np.nonzero(~ma.getmaskarray(data))
+
+    # the centre and corners of each grid square
+    x_centres = x_coords[x_indices]
+    y_centres = y_coords[y_indices]
+    lefts = (x_centres - half_grid_size).tolist()
+    rights = (x_centres + half_grid_size).tolist()
+    bottoms = (y_centres - half_grid_size).tolist()
+    tops = (y_centres + half_grid_size).tolist()
+    values = ma.getdata(data)[y_indices, x_indices].tolist()
+
+    shape_writer, shape_files = _new_shape_writer()
+    try:
+        _write_bbox_field_desc(shape_writer)
+
+        for left, right, bottom, top, x_centre, y_centre, value in zip(
+            lefts, rights, bottoms, tops, x_centres.tolist(), y_centres.tolist(), values
+        ):
+            shape_writer.poly(
+                [
+                    [
+                        [left, bottom],
+                        [left, top],
+                        [right, top],
+                        [right, bottom],
+                        [left, bottom],
+                    ]
+                ]
+            )
+            shape_writer.record(x_centre, y_centre, var_label, value)
 
+    finally:
+        shape_writer.close()
 
-def _write_polygon(shape_writer, x_coord, y_coord, half_grid_size):
-    # Given the central x, y, and half_grid_size construct a polygon
-    polygon = [
-        [x_coord - half_grid_size, y_coord - half_grid_size],
-        [x_coord - half_grid_size, y_coord + half_grid_size],
-        [x_coord + half_grid_size, y_coord + half_grid_size],
-        [x_coord + half_grid_size, y_coord - half_grid_size],
-        [x_coord - half_grid_size, y_coord - half_grid_size],
-    ]
-    shape_writer.poly([polygon])
+    _save_shape_files(sink, output_data_file, shape_files)
 
 
-def _write_bbox_record(shape_writer, x_coord, y_coord, var_label, value):
-    shape_writer.record(
-        x_coord=x_coord, y_coord=y_coord, var_name=var_label, var_value=value
-    )
+def _new_shape_writer():
+    """
+    Get a shapefile writer that writes to memory.
+
+    @return a tuple of the shapefile Writer and a dict of the BytesIO objects
+        it writes to, keyed on file extension
+    """
+    shape_files = {extension: io.BytesIO() for extension in SHAPEFILE_EXTENSIONS}
+    return shp.Writer(**shape_files), shape_files
+
+
+def _save_shape_files(sink, output_data_file, shape_files):
+    """
+    Write the files of a shapefile from memory to the sink.
+
+    @param sink (OutputSink): the sink to write the files to
+    @param output_data_file (str): the full path to the file, without an
+        extension
+    @param shape_files (dict): the BytesIO objects from _new_shape_writer
+    """
+    for extension, shape_file in shape_files.items():
+        with sink.open(f"{output_data_file}.{extension}", "wb") as output_file:
+            output_file.write(shape_file.getvalue())
 
 
 def _write_region_record(
@@ -321,12 +371,13 @@ def _write_region_field_desc(shape_writer):
     shape_writer.field(VAR_VALUE, "N", decimal=7)
 
 
-def _write_land_prj_file(cube, prj_file):
+def _write_land_prj_file(cube, sink, prj_file):
     """
     Write the projection file for land data.
 
     Where possible data will be used from the cube.
 
+    @param sink (OutputSink): the sink to write the file to
     @param prj_file (str): the full path to the projection file
 
     """
@@ -374,14 +425,15 @@ def _write_land_prj_file(cube, prj_file):
         'UNIT["Meter",1.0]]'
     )
 
-    with open(prj_file, "w") as output_data_file:
+    with sink.open(prj_file, "w") as output_data_file:
         output_data_file.write(prj)
 
 
-def _write_marine_prj_file(prj_file):
+def _write_marine_prj_file(sink, prj_file):
     """
     Write the projection file for land data.
 
+    @param sink (OutputSink): the sink to write the file to
     @param prj_file (str): the full path to the projection file
 
     """
@@ -393,5 +445,5 @@ def _write_marine_prj_file(prj_file):
         'UNIT["Degree",0.0174532925199433]]'
     )
 
-    with open(prj_file, "w") as output_data_file:
+    with sink.open(prj_file, "w") as output_data_file:
         output_data_file.write(prj)
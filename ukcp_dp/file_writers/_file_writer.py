@@ -3,19 +3,27 @@ This module provides the public entry point write_file to the file_writes packag
 
 ¬"""
 import logging
-import os
-from time import gmtime, strftime
 
 import iris
 from iris.exceptions import CoordinateNotFoundError
 from ukcp_dp.constants import DataFormat
 from ukcp_dp.exception import UKCPDPInvalidParameterException
+from ukcp_dp.file_writers._utils import LOCAL_KEYS, get_chunksizes, get_file_name
 from ukcp_dp.file_writers._write_csv import write_csv_file
+from ukcp_dp.file_writers._write_parquet import write_parquet_file
 from ukcp_dp.file_writers._write_shp import write_shp_file
+from ukcp_dp.file_writers._write_zarr import write_zarr_file
+from ukcp_dp.utils import get_output_sink
 
 
 LOG = logging.getLogger(__name__)
 
+# the data type kinds, see numpy.dtype.kind, that can be written to NETCDF4
+NETCDF4_DTYPE_KINDS = "iufSU"
+
+# the keys for the netCDF format_options
+NETCDF_OPTIONS = ["complevel", "shuffle", "chunking", "least_significant_digit"]
+
 
 def write_file(
     cube_list,
@@ -26,6 +34,8 @@ def write_file(
     plot_type,
     process_version,
     vocab,
+    max_workers=None,
+    format_options=None,
 ):
     """
     Write the data to file.
@@ -33,13 +43,23 @@ def write_file(
     @param cube_list (iris cube list): a list of cubes containing the
         selected data, one cube per scenario, per variable
     @param overlay_cube (iris cube): a cube containing the data for the overlay
-    @param output_data_file_path (str): the full path to the file
-    data_format,
+    @param output_data_file_path (str or OutputSink): the full path to the
+        output directory or the sink to write the files to
+    @param data_format (DataFormat): the format of the output data
     @param input_data (InputData): an object containing user defined values
     @param plot_type (PlotType): the type of the plot
     @param process_version (str): the version of the process generating
             this output
     @param vocab (Vocab): an instance of the ukcp_dp Vocab class
+    @param max_workers (int): the maximum number of worker processes to use
+        when writing one file per ensemble, if None the files are written in
+        turn. This is not used for netCDF
+    @param format_options (dict): options for the data format, for netCDF the
+        keys may be "complevel", "shuffle", "chunking" and
+        "least_significant_digit", see _get_netcdf_save_options. If None the
+        netCDF files are not compressed. For Parquet the keys may be
+        "compression" and "compression_level". For Zarr the keys may be "store",
+        "chunking" and "complevel"
 
     """
     LOG.debug(cube_list)
@@ -53,26 +73,51 @@ def write_file(
             plot_type,
             process_version,
             vocab,
+            max_workers,
         )
 
     if data_format == DataFormat.NET_CDF:
         return _write_netcdf_file(
-            cube_list, overlay_cube, output_data_file_path, plot_type
+            cube_list, overlay_cube, output_data_file_path, plot_type, format_options
+        )
+
+    if data_format == DataFormat.PARQUET:
+        return write_parquet_file(
+            cube_list,
+            overlay_cube,
+            output_data_file_path,
+            input_data,
+            plot_type,
+            process_version,
+            format_options,
         )
 
     if data_format == DataFormat.SHAPEFILE:
-        return write_shp_file(cube_list, output_data_file_path, input_data, plot_type)
+        return write_shp_file(
+            cube_list, output_data_file_path, input_data, plot_type, max_workers
+        )
+
+    if data_format == DataFormat.ZARR:
+        return write_zarr_file(
+            cube_list, overlay_cube, output_data_file_path, plot_type, format_options
+        )
 
     raise UKCPDPInvalidParameterException("Invalid data format: {}".format(data_format))
 
 
-def _write_netcdf_file(cube_list, overlay_cube, output_data_file_path, plot_type):
+def _write_netcdf_file(
+    cube_list, overlay_cube, output_data_file_path, plot_type, format_options
+):
     # output the data as netCDF
     LOG.info("Writing data to CF-netCDF file")
 
     iris.config.netcdf.conventions_override = True
 
-    file_name = _get_full_file_name(output_data_file_path, plot_type)
+    save_options = _get_netcdf_save_options(format_options)
+    chunking = (format_options or {}).get("chunking")
+
+    sink = get_output_sink(output_data_file_path)
+    file_name = sink.get_path(get_file_name(plot_type, "nc"))
     file_list = []
 
     for inx, cube in enumerate(cube_list):
@@ -81,60 +126,111 @@ def _write_netcdf_file(cube_list, overlay_cube, output_data_file_path, plot_type
         else:
             cube_file_name = f"{file_name.split('.nc')[0]}_{inx+1}.nc"
 
-        try:
+        # decide on the format before writing so that the cube is only written once
+        netcdf_format = _get_netcdf_format(cube)
+
+        # iris can only save to a named file
+        with sink.local_file(cube_file_name) as local_file_name:
             iris.save(
                 cube,
-                cube_file_name,
-                netcdf_format="NETCDF4",
+                local_file_name,
+                netcdf_format=netcdf_format,
                 fill_value=1e20,
-                local_keys=("plot_label", "label_units", "description", "level"),
+                local_keys=LOCAL_KEYS,
+                chunksizes=get_chunksizes(cube, chunking),
+                **save_options,
             )
-            file_list.append(cube_file_name)
-
-        except ValueError:
-            # Somehow "month_number" and "year" an "season_year" values can get messed up
-            # when calculating the climatology.
-            # ValueError: The data type of AuxCoord <AuxCoord: year / (1) [1991]>
-            # is not supported by NETCDF4_CLASSIC and its values cannot be safely
-            # cast to a supported integer type.
-            #
-            # Writing with netcdf_format="NETCDF4" above rather than 
-            # netcdf_format="NETCDF4_CLASSIC" may have fixed this issue
-            #
-            for coord in ["month_number", "year", "season_year"]:
-                try:
-                    cube.remove_coord(coord)
-                except CoordinateNotFoundError:
-                    pass
+        file_list.append(cube_file_name)
+
+    if overlay_cube is not None:
+        overlay_file_name = f"{file_name.split('.nc')[0]}_overlay.nc"
+        with sink.local_file(overlay_file_name) as local_file_name:
             iris.save(
-                cube,
-                cube_file_name,
+                overlay_cube,
+                local_file_name,
                 netcdf_format="NETCDF4_CLASSIC",
                 fill_value=1e20,
-                local_keys=("plot_label", "label_units", "description", "level"),
+                local_keys=LOCAL_KEYS,
+                chunksizes=get_chunksizes(overlay_cube, chunking),
+                **save_options,
             )
-            file_list.append(cube_file_name)
-
-    if overlay_cube is not None:
-        overlay_file_name = f"{file_name.split('.nc')[0]}_overlay.nc"
-        iris.save(
-            overlay_cube,
-            overlay_file_name,
-            netcdf_format="NETCDF4_CLASSIC",
-            fill_value=1e20,
-            local_keys=("plot_label", "label_units", "description", "level"),
-        )
         file_list.append(overlay_file_name)
 
     return file_list
 
 
-def _get_full_file_name(output_data_file_path, plot_type):
-    timestamp = strftime("%Y-%m-%dT%H-%M-%S", gmtime())
-    plot_type_string = ""
-    if plot_type is not None:
-        plot_type_string = "{}_".format(plot_type.lower())
-    file_name = "{plot_type}{timestamp}.nc".format(
-        plot_type=plot_type_string, timestamp=timestamp
-    )
-    return os.path.join(output_data_file_path, file_name)
+def _get_netcdf_format(cube):
+    """
+    Get the netCDF format to use for a cube.
+
+    Somehow "month_number" and "year" an "season_year" values can get messed up
+    when calculating the climatology, leaving them with a data type that cannot be
+    written. In that case those coordinates are removed from the cube and it is
+    written as NETCDF4_CLASSIC.
+
+    @param cube (iris cube): the cube to be written
+
+    @return a str containing the netCDF format
+    """
+    arrays = [cube.core_data()]
+    for coord in cube.coords():
+        arrays.append(coord.core_points())
+        if coord.has_bounds():
+            arrays.append(coord.core_bounds())
+
+    if all(array.dtype.kind in NETCDF4_DTYPE_KINDS for array in arrays):
+        return "NETCDF4"
+
+    for coord in ["month_number", "year", "season_year"]:
+        try:
+            cube.remove_coord(coord)
+        except CoordinateNotFoundError:
+            pass
+    return "NETCDF4_CLASSIC"
+
+
+def _get_netcdf_save_options(format_options):
+    """
+    Get the compression and quantisation keywords for iris.save.
+
+    @param format_options (dict): the netCDF options, may be None. The keys are:
+        complevel (int): the zlib compression level, 1 to 9, 0 or None for no
+            compression
+        shuffle (bool): if True, the default, use the HDF5 shuffle filter when
+            compressing
+        chunking (str or tuple): see file_writers._utils.get_chunksizes
+        least_significant_digit (int): the power of ten of the smallest
+            decimal place in the data that must be retained, None to retain all
+
+    @return a dict of keywords for iris.save
+    """
+    if format_options is None:
+        format_options = {}
+
+    unknown = set(format_options) - set(NETCDF_OPTIONS)
+    if unknown:
+        raise UKCPDPInvalidParameterException(
+            f"Invalid netCDF option(s): {', '.join(sorted(unknown))}"
+        )
+
+    complevel = format_options.get("complevel")
+    if complevel is not None and complevel not in range(10):
+        raise UKCPDPInvalidParameterException(
+            f"Invalid netCDF complevel: {complevel}, it must be between 0 and 9"
+        )
+
+    least_significant_digit = format_options.get("least_significant_digit")
+    if least_significant_digit is not None and not isinstance(
+        least_significant_digit, int
+    ):
+        raise UKCPDPInvalidParameterException(
+            "Invalid netCDF least_significant_digit: "
+            f"{least_significant_digit}, it must be an int"
+        )
+
+    return {
+        "zlib": bool(complevel),
+        "complevel": complevel or 4,
+        "shuffle": bool(format_options.get("shuffle", True)),
+        "least_significant_digit": least_significant_digit,
+    }
@@ -0,0 +1,86 @@
+"""
+This module provides write_slices, which calls a function to write a file for
+each slice of an array, optionally using a pool of worker processes.
+
+"""
+from concurrent.futures import ProcessPoolExecutor
+import logging
+
+import numpy as np
+from ukcp_dp.utils import from_shared_memory, to_shared_memory
+
+
+LOG = logging.getLogger(__name__)
+
+
+def write_slices(write_function, data, jobs, max_workers=None):
+    """
+    Call write_function(data[i], *jobs[i]) for each of the jobs.
+
+    If max_workers is greater than one the calls are made from a pool of worker
+    processes. The data are copied once, into shared memory, and each worker
+    reads its slice directly from there rather than having it pickled.
+    write_function must be a module level function so that it can be passed to
+    the workers. This function does not return until all of the calls have
+    completed, an exception raised by any of them is re-raised.
+
+    @param write_function (function): the function to call for each slice
+    @param data (numpy array or masked array): the data, the first dimension
+        should correspond to the jobs
+    @param jobs (list): a list of tuples of the additional arguments to pass
+        to write_function
+    @param max_workers (int): the maximum number of worker processes. If None,
+        or less than 2, the calls are made in turn from this process
+    """
+    if max_workers is None or max_workers < 2 or len(jobs) < 2:
+        for index, args in enumerate(jobs):
+            write_function(data[index], *args)
+        return
+
+    LOG.debug("writing %s slices with %s workers", len(jobs), max_workers)
+
+    shared_blocks = []
+    try:
+        data_spec = to_shared_memory(np.ma.getdata(data), shared_blocks)
+        if isinstance(data, np.ma.MaskedArray):
+            mask_spec = to_shared_memory(np.ma.getmaskarray(data), shared_blocks)
+        else:
+            mask_spec = None
+
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            futures = [
+                executor.submit(
+                    _write_slice, write_function, data_spec, mask_spec, index, args
+                )
+                for index, args in enumerate(jobs)
+            ]
+            for future in futures:
+                future.result()
+
+    finally:
+        for shared_block in shared_blocks:
+            shared_block.close()
+            shared_block.unlink()
+
+
+def _write_slice(write_function, data_spec, mask_spec, index, args):
+    """
+    Call write_function for one slice of the data held in shared memory. This
+    is run in a worker process.
+
+    """
+    data_block, data = from_shared_memory(data_spec)
+    mask_block = None
+    try:
+        data_slice = data[index]
+        if mask_spec is not None:
+            mask_block, mask = from_shared_memory(mask_spec)
+            data_slice = np.ma.masked_array(data_slice, mask=mask[index])
+        write_function(data_slice, *args)
+
+    finally:
+        # the views of the buffers must be released before they can be closed
+        data_slice = data = mask = None
+        data_block.close()
+        if mask_block is not None:
+            mask_block.close()
@@ -2,6 +2,24 @@
 A utils module for the file writers.
 
 """
+import functools
+from time import gmtime, strftime
+
+import cf_units
+from iris.exceptions import CoordinateNotFoundError
+import numpy as np
+from ukcp_dp.exception import UKCPDPInvalidParameterException
+
+
+# the maximum number of sets of time labels to keep
+TIME_LABEL_CACHE_SIZE = 32
+
+# the target size of a chunk for "time_series" chunking
+CHUNK_BYTES = 2**20
+
+# the cube attributes that are written to the data variable rather than as global
+# attributes
+LOCAL_KEYS = ("plot_label", "label_units", "description", "level")
 
 
 def ensemble_to_string(ensemble_no):
@@ -16,3 +34,181 @@ def ensemble_to_string(ensemble_no):
     if ensemble_no < 10:
         return f"0{ensemble_no}"
     return str(ensemble_no)
+
+
+def array_to_strings(data):
+    """
+    Convert the values of an array to strings.
+
+    The values are formatted in the same way as '%s' % value, masked values
+    are converted to '--'.
+
+    @param data (numpy array or masked array): the values to convert
+
+    @return a numpy array of str
+    """
+    strings = np.ma.getdata(data).astype(str)
+    if np.ma.is_masked(data):
+        strings = np.where(np.ma.getmaskarray(data), "--", strings)
+    return strings
+
+
+def write_rows(output_data_file, labels, data):
+    """
+    Write a block of comma separated rows to a file, in a single write.
+
+    Each row consists of a label followed by the values from the
+    corresponding row of the data.
+
+    @param output_data_file (file): the file to write to
+    @param labels (numpy array): a 1D array of labels, one per row
+    @param data (numpy array or masked array): a 2D array of values
+    """
+    label_strings = array_to_strings(labels).tolist()
+    rows = array_to_strings(data).tolist()
+    output_data_file.write(
+        "".join(
+            f"{label},{','.join(row)}\n" for label, row in zip(label_strings, rows)
+        )
+    )
+
+
+def get_file_name(plot_type, extension):
+    """
+    Get a file name made from the plot type and the current time.
+
+    @param plot_type (PlotType): the type of the plot, may be None
+    @param extension (str): the file name extension, without the '.'
+
+    @return a str containing the file name
+    """
+    timestamp = strftime("%Y-%m-%dT%H-%M-%S", gmtime())
+    plot_type_string = ""
+    if plot_type is not None:
+        plot_type_string = "{}_".format(plot_type.lower())
+    return "{plot_type}{timestamp}.{extension}".format(
+        plot_type=plot_type_string, timestamp=timestamp, extension=extension
+    )
+
+
+def get_time_labels(time_coord, date_format="%Y-%m-%d"):
+    """
+    Get the formatted dates of the points of a time coordinate.
+
+    All of the points are converted with a single call to num2date. The
+    result is cached on the units, calendar and points of the coordinate, so
+    writers that visit the same time axis for several ensembles or samples
+    get back the same, already formatted, labels.
+
+    @param time_coord (iris coord): the time coordinate
+    @param date_format (str): the format to pass to strftime
+
+    @return a tuple of str, one per point
+    """
+    points = np.ascontiguousarray(time_coord.points)
+    return _get_time_labels(
+        time_coord.units.origin,
+        time_coord.units.calendar,
+        points.dtype.str,
+        points.tobytes(),
+        date_format,
+    )
+
+
+@functools.lru_cache(maxsize=TIME_LABEL_CACHE_SIZE)
+def _get_time_labels(origin, calendar, dtype, points, date_format):
+    """
+    Convert the points to formatted dates. The arguments are all hashable so
+    the result can be cached.
+
+    """
+    dates = cf_units.Unit(origin, calendar=calendar).num2date(
+        np.frombuffer(points, dtype=dtype)
+    )
+    return tuple(date.strftime(date_format) for date in dates)
+
+
+def get_ordered_data(cube, data, coord_names):
+    """
+    Reorder the dimensions of the data so that those described by the named
+    coordinates come first, in the order given. The remaining dimensions keep
+    their relative order. Scalar coordinates are ignored.
+
+    @param cube (iris cube): the cube that the data came from
+    @param data (numpy array or masked array): the data from the cube
+    @param coord_names (list(str)): the names of the coordinates
+
+    @return a view of the data with the dimensions reordered
+    """
+    source = []
+    for coord_name in coord_names:
+        coord_dims = cube.coord_dims(coord_name)
+        if coord_dims:
+            source.append(coord_dims[0])
+    return np.moveaxis(data, source, list(range(len(source))))
+
+
+def get_chunksizes(cube, chunking):
+    """
+    Get the chunk shape for a cube.
+
+    @param cube (iris cube): the cube to be written
+    @param chunking (str or tuple): one of
+        None: leave the chunking to the library writing the file
+        "map": one chunk per map, i.e. the full extent of the x and y dimensions
+            and a length of one for the other dimensions
+        "time_series": the full extent of the time dimension, a length of one
+            for the other non spatial dimensions and as many grid squares as
+            fit in CHUNK_BYTES
+        a tuple of int: the chunk shape, which is limited to the shape of the
+            cube
+
+    @return a tuple of int, or None
+    """
+    if chunking is None or cube.ndim == 0:
+        return None
+
+    if isinstance(chunking, (tuple, list)):
+        if len(chunking) != cube.ndim or not all(
+            isinstance(size, int) and size > 0 for size in chunking
+        ):
+            raise UKCPDPInvalidParameterException(
+                f"Invalid chunking: {chunking}, the cube has the shape {cube.shape}"
+            )
+        return tuple(min(size, extent) for size, extent in zip(chunking, cube.shape))
+
+    spatial_dims = []
+    for axis in ["X", "Y"]:
+        try:
+            spatial_dims.extend(cube.coord_dims(cube.coord(axis=axis, dim_coords=True)))
+        except CoordinateNotFoundError:
+            pass
+
+    if chunking == "map":
+        if not spatial_dims:
+            return None
+        return tuple(
+            extent if dim in spatial_dims else 1
+            for dim, extent in enumerate(cube.shape)
+        )
+
+    if chunking == "time_series":
+        time_dims = cube.coord_dims("time") if cube.coords("time") else ()
+        if not time_dims:
+            return None
+        time_extent = cube.shape[time_dims[0]]
+        # the edge of a square of grid squares that fits in CHUNK_BYTES
+        tile_size = max(
+            1, int((CHUNK_BYTES / (time_extent * cube.dtype.itemsize)) ** 0.5)
+        )
+        chunksizes = []
+        for dim, extent in enumerate(cube.shape):
+            if dim in time_dims:
+                chunksizes.append(extent)
+            elif dim in spatial_dims:
+                chunksizes.append(min(tile_size, extent))
+            else:
+                chunksizes.append(1)
+        return tuple(chunksizes)
+
+    raise UKCPDPInvalidParameterException(f"Invalid chunking: {chunking}")
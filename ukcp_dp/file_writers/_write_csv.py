@@ -27,12 +27,17 @@ def write_csv_file(
     plot_type,
     process_version,
     vocab,
+    max_workers=None,
 ):
     """
     Output the data as csv.
 
     This method will decide on a CSV writer to use dependent on the value given
     for plot type.
+
+    @param max_workers (int): the maximum number of worker processes to use
+        when writing one file per ensemble, if None the files are written in
+        turn
     """
     LOG.info("Writing data to csv file")
 
@@ -86,4 +91,5 @@ def write_csv_file(
         plot_type,
         process_version,
         overlay_cube,
+        max_workers,
     )
@@ -6,7 +6,8 @@ from the BaseCsvWriter base class.
 import logging
 
 from ukcp_dp.constants import InputType, CDF_LABEL
-from ukcp_dp.file_writers._base_csv_writer import BaseCsvWriter, value_to_string
+import numpy as np
+from ukcp_dp.file_writers._base_csv_writer import BaseCsvWriter
 
 
 LOG = logging.getLogger(__name__)
@@ -27,7 +28,6 @@ class CdfCsvWriter(BaseCsvWriter):
 
         """
         self.header.append(CDF_LABEL)
-        key_list = []
 
         for cube in self.cube_list:
             scenario = self.vocab.get_collection_term_label(
@@ -36,25 +36,23 @@ class CdfCsvWriter(BaseCsvWriter):
             # the CDF plot will be of the first variable
             var = self.input_data.get_value_label(InputType.VARIABLE)[0]
             self.header.append("{var}({scenario})".format(scenario=scenario, var=var))
-            self._read_percentile_cube(cube, key_list)
+            self._read_percentile_cube(cube)
 
         # now write the data
         output_data_file_path = self._get_full_file_name()
-        self._write_data_dict(output_data_file_path, key_list)
+        self._write_columns(output_data_file_path)
 
         return [output_data_file_path]
 
-    def _read_percentile_cube(self, cube, key_list):
+    def _read_percentile_cube(self, cube):
         """
-        Slice the cube over 'percentile' and update data_dict
+        Add the data from the cube, which has a 'percentile' dimension, to the
+        columns.
 
         """
-        for _slice in cube.slices_over("percentile"):
-            value = value_to_string(_slice.data)
-            # ensure the percentile is reported as no more the 2 dp
-            percentile = str(round(_slice.coord("percentile").points[0], 2))
-            try:
-                self.data_dict[percentile].append(value)
-            except KeyError:
-                key_list.append(percentile)
-                self.data_dict[percentile] = [value]
+        percentile_coord = cube.coord("percentile")
+        # ensure the percentile is reported as no more the 2 dp
+        keys = [str(round(percentile, 2)) for percentile in percentile_coord.points]
+        # put the percentile dimension first
+        values = np.moveaxis(cube.data, cube.coord_dims(percentile_coord)[0], 0)
+        self._add_column(keys, values)
@@ -7,12 +7,14 @@ method from the BaseCsvWriter base class.
 import logging
 
 from iris.exceptions import CoordinateNotFoundError
+import numpy as np
 from ukcp_dp.constants import AreaType, InputType
 from ukcp_dp.file_writers._base_csv_map_writer import (
     BaseCsvMapWriter,
-    _write_xy_data,
+    _write_xy_file,
 )
-from ukcp_dp.file_writers._utils import ensemble_to_string
+from ukcp_dp.file_writers._parallel import write_slices
+from ukcp_dp.file_writers._utils import ensemble_to_string, get_ordered_data
 
 
 LOG = logging.getLogger(__name__)
@@ -41,7 +43,8 @@ class PostageStampMapCsvWriter(BaseCsvMapWriter):
         """
         Write out data that has multiple x and y coordinates.
 
-        One file will be written per ensemble.
+        One file will be written per ensemble. The files are written in parallel
+        if max_workers is greater than one.
 
         """
         LOG.debug("_write_x_y_csv")
@@ -50,22 +53,26 @@ class PostageStampMapCsvWriter(BaseCsvMapWriter):
         output_file_list = []
 
         self._generate_xy_header(cube)
+        file_header = self._get_headers()
+        y_labels = cube.coord("projection_y_coordinate").points[::-1]
 
-        # loop over ensembles
-        for ensemble_slice in cube.slices_over("ensemble_member"):
-            ensemble_no = ensemble_to_string(
-                ensemble_slice.coord("ensemble_member").points[0]
-            )
+        jobs = []
+        for ensemble_member in cube.coord("ensemble_member").points:
+            ensemble_no = ensemble_to_string(ensemble_member)
 
             LOG.debug("processing ensemble %s", ensemble_no)
 
             output_data_file_path = self._get_full_file_name(f"_{ensemble_no}")
-            self._write_headers(output_data_file_path)
-
-            _write_xy_data(ensemble_slice, output_data_file_path)
+            jobs.append((self.sink, output_data_file_path, file_header, y_labels))
 
             output_file_list.append(output_data_file_path)
 
+        data = get_ordered_data(cube, cube.data, ["ensemble_member"])
+        if not cube.coord_dims("ensemble_member"):
+            data = data[np.newaxis]
+
+        write_slices(_write_xy_file, data, jobs, self.max_workers)
+
         return output_file_list
 
     def _write_region_csv(self):
@@ -6,7 +6,9 @@ from the BaseCsvWriter base class.
 import logging
 
 from ukcp_dp.constants import InputType
-from ukcp_dp.file_writers._base_csv_writer import BaseCsvWriter, value_to_string
+import numpy as np
+from ukcp_dp.file_writers._base_csv_writer import BaseCsvWriter
+from ukcp_dp.file_writers._utils import get_time_labels
 
 
 LOG = logging.getLogger(__name__)
@@ -33,34 +35,28 @@ class SampleCsvWriter(BaseCsvWriter):
         else:
             self.header.append("sample id")
 
-        key_list = []
-
         for i, cube in enumerate(self.cube_list):
             if self.input_data.get_value(InputType.TIME_PERIOD) == "all":
-                self._write_sample_with_date(cube, i, key_list)
+                self._write_sample_with_date(cube, i)
             else:
-                self._write_sample(cube, i, key_list)
+                self._write_sample(cube, i)
 
         output_data_file_path = self._get_full_file_name()
-        self._write_data_dict(output_data_file_path, key_list)
+        self._write_columns(output_data_file_path)
 
         return [output_data_file_path]
 
-    def _write_sample(self, cube, i, key_list):
+    def _write_sample(self, cube, i):
         # add the variable label to the header
         self.header.append(self.input_data.get_value_label(InputType.VARIABLE)[i])
 
-        for sample_slice in cube.slices_over("sample"):
-            sample_id = int(sample_slice.coord("sample").points[0])
-            value = value_to_string(sample_slice.data)
-
-            try:
-                self.data_dict[sample_id].append(value)
-            except KeyError:
-                key_list.append(sample_id)
-                self.data_dict[sample_id] = [value]
+        sample_coord = cube.coord("sample")
+        keys = [int(sample_id) for sample_id in sample_coord.points]
+        # put the sample dimension first
+        values = np.moveaxis(cube.data, cube.coord_dims(sample_coord)[0], 0)
+        self._add_column(keys, values)
 
-    def _write_sample_with_date(self, cube, i, key_list):
+    def _write_sample_with_date(self, cube, i):
         """
         Write out the data, in CSV format.
 
@@ -72,20 +68,13 @@ class SampleCsvWriter(BaseCsvWriter):
             self.header.append(
                 "{var}(sample {sample_id})".format(sample_id=sample_id, var=var)
             )
-            self._write_time_cube(sample_slice, key_list)
+            self._write_time_cube(sample_slice)
 
-    def _write_time_cube(self, cube, key_list):
+    def _write_time_cube(self, cube):
         """
-        Slice the cube over 'time' and update data_dict
+        Add the data from the cube, which has a 'time' dimension, to the
+        columns.
 
         """
-        data = cube.data[:]
-        coords = cube.coord("time")[:]
-        for time_ in range(0, data.shape[0]):
-            value = value_to_string(data[time_])
-            time_str = coords[time_].cell(0).point.strftime("%Y-%m-%d")
-            try:
-                self.data_dict[time_str].append(value)
-            except KeyError:
-                key_list.append(time_str)
-                self.data_dict[time_str] = [value]
+        keys = get_time_labels(cube.coord("time"))
+        self._add_column(keys, cube.data[:])
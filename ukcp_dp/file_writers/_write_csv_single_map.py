@@ -44,7 +44,7 @@ class SingleMapCsvWriter(BaseCsvMapWriter):
         output_data_file_path = self._get_full_file_name()
         self._write_headers(output_data_file_path)
 
-        _write_xy_data(cube, output_data_file_path)
+        _write_xy_data(cube, self.sink, output_data_file_path)
 
         output_file_list.append(output_data_file_path)
 
@@ -8,9 +8,16 @@ from datetime import datetime
 import logging
 
 from iris.exceptions import CoordinateNotFoundError
+import numpy as np
 from ukcp_dp.constants import AreaType, InputType, COLLECTION_OBS, COLLECTION_PROB
 from ukcp_dp.file_writers._base_csv_writer import BaseCsvWriter
-from ukcp_dp.file_writers._utils import ensemble_to_string
+from ukcp_dp.file_writers._parallel import write_slices
+from ukcp_dp.file_writers._utils import (
+    ensemble_to_string,
+    get_ordered_data,
+    get_time_labels,
+    write_rows,
+)
 
 
 LOG = logging.getLogger(__name__)
@@ -69,145 +76,73 @@ class SubsetCsvWriter(BaseCsvWriter):
         """
         Extract the model data.
 
+        The files for the ensembles are written in parallel if max_workers is
+        greater than one.
+
         """
         output_file_list = []
+        jobs = []
+        file_header = self._get_headers()
+        column_header = f"{','.join(column_headers)}\n"
+        y_labels = cube.coord("projection_y_coordinate").points[::-1]
+        time_labels = _get_time_labels(cube)
 
-        # loop over ensembles
-        for ensemble_slice in cube.slices_over("ensemble_member"):
-            ensemble_no = ensemble_to_string(
-                ensemble_slice.coord("ensemble_member").points[0]
-            )
+        for ensemble_member in cube.coord("ensemble_member").points:
+            ensemble_no = ensemble_to_string(ensemble_member)
 
             LOG.debug("processing ensemble %s", ensemble_no)
 
             output_data_file_path = self._get_full_file_name(f"_{ensemble_no}")
-            self._write_headers(output_data_file_path)
-
-            with open(output_data_file_path, "a", encoding="utf-8") as output_data_file:
-                self._write_data_block(ensemble_slice, output_data_file, column_headers)
+            jobs.append(
+                (
+                    self.sink,
+                    output_data_file_path,
+                    file_header,
+                    column_header,
+                    y_labels,
+                    time_labels,
+                )
+            )
 
             output_file_list.append(output_data_file_path)
 
-        return output_file_list
+        data = get_ordered_data(
+            cube,
+            self._get_data(cube),
+            ["ensemble_member", "time", "projection_y_coordinate"],
+        )
+        if not cube.coord_dims("ensemble_member"):
+            data = data[np.newaxis]
 
-    def _write_had_obs_data(self, cube, column_headers):
-        """
-        Extract the observation data.
+        write_slices(_write_data_file, data, jobs, self.max_workers)
 
-        """
-        output_file_list = []
-
-        output_data_file_path = self._get_full_file_name()
-        self._write_headers(output_data_file_path)
-
-        with open(output_data_file_path, "a", encoding="utf-8") as output_data_file:
-            self._write_data_block(cube, output_data_file, column_headers)
-
-        output_file_list.append(output_data_file_path)
+        LOG.debug("data written to files")
 
         return output_file_list
 
-    def _write_data_block(self, cube, output_data_file, column_headers):
+    def _write_had_obs_data(self, cube, column_headers):
         """
-        Write out the column headers and data.
+        Extract the observation data.
 
         """
-        y_coords = cube.coord("projection_y_coordinate")[:]
-
-        time_index = None
-        for i, coord in enumerate(cube.coords(dim_coords=True)):
-            if coord.name() == "time":
-                time_index = i
-            elif coord.name() == "projection_y_coordinate":
-                y_index = i
+        output_data_file_path = self._get_full_file_name()
 
-        if time_index is None:
-            self._write_data_block_single_time(
-                column_headers, cube, output_data_file, y_coords, y_index
-            )
-        else:
-            self._write_data_block_time_series(
-                column_headers, cube, output_data_file, time_index, y_coords, y_index
-            )
+        data = get_ordered_data(
+            cube, self._get_data(cube), ["time", "projection_y_coordinate"]
+        )
+        _write_data_file(
+            data,
+            self.sink,
+            output_data_file_path,
+            self._get_headers(),
+            f"{','.join(column_headers)}\n",
+            cube.coord("projection_y_coordinate").points[::-1],
+            _get_time_labels(cube),
+        )
 
         LOG.debug("data written to file")
 
-    def _write_data_block_single_time(
-        self, column_headers, cube, output_data_file, y_coords, y_index
-    ):
-        """
-        Write out the column headers and data where there is only one time value.
-
-        """
-        data = self._get_data(cube)
-        output_data_file.write(f"{','.join(column_headers)}\n")
-
-        # rows of data
-        for y_coord in range(data.shape[y_index] - 1, -1, -1):
-            if y_index == 0:
-                line = (
-                    f"{y_coords[y_coord].cell(0).point},"
-                    f"{','.join(['%s' % num for num in data[y_coord, :]])}"
-                    "\n"
-                )
-            else:
-                line = (
-                    f"{y_coords[y_coord].cell(0).point},"
-                    f"{','.join(['%s' % num for num in data[:, y_coord]])}"
-                    "\n"
-                )
-
-            output_data_file.write(line)
-
-    def _write_data_block_time_series(
-        self, column_headers, cube, output_data_file, time_index, y_coords, y_index
-    ):
-        """
-        Write out the column headers and data where there are multiple time values.
-
-
-        """
-        data = self._get_data(cube)
-        time_coords = cube.coord("time")[:]
-
-        for time_ in range(0, data.shape[time_index]):
-            output_data_file.write(
-                f"{time_coords[time_].cell(0).point.strftime('%Y-%m-%d')}\n"
-            )
-
-            output_data_file.write(f"{','.join(column_headers)}\n")
-
-            # rows of data
-            for y_coord in range(data.shape[y_index] - 1, -1, -1):
-                if time_index == 0:
-                    if y_index == 1:
-                        line = (
-                            f"{y_coords[y_coord].cell(0).point},"
-                            f"{','.join(['%s' % num for num in data[time_, y_coord]])}"
-                            "\n"
-                        )
-                    else:
-                        line = (
-                            f"{y_coords[y_coord].cell(0).point},"
-                            f"{','.join(['%s' % num for num in data[time_, : ,y_coord]])}"
-                            "\n"
-                        )
-
-                elif time_index == 2:
-                    if y_index == 0:
-                        line = (
-                            f"{y_coords[y_coord].cell(0).point},"
-                            f"{','.join(['%s' % num for num in data[y_coord, : ,time_]])}"
-                            "\n"
-                        )
-                    else:
-                        line = (
-                            f"{y_coords[y_coord].cell(0).point},"
-                            f"{','.join(['%s' % num for num in data[: ,y_coord, time_]])}"
-                            "\n"
-                        )
-
-                output_data_file.write(line)
+        return [output_data_file_path]
 
     def _write_csv_percentiles(self):
         """
@@ -326,17 +261,15 @@ class SubsetCsvWriter(BaseCsvWriter):
         Get the region or point data where there is only one time value.
 
         """
-        time_coord = cube.coord("time")
+        time_label = get_time_labels(cube.coord("time"), date_format)[0]
 
         try:
             data = ",".join("%s" % num for num in self._get_data(cube))
         except IndexError:
             data = cube.data
 
-        with open(output_data_file_path, "a", encoding="utf-8") as output_data_file:
-            output_data_file.write(
-                f"{time_coord.cell(0).point.strftime(date_format)},{data}\n"
-            )
+        with self.sink.open(output_data_file_path, "a") as output_data_file:
+            output_data_file.write(f"{time_label},{data}\n")
 
     def _region_or_point_csv_for_time_series(
         self, cube, date_format, output_data_file_path
@@ -346,7 +279,6 @@ class SubsetCsvWriter(BaseCsvWriter):
 
         """
         data = self._get_data(cube)
-        time_coords = cube.coord("time")[:]
 
         secondary_index = None
         for i, coord in enumerate(cube.coords(dim_coords=True)):
@@ -355,20 +287,16 @@ class SubsetCsvWriter(BaseCsvWriter):
             elif coord.name() in ["region", "ensemble_member_id", "percentile"]:
                 secondary_index = i
 
-        with open(output_data_file_path, "a", encoding="utf-8") as output_data_file:
-
-            for time_ in range(0, data.shape[time_index]):
-                time_formated = time_coords[time_].cell(0).point.strftime(date_format)
+        if time_index == 0 and secondary_index is None:
+            # a single value per time
+            data = data.reshape(data.shape[0], 1)
+        elif time_index != 0:
+            data = np.moveaxis(data, time_index, 0)
 
-                if time_index == 0:
-                    if secondary_index is None:
-                        data_formated = data[time_]
-                    if secondary_index == 1:
-                        data_formated = ",".join("%s" % num for num in data[time_])
-                else:
-                    data_formated = ",".join("%s" % num for num in data[:, time_])
+        time_labels = np.array(get_time_labels(cube.coord("time"), date_format))
 
-                output_data_file.write(f"{time_formated},{data_formated}\n")
+        with self.sink.open(output_data_file_path, "a") as output_data_file:
+            write_rows(output_data_file, time_labels, data)
 
     def _get_data(self, cube):
         """
@@ -382,6 +310,51 @@ class SubsetCsvWriter(BaseCsvWriter):
         return data
 
 
+def _get_time_labels(cube):
+    """
+    Get the labels for the time dimension of gridded data.
+
+    @param cube (iris cube): the cube containing the data
+
+    @return a tuple of str, or None if time is not a dimension of the cube
+    """
+    if not cube.coord_dims("time"):
+        return None
+    return get_time_labels(cube.coord("time"))
+
+
+def _write_data_file(
+    data, sink, output_data_file_path, file_header, column_header, y_labels, time_labels
+):
+    """
+    Write a file of gridded data, the file header followed by the grids. This is
+    a module level function so that it can be run by a worker process.
+
+    @param data (numpy array or masked array): the data, with the dimensions
+        (time, y, x) or, if time_labels is None, (y, x)
+    @param sink (OutputSink): the sink to write the file to
+    @param output_data_file_path (str): the full path to the file
+    @param file_header (str): the header lines for the file
+    @param column_header (str): the line of column headers, written before each
+        grid
+    @param y_labels (numpy array): the y coordinates from north to south
+    @param time_labels (tuple(str)): the dates, one per time, maybe None
+    """
+    with sink.open(output_data_file_path, "w") as output_data_file:
+        output_data_file.write(file_header)
+
+        if time_labels is None:
+            output_data_file.write(column_header)
+            # rows of data, from north to south
+            write_rows(output_data_file, y_labels, data[::-1])
+            return
+
+        for time_, time_label in enumerate(time_labels):
+            output_data_file.write(f"{time_label}\n{column_header}")
+            # rows of data, from north to south
+            write_rows(output_data_file, y_labels, data[time_, ::-1])
+
+
 def _fromat_percentile(percentile):
     """
     Format the percentile depending on its value.
@@ -55,7 +55,7 @@ class ThreeMapCsvWriter(BaseCsvMapWriter):
             output_data_file_path = self._get_full_file_name(f"_{percentile}")
             self._write_headers(output_data_file_path)
 
-            _write_xy_data(percentile_cube, output_data_file_path)
+            _write_xy_data(percentile_cube, self.sink, output_data_file_path)
 
             output_file_list.append(output_data_file_path)
 
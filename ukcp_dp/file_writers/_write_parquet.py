@@ -0,0 +1,238 @@
+"""
+This module is the entry point for writing Apache Parquet files.
+
+The data are written as a tidy table, one row per value, with a column for each
+of the coordinates that describe a dimension of the cube and a column for the
+values. The columns are built directly from the arrays of the cube, the string
+columns are dictionary encoded.
+
+pyarrow is only imported when a Parquet file is written, so it is not needed
+for the other data formats.
+
+"""
+import logging
+
+import cf_units
+import numpy as np
+from ukcp_dp.exception import UKCPDPInvalidParameterException
+from ukcp_dp.file_writers._utils import get_file_name, get_time_labels
+from ukcp_dp.utils import get_output_sink
+
+
+LOG = logging.getLogger(__name__)
+
+# calendars that can be written as timestamps, other calendars, i.e. 360_day,
+# are written as strings
+TIMESTAMP_CALENDARS = ["standard", "gregorian", "proleptic_gregorian"]
+
+# the keys for the Parquet format_options
+PARQUET_OPTIONS = ["compression", "compression_level"]
+
+# the default compression codec
+PARQUET_COMPRESSION = "zstd"
+
+
+def write_parquet_file(
+    cube_list,
+    overlay_cube,
+    output_data_file_path,
+    input_data,
+    plot_type,
+    process_version,
+    format_options=None,
+):
+    """
+    Output the data as Parquet files, one per cube.
+
+    @param cube_list (iris cube list): a list of cubes containing the
+        selected data, one cube per scenario, per variable
+    @param overlay_cube (iris cube): a cube containing the data for the overlay
+    @param output_data_file_path (str or OutputSink): the full path to the
+        output directory or the sink to write the files to
+    @param input_data (InputData): an object containing user defined values
+    @param plot_type (PlotType): the type of the plot
+    @param process_version (str): the version of the process generating
+        this output
+    @param format_options (dict): optional, the keys may be:
+        compression (str): the compression codec, the default is "zstd"
+        compression_level (int): the compression level for the codec
+
+    @return a list of file paths/names
+    """
+    LOG.info("Writing data to Parquet file")
+
+    try:
+        import pyarrow.parquet as pq  # pylint: disable=C0415
+    except ImportError as ex:
+        raise UKCPDPInvalidParameterException(
+            "pyarrow must be installed to write Parquet files"
+        ) from ex
+
+    write_options = _get_write_options(format_options)
+    metadata = _get_metadata(input_data, process_version)
+
+    sink = get_output_sink(output_data_file_path)
+    file_name = sink.get_path(get_file_name(plot_type, "parquet"))
+    file_base = file_name.split(".parquet")[0]
+
+    cubes = []
+    for inx, cube in enumerate(cube_list):
+        if len(cube_list) == 1:
+            cubes.append((cube, file_name))
+        else:
+            cubes.append((cube, f"{file_base}_{inx+1}.parquet"))
+
+    if overlay_cube is not None:
+        cubes.append((overlay_cube, f"{file_base}_overlay.parquet"))
+
+    file_list = []
+    for cube, cube_file_name in cubes:
+        table = cube_to_table(cube, metadata)
+        with sink.open(cube_file_name, "wb") as output_file:
+            pq.write_table(
+                table,
+                output_file,
+                use_dictionary=True,
+                **write_options,
+            )
+        file_list.append(cube_file_name)
+
+    return file_list
+
+
+def cube_to_table(cube, metadata=None):
+    """
+    Convert a cube to a tidy pyarrow Table.
+
+    There is a column for each dimension coordinate, and for each auxiliary
+    coordinate that spans a single dimension, followed by a column of the
+    values, named after the cube. Masked values are null. The units are stored
+    in the metadata of the fields.
+
+    @param cube (iris cube): the cube to convert
+    @param metadata (dict): optional, key-value metadata for the table
+
+    @return a pyarrow Table
+    """
+    import pyarrow as pa  # pylint: disable=C0415
+
+    shape = cube.shape
+    size = int(np.prod(shape, dtype=np.int64))
+
+    columns = []
+    fields = []
+    for dim, extent in enumerate(shape):
+        coords = cube.coords(dimensions=dim, dim_coords=True) + [
+            coord
+            for coord in cube.coords(dimensions=dim, dim_coords=False)
+            if coord.ndim == 1
+        ]
+        if not coords:
+            coords = [None]
+
+        # the index of the point of this dimension for each value, in the order
+        # that the values are raveled
+        indices = np.broadcast_to(
+            np.arange(extent, dtype=np.int32).reshape(
+                [extent if inx == dim else 1 for inx in range(len(shape))]
+            ),
+            shape,
+        ).ravel()
+
+        for coord in coords:
+            if coord is None:
+                name = f"dim_{dim}"
+                array = pa.array(indices)
+                units = None
+            else:
+                name = coord.name()
+                array = _coord_to_array(pa, coord, indices)
+                units = str(coord.units)
+            columns.append(array)
+            fields.append(_get_field(pa, name, array.type, units))
+
+    data = cube.data
+    values = pa.array(
+        np.ma.getdata(data).reshape(size),
+        mask=np.ma.getmaskarray(data).reshape(size) if np.ma.is_masked(data) else None,
+    )
+    columns.append(values)
+    fields.append(_get_field(pa, cube.name(), values.type, str(cube.units)))
+
+    schema = pa.schema(fields, metadata=metadata)
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def _coord_to_array(pa, coord, indices):
+    """
+    Get a column of the points of a coordinate, one value for each index.
+
+    Time is converted to timestamps if the calendar allows, otherwise to
+    strings. Strings are dictionary encoded, with the points as the dictionary.
+
+    """
+    if coord.units.is_time_reference():
+        if coord.units.calendar in TIMESTAMP_CALENDARS:
+            seconds = coord.units.convert(
+                coord.points,
+                cf_units.Unit(
+                    "seconds since 1970-01-01", calendar=coord.units.calendar
+                ),
+            )
+            return pa.array(
+                np.round(seconds).astype(np.int64).astype("datetime64[s]")[indices]
+            )
+
+        labels = get_time_labels(coord, "%Y-%m-%dT%H:%M:%S")
+        return pa.DictionaryArray.from_arrays(pa.array(indices), pa.array(labels))
+
+    if coord.points.dtype.kind in "SU":
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices), pa.array(coord.points.astype(str))
+        )
+
+    return pa.array(coord.points[indices])
+
+
+def _get_field(pa, name, data_type, units):
+    """
+    Get a field for the schema, with the units in its metadata.
+
+    """
+    if units is None or units in ["unknown", "no_unit"]:
+        return pa.field(name, data_type)
+    return pa.field(name, data_type, metadata={"units": units})
+
+
+def _get_metadata(input_data, process_version):
+    """
+    Get the key-value metadata for the file from the user inputs.
+
+    """
+    metadata = {}
+    if input_data is not None:
+        for key, value in input_data.get_user_inputs().items():
+            metadata[str(key)] = str(value)
+    if process_version is not None:
+        metadata["Software Version"] = str(process_version)
+    return metadata
+
+
+def _get_write_options(format_options):
+    """
+    Get the compression keywords for pyarrow.parquet.write_table.
+
+    """
+    if format_options is None:
+        format_options = {}
+
+    unknown = set(format_options) - set(PARQUET_OPTIONS)
+    if unknown:
+        raise UKCPDPInvalidParameterException(
+            f"Invalid Parquet option(s): {', '.join(sorted(unknown))}"
+        )
+
+    return {
+        "compression": format_options.get("compression", PARQUET_COMPRESSION),
+        "compression_level": format_options.get("compression_level"),
+    }
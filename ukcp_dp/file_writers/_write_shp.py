@@ -14,7 +14,9 @@ from ukcp_dp.file_writers._write_shp_three_map import ThreeMapShpWriter
 log = logging.getLogger(__name__)
 
 
-def write_shp_file(cube_list, output_data_file_path, input_data, plot_type):
+def write_shp_file(
+    cube_list, output_data_file_path, input_data, plot_type, max_workers=None
+):
     """
     Output the data as a shapefile.
     This method will decide on a shapefile writer to use dependent on the value
@@ -24,6 +26,9 @@ def write_shp_file(cube_list, output_data_file_path, input_data, plot_type):
     @param output_data_file_path (str): the full path to the file
     @param input_data (InputData): an object containing user defined values
     @param plot_type (PlotType): the type of the plot
+    @param max_workers (int): the maximum number of worker processes to use
+        when writing one file per ensemble, if None the files are written in
+        turn
 
     @return a list of file paths/names
 
@@ -47,4 +52,6 @@ def write_shp_file(cube_list, output_data_file_path, input_data, plot_type):
     else:
         raise UKCPDPInvalidParameterException()
 
-    return shp_writer.write_shp(input_data, cube_list, output_data_file_path, plot_type)
+    return shp_writer.write_shp(
+        input_data, cube_list, output_data_file_path, plot_type, max_workers
+    )
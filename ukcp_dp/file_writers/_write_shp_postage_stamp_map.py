@@ -6,11 +6,12 @@ from the BaseShpWriter base class.
 
 import logging
 
-import shapefile as shp
+import numpy as np
 from ukcp_dp.constants import AreaType, InputType
-from ukcp_dp.file_writers._base_shp_writer import BaseShpWriter
-from ukcp_dp.file_writers._utils import ensemble_to_string
-from ukcp_dp.utils import get_spatial_resolution_m
+from ukcp_dp.file_writers._base_shp_writer import BaseShpWriter, _write_bbox_shapes
+from ukcp_dp.file_writers._parallel import write_slices
+from ukcp_dp.file_writers._utils import ensemble_to_string, get_ordered_data
+from ukcp_dp.utils import get_region_shapefile, get_spatial_resolution_m
 
 
 LOG = logging.getLogger(__name__)
@@ -42,26 +43,45 @@ class PostageStampMapShpWriter(BaseShpWriter):
         """
         Write a shapefile for gridded data defined by a bbox.
 
+        The files for the ensembles are written in parallel if max_workers is
+        greater than one.
+
         """
         cube = self.cube_list[0]
         output_file_list = []
         resolution = get_spatial_resolution_m(cube)
         half_grid_size = resolution / 2
         var_label = self.input_data.get_value_label(InputType.VARIABLE)[0]
-
-        for ensemble_slice in cube.slices_over("ensemble_member"):
-            ensemble_no = ensemble_to_string(
-                ensemble_slice.coord("ensemble_member").points[0]
+        x_coords = cube.coord("projection_x_coordinate").points
+        y_coords = cube.coord("projection_y_coordinate").points
+
+        output_data_files = []
+        jobs = []
+        for ensemble_member in cube.coord("ensemble_member").points:
+            output_data_file = self._get_file_name(
+                f"_{ensemble_to_string(ensemble_member)}"
             )
-            output_data_file = self._get_file_name(f"_{ensemble_no}")
-
-            self._write_bbox_data(
-                ensemble_slice,
-                half_grid_size,
-                output_data_file,
-                output_file_list,
-                var_label,
+            output_data_files.append(output_data_file)
+            jobs.append(
+                (
+                    self.sink,
+                    output_data_file,
+                    x_coords,
+                    y_coords,
+                    half_grid_size,
+                    var_label,
+                )
             )
+
+        data = get_ordered_data(cube, cube.data, ["ensemble_member"])
+        if not cube.coord_dims("ensemble_member"):
+            data = data[np.newaxis]
+
+        write_slices(_write_bbox_shapes, data, jobs, self.max_workers)
+
+        for output_data_file in output_data_files:
+            self._add_file_names(cube, output_data_file, output_file_list)
+
         return output_file_list
 
     def _write_region_shp(self):
@@ -75,33 +95,31 @@ class PostageStampMapShpWriter(BaseShpWriter):
         var_label = self.input_data.get_value_label(InputType.VARIABLE)[0]
 
         for file in region_shape_files:
-            LOG.debug("Loading shapefile: %s", file)
-
-            with shp.Reader(file) as region_shape_file:
-                for ensemble_slice in cube.slices_over("ensemble_member"):
-
-                    ensemble_name = ensemble_slice.coord("ensemble_member").points[0]
-
-                    if ensemble_name < 10:
-                        ensemble_no = f"0{ensemble_name}"
-                    else:
-                        ensemble_no = str(ensemble_name)
-
-                    output_data_file = self._get_file_name(f"_{ensemble_no}")
-                    file_bit = file.split("-")[-2]
-                    if len(region_shape_files) > 1:
-                        suffix = f"_{file_bit}_{ensemble_no}"
-                    else:
-                        suffix = f"_{ensemble_no}"
-
-                    output_data_file = self._get_file_name(suffix)
-
-                    self._write_region_data(
-                        ensemble_slice,
-                        output_data_file,
-                        output_file_list,
-                        region_shape_file,
-                        var_label,
-                    )
+            region_shape_file = get_region_shapefile(file)
+            for ensemble_slice in cube.slices_over("ensemble_member"):
+
+                ensemble_name = ensemble_slice.coord("ensemble_member").points[0]
+
+                if ensemble_name < 10:
+                    ensemble_no = f"0{ensemble_name}"
+                else:
+                    ensemble_no = str(ensemble_name)
+
+                output_data_file = self._get_file_name(f"_{ensemble_no}")
+                file_bit = file.split("-")[-2]
+                if len(region_shape_files) > 1:
+                    suffix = f"_{file_bit}_{ensemble_no}"
+                else:
+                    suffix = f"_{ensemble_no}"
+
+                output_data_file = self._get_file_name(suffix)
+
+                self._write_region_data(
+                    ensemble_slice,
+                    output_data_file,
+                    output_file_list,
+                    region_shape_file,
+                    var_label,
+                )
 
         return output_file_list
@@ -5,10 +5,9 @@ method from the BaseShpWriter base class.
 """
 import logging
 
-import shapefile as shp
 from ukcp_dp.constants import AreaType, InputType
 from ukcp_dp.file_writers._base_shp_writer import BaseShpWriter
-from ukcp_dp.utils import get_spatial_resolution_m
+from ukcp_dp.utils import get_region_shapefile, get_spatial_resolution_m
 
 
 LOG = logging.getLogger(__name__)
@@ -65,23 +64,21 @@ class SingleMapShpWriter(BaseShpWriter):
         var_label = self.input_data.get_value_label(InputType.VARIABLE)[0]
 
         for file in region_shape_files:
-            LOG.debug("Loading shapefile: %s", file)
-
-            with shp.Reader(file) as region_shape_file:
-                file_bit = file.split("-")[-2]
-                if len(region_shape_files) > 1:
-                    suffix = f"_{file_bit}"
-                else:
-                    suffix = ""
-
-                output_data_file = self._get_file_name(suffix)
-
-                self._write_region_data(
-                    cube,
-                    output_data_file,
-                    output_file_list,
-                    region_shape_file,
-                    var_label,
-                )
+            region_shape_file = get_region_shapefile(file)
+            file_bit = file.split("-")[-2]
+            if len(region_shape_files) > 1:
+                suffix = f"_{file_bit}"
+            else:
+                suffix = ""
+
+            output_data_file = self._get_file_name(suffix)
+
+            self._write_region_data(
+                cube,
+                output_data_file,
+                output_file_list,
+                region_shape_file,
+                var_label,
+            )
 
         return output_file_list
@@ -0,0 +1,371 @@
+"""
+This module is the entry point for writing Zarr stores.
+
+Each cube is written to a Zarr group, laid out as the netCDF file would be. There
+is an array for the data, one for each coordinate, and its bounds, and one for the
+grid mapping. The CF attributes are stored as the attributes of the arrays and of
+the group. The data are written a chunk at a time from the lazy data of the cube,
+so the full array is never held in memory.
+
+zarr is only imported when a Zarr store is written, so it is not needed for the
+other data formats.
+
+"""
+import logging
+import numbers
+import os
+import tempfile
+import warnings
+import zipfile
+
+import dask.array as da
+from netCDF4 import default_fillvals
+import numpy as np
+from ukcp_dp.exception import UKCPDPInvalidParameterException
+from ukcp_dp.file_writers._utils import LOCAL_KEYS, get_chunksizes, get_file_name
+from ukcp_dp.utils import DirectorySink, get_output_sink
+
+
+LOG = logging.getLogger(__name__)
+
+# the keys for the Zarr format_options
+ZARR_OPTIONS = ["store", "chunking", "complevel"]
+
+# the values for the store option
+ZARR_STORES = ["directory", "zip"]
+
+# the default Blosc zstd compression level
+ZARR_COMPLEVEL = 5
+
+# the CF names of the parameters of an iris GeogCS
+ELLIPSOID_PARAMETERS = [
+    "semi_major_axis",
+    "semi_minor_axis",
+    "inverse_flattening",
+    "longitude_of_prime_meridian",
+]
+
+# the value used for masked data
+FILL_VALUE = 1e20
+
+
+def write_zarr_file(
+    cube_list, overlay_cube, output_data_file_path, plot_type, format_options=None
+):
+    """
+    Output the data as Zarr stores, one per cube.
+
+    @param cube_list (iris cube list): a list of cubes containing the
+        selected data, one cube per scenario, per variable
+    @param overlay_cube (iris cube): a cube containing the data for the overlay
+    @param output_data_file_path (str or OutputSink): the full path to the
+        output directory or the sink to write the files to
+    @param plot_type (PlotType): the type of the plot
+    @param format_options (dict): optional, the keys may be:
+        store (str): "directory", the default, for a directory store, or "zip"
+            for a zip file store. A directory store can only be written to an
+            output directory
+        chunking (str or tuple): see file_writers._utils.get_chunksizes, the
+            default is "map" for gridded data and a single chunk otherwise
+        complevel (int): the Blosc zstd compression level, 1 to 9
+
+    @return a list of file paths/names
+    """
+    LOG.info("Writing data to Zarr store")
+
+    try:
+        import zarr  # pylint: disable=C0415
+    except ImportError as ex:
+        raise UKCPDPInvalidParameterException(
+            "zarr must be installed to write Zarr stores"
+        ) from ex
+
+    if format_options is None:
+        format_options = {}
+    unknown = set(format_options) - set(ZARR_OPTIONS)
+    if unknown:
+        raise UKCPDPInvalidParameterException(
+            f"Invalid Zarr option(s): {', '.join(sorted(unknown))}"
+        )
+
+    store_type = format_options.get("store", "directory")
+    if store_type not in ZARR_STORES:
+        raise UKCPDPInvalidParameterException(f"Invalid Zarr store: {store_type}")
+
+    complevel = format_options.get("complevel", ZARR_COMPLEVEL)
+    if complevel not in range(1, 10):
+        raise UKCPDPInvalidParameterException(
+            f"Invalid Zarr complevel: {complevel}, it must be between 1 and 9"
+        )
+    compressor = zarr.codecs.BloscCodec(
+        cname="zstd", clevel=complevel, shuffle="shuffle"
+    )
+
+    sink = get_output_sink(output_data_file_path)
+    if store_type == "directory" and not isinstance(sink, DirectorySink):
+        raise UKCPDPInvalidParameterException(
+            "A Zarr directory store can only be written to an output directory, "
+            "use the zip store"
+        )
+
+    extension = "zarr" if store_type == "directory" else "zarr.zip"
+    file_name = sink.get_path(get_file_name(plot_type, extension))
+    file_base = file_name.split(f".{extension}")[0]
+
+    cubes = []
+    for inx, cube in enumerate(cube_list):
+        if len(cube_list) == 1:
+            cubes.append((cube, file_name))
+        else:
+            cubes.append((cube, f"{file_base}_{inx+1}.{extension}"))
+
+    if overlay_cube is not None:
+        cubes.append((overlay_cube, f"{file_base}_overlay.{extension}"))
+
+    file_list = []
+    for cube, cube_file_name in cubes:
+        chunks = _get_chunks(cube, format_options.get("chunking"))
+
+        if store_type == "directory":
+            _write_store(zarr, cube_file_name, cube, chunks, compressor)
+        else:
+            # the store is written to a local directory and then zipped, the zip
+            # file is written to local disk before it is added to the sink
+            with sink.local_file(cube_file_name) as local_file_name:
+                with tempfile.TemporaryDirectory() as directory:
+                    _write_store(zarr, directory, cube, chunks, compressor)
+                    _zip_directory(directory, local_file_name)
+
+        file_list.append(cube_file_name)
+
+    return file_list
+
+
+def _write_store(zarr, path, cube, chunks, compressor):
+    """
+    Write a cube to a Zarr directory store and consolidate the metadata.
+
+    """
+    group = zarr.open_group(zarr.storage.LocalStore(path), mode="w")
+    _write_cube(group, cube, chunks, compressor)
+    with warnings.catch_warnings():
+        # consolidated metadata is not yet part of the Zarr version 3 spec but it
+        # is used by zarr-python and xarray to open the store with one read
+        warnings.simplefilter("ignore", UserWarning)
+        zarr.consolidate_metadata(group.store)
+
+
+def _zip_directory(directory, zip_file_name):
+    """
+    Write the contents of a directory to a zip file. The chunks are already
+    compressed so the files are stored without compression.
+
+    """
+    with zipfile.ZipFile(zip_file_name, "w", compression=zipfile.ZIP_STORED) as zip_:
+        for root, _, file_names in os.walk(directory):
+            for file_name in sorted(file_names):
+                file_path = os.path.join(root, file_name)
+                zip_.write(file_path, arcname=os.path.relpath(file_path, directory))
+
+
+def _write_cube(group, cube, chunks, compressor):
+    """
+    Write a cube to a Zarr group.
+
+    @param group (zarr Group): the group to write to
+    @param cube (iris cube): the cube to write
+    @param chunks (tuple(int)): the chunk shape for the data
+    @param compressor (zarr codec): the compressor for the data
+    """
+    dim_names = []
+    for dim in range(cube.ndim):
+        dim_coords = cube.coords(dimensions=dim, dim_coords=True)
+        if dim_coords:
+            dim_names.append(_get_name(dim_coords[0]))
+        else:
+            dim_names.append(f"dim{dim}")
+
+    # global attributes
+    group.attrs.update(
+        {
+            key: _to_json(value)
+            for key, value in cube.attributes.items()
+            if key not in LOCAL_KEYS
+        }
+    )
+
+    data_attributes = _get_cf_attributes(cube)
+    data_attributes.update(
+        {
+            key: _to_json(value)
+            for key, value in cube.attributes.items()
+            if key in LOCAL_KEYS
+        }
+    )
+    if cube.cell_methods:
+        data_attributes["cell_methods"] = " ".join(
+            str(cell_method) for cell_method in cube.cell_methods
+        )
+
+    aux_coord_names = []
+    for coord in cube.coords():
+        name = _get_name(coord)
+        coord_dims = [dim_names[dim] for dim in cube.coord_dims(coord)]
+        coord_attributes = _get_cf_attributes(coord)
+        coord_attributes.update(
+            {key: _to_json(value) for key, value in coord.attributes.items()}
+        )
+        if coord.units.calendar is not None:
+            coord_attributes["calendar"] = coord.units.calendar
+
+        if coord.has_bounds():
+            coord_attributes["bounds"] = f"{name}_bnds"
+            _write_array(group, f"{name}_bnds", coord.bounds, coord_dims + ["bnds"], {})
+
+        _write_array(group, name, coord.points, coord_dims, coord_attributes)
+        if not cube.coords(coord, dim_coords=True):
+            aux_coord_names.append(name)
+
+    if aux_coord_names:
+        data_attributes["coordinates"] = " ".join(aux_coord_names)
+
+    coord_system = cube.coord_system()
+    if coord_system is not None:
+        data_attributes["grid_mapping"] = coord_system.grid_mapping_name
+        _write_array(
+            group,
+            coord_system.grid_mapping_name,
+            np.array(0, dtype=np.int32),
+            [],
+            _get_grid_mapping_attributes(coord_system),
+        )
+
+    # write the data a chunk at a time, masked values are filled
+    data = cube.core_data()
+    if not isinstance(data, da.Array):
+        data = da.from_array(data, chunks=chunks, asarray=False)
+    data = data.rechunk(chunks)
+    fill_value = _get_fill_value(data.dtype)
+    data = da.ma.filled(data, fill_value)
+    data_attributes["missing_value"] = fill_value
+
+    array = group.create_array(
+        _get_name(cube),
+        shape=cube.shape,
+        dtype=cube.dtype,
+        chunks=chunks,
+        compressors=compressor,
+        fill_value=fill_value,
+        dimension_names=dim_names,
+        attributes=data_attributes,
+    )
+    da.store(data, array, lock=False)
+
+
+def _write_array(group, name, values, dims, attributes):
+    """
+    Write a small array, i.e. a coordinate, in a single chunk.
+
+    """
+    if values.dtype.kind in "SU":
+        values = values.astype(str)
+        dtype = str
+    else:
+        dtype = values.dtype
+
+    array = group.create_array(
+        name,
+        shape=values.shape,
+        dtype=dtype,
+        chunks=values.shape if values.ndim else (),
+        dimension_names=dims,
+        attributes=attributes,
+    )
+    array[...] = values
+
+
+def _get_chunks(cube, chunking):
+    """
+    Get the chunk shape for the data. If chunking is None, gridded data are
+    chunked by map. Data that do not have the dimensions needed by the chunking
+    are written as a single chunk.
+
+    """
+    if cube.ndim == 0:
+        return ()
+    if chunking is None:
+        chunking = "map"
+    # the cube may not have the dimensions of the chunking, i.e. there is no
+    # time dimension for "time_series"
+    return get_chunksizes(cube, chunking) or cube.shape
+
+
+def _get_fill_value(dtype):
+    """
+    Get the value used for masked data. Floating point data use FILL_VALUE and
+    other data use the netCDF default fill value for the type.
+
+    """
+    if dtype.kind == "f":
+        return FILL_VALUE
+    try:
+        return default_fillvals[dtype.str[1:]]
+    except KeyError:
+        raise UKCPDPInvalidParameterException(
+            f"Unable to write data of type {dtype} to a Zarr store"
+        ) from None
+
+
+def _get_name(cube_or_coord):
+    return cube_or_coord.var_name or cube_or_coord.name()
+
+
+def _get_cf_attributes(cube_or_coord):
+    """
+    Get the standard_name, long_name and units.
+
+    """
+    attributes = {}
+    if cube_or_coord.standard_name is not None:
+        attributes["standard_name"] = cube_or_coord.standard_name
+    if cube_or_coord.long_name is not None:
+        attributes["long_name"] = cube_or_coord.long_name
+    if not cube_or_coord.units.is_unknown() and not cube_or_coord.units.is_no_unit():
+        attributes["units"] = cube_or_coord.units.origin
+    return attributes
+
+
+def _get_grid_mapping_attributes(coord_system):
+    """
+    Get the CF grid mapping attributes for an iris coordinate system. The
+    parameters of the coordinate system, and of its ellipsoid, already have their
+    CF names.
+
+    """
+    attributes = {"grid_mapping_name": coord_system.grid_mapping_name}
+    parameters = dict(vars(coord_system))
+    ellipsoid = parameters.pop("ellipsoid", None)
+    if ellipsoid is not None:
+        for key in ELLIPSOID_PARAMETERS:
+            parameters[key] = getattr(ellipsoid, key, None)
+
+    for key, value in parameters.items():
+        if key.startswith("_") or not isinstance(value, numbers.Number):
+            continue
+        attributes[key] = _to_json(value)
+
+    try:
+        attributes["crs_wkt"] = coord_system.as_cartopy_crs().to_wkt()
+    except Exception:  # pylint: disable=W0703
+        LOG.debug("unable to get the WKT for %s", coord_system)
+    return attributes
+
+
+def _to_json(value):
+    """
+    Convert numpy values to values that can be stored as JSON.
+
+    """
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    return value
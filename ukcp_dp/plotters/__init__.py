@@ -1,3 +1,4 @@
+from ukcp_dp.plotters._batch import render_batch, start_render_pool
 from ukcp_dp.plotters._plotter import write_plot
 
-__all__ = ["write_plot"]
+__all__ = ["render_batch", "start_render_pool", "write_plot"]
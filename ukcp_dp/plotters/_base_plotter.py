@@ -3,9 +3,8 @@ from __future__ import unicode_literals
 from datetime import datetime
 import logging
 
-import matplotlib.cbook as cbook
-import matplotlib.image as image
 from ukcp_dp.constants import InputType, LOGO_SMALL, LOGO_MEDIUM, LOGO_LARGE
+from ukcp_dp.plotters.utils._assets import get_logo
 
 
 LOG = logging.getLogger(__name__)
@@ -50,7 +49,9 @@ class BasePlotter:
             selected data, one cube per scenario, per variable
         @param overlay_cube (iris cube): a cube containing the data for
             the overlay
-        @param output_path (str): the full path to the file
+        @param output_path (str or file object or list): the full path to the
+            file or a binary file object, with a name ending in the image
+            format, or a list of these to save the plot in several formats
         @param title (str): a title for the plot
         @param vocab (Vocab): an instance of the ukcp_dp Vocab class
         @param plot_settings (StandardMap): an object containing plot settings
@@ -70,14 +71,20 @@ class BasePlotter:
         """
         This method should be overridden to produce the plots.
 
-        @param output_path (str): the full path to the file
+        @param output_path (str or file object or list): the full path to the
+            file or a binary file object, with a name ending in the image
+            format, or a list of these to save the plot in several formats
         @param plot_settings (StandardMap): an object containing plot settings
         """
         raise NotImplementedError
 
-    def _add_logo(self, fig):
+    def _add_logo(self, fig, add_date_stamp=True):
         """
         Add a logo to the plot.
+
+        @param fig (matplotlib.figure.Figure)
+        @param add_date_stamp (bool): if False do not add the date stamp, even
+            if there is a user defined title
         """
         image_size = self.input_data.get_value(InputType.IMAGE_SIZE)
 
@@ -95,13 +102,13 @@ class BasePlotter:
             logo = LOGO_LARGE
             v_offset = 1464
 
-        datafile = cbook.get_sample_data(logo, asfileobj=False)
-        im = image.imread(datafile)
-
-        fig.figimage(im, 5, v_offset, zorder=3)
+        fig.figimage(get_logo(logo), 5, v_offset, zorder=3)
         self._add_funder_text(fig)
 
-        if self.input_data.get_value(InputType.PLOT_TITLE) is not None:
+        if (
+            add_date_stamp
+            and self.input_data.get_value(InputType.PLOT_TITLE) is not None
+        ):
             # if there is a user defined title then include a timestamp
             self._add_date_stamp(fig)
 
@@ -0,0 +1,205 @@
+"""
+This module provides render_batch, which generates a batch of plots, optionally
+using a pool of worker processes.
+
+The workers are started by start_render_pool. A worker imports the plotters,
+and so matplotlib and cartopy, and loads the logos and colour palettes when it
+starts, so a pool can be kept and reused for several batches without paying
+these costs for each plot.
+
+"""
+from concurrent.futures import ProcessPoolExecutor, wait
+import gc
+import logging
+
+import dask.array as da
+import numpy as np
+from ukcp_dp.plotters._plotter import write_plot
+from ukcp_dp.plotters.utils import warm_assets
+from ukcp_dp.utils import from_shared_memory, get_output_sink, to_shared_memory
+
+
+LOG = logging.getLogger(__name__)
+
+
+def start_render_pool(max_workers=None):
+    """
+    Start a pool of worker processes for render_batch.
+
+    The caller is responsible for shutting down the pool, i.e. by using it as
+    a context manager.
+
+    @param max_workers (int): the number of worker processes, if None the
+        number of processors is used
+
+    @return a ProcessPoolExecutor
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=warm_assets)
+
+
+def render_batch(jobs, max_workers=None, executor=None):
+    """
+    Generate a batch of plots.
+
+    Each job is a dict of the keyword arguments of write_plot, i.e.
+    plot_type, output_path, image_format, input_data, cube_list, overlay_cube,
+    title, vocab and plot_settings.
+
+    If an executor is given, or max_workers is greater than one, the plots are
+    generated by worker processes. The data of each cube are copied once, into
+    shared memory, and the cubes are passed to the workers without their data,
+    so the arrays are not pickled. The data are read only in the workers. Plots
+    written to a sink that does not support workers, i.e. a MemorySink, are
+    generated in this process.
+
+    This function does not return until all of the plots have been generated,
+    an exception raised by any of them is re-raised.
+
+    @param jobs (list(dict)): the arguments of write_plot for each plot
+    @param max_workers (int): the maximum number of worker processes. If None,
+        or less than 2, and no executor is given the plots are generated in
+        turn from this process
+    @param executor (ProcessPoolExecutor): optional, a pool started by
+        start_render_pool, to reuse its workers between batches
+
+    @return a list of the paths of the images, as returned by write_plot, in
+        the order of the jobs
+    """
+    if executor is None and (max_workers is None or max_workers < 2 or len(jobs) < 2):
+        return [write_plot(**job) for job in jobs]
+
+    LOG.debug("rendering %s plots with worker processes", len(jobs))
+
+    image_files = [None] * len(jobs)
+    local_jobs = []
+    shared_cubes = {}
+    shared_blocks = []
+    futures = {}
+    try:
+        worker_jobs = []
+        for index, job in enumerate(jobs):
+            if not get_output_sink(job["output_path"]).supports_workers:
+                local_jobs.append(index)
+                continue
+
+            worker_job = dict(job)
+            worker_job["cube_list"] = [
+                _share_cube(cube, shared_cubes, shared_blocks)
+                for cube in job["cube_list"]
+            ]
+            if job.get("overlay_cube") is not None:
+                worker_job["overlay_cube"] = _share_cube(
+                    job["overlay_cube"], shared_cubes, shared_blocks
+                )
+            worker_jobs.append((index, worker_job))
+
+        if not worker_jobs:
+            # no pool is needed
+            _render_local(jobs, local_jobs, image_files)
+        elif executor is None:
+            with start_render_pool(min(max_workers, len(worker_jobs))) as pool:
+                futures = _submit(pool, worker_jobs)
+                _render_local(jobs, local_jobs, image_files)
+                _collect(futures, image_files)
+        else:
+            futures = _submit(executor, worker_jobs)
+            _render_local(jobs, local_jobs, image_files)
+            _collect(futures, image_files)
+
+    finally:
+        # the workers must be finished with the shared memory before it is
+        # released
+        wait(futures.values())
+        for shared_block in shared_blocks:
+            shared_block.close()
+            shared_block.unlink()
+
+    return image_files
+
+
+def _share_cube(cube, shared_cubes, shared_blocks):
+    """
+    Copy the data of a cube into shared memory, if it has not already been
+    copied.
+
+    @param cube (iris cube): the cube
+    @param shared_cubes (dict): the shared cubes, keyed on the id of the cube
+    @param shared_blocks (list): the list to add the new SharedMemory to
+
+    @return a tuple of (cube, data spec, mask spec), where the cube has
+        placeholder lazy data and the mask spec is None for unmasked data
+    """
+    if id(cube) not in shared_cubes:
+        data = cube.data
+        data_spec = to_shared_memory(np.ma.getdata(data), shared_blocks)
+        if isinstance(data, np.ma.MaskedArray):
+            mask_spec = to_shared_memory(np.ma.getmaskarray(data), shared_blocks)
+        else:
+            mask_spec = None
+        # the placeholder is a small dask graph, rather than an array, when it
+        # is pickled
+        empty_cube = cube.copy(
+            data=da.zeros(cube.shape, dtype=data.dtype, chunks=cube.shape)
+        )
+        shared_cubes[id(cube)] = (empty_cube, data_spec, mask_spec)
+
+    return shared_cubes[id(cube)]
+
+
+def _submit(executor, worker_jobs):
+    return {
+        index: executor.submit(_render, worker_job) for index, worker_job in worker_jobs
+    }
+
+
+def _render_local(jobs, local_jobs, image_files):
+    for index in local_jobs:
+        image_files[index] = write_plot(**jobs[index])
+
+
+def _collect(futures, image_files):
+    for index, future in futures.items():
+        image_files[index] = future.result()
+
+
+def _render(job):
+    """
+    Generate a plot from cubes whose data are held in shared memory. This is
+    run in a worker process.
+
+    """
+    shared_blocks = []
+    try:
+        job["cube_list"] = [
+            _attach_cube(shared_cube, shared_blocks) for shared_cube in job["cube_list"]
+        ]
+        if job.get("overlay_cube") is not None:
+            job["overlay_cube"] = _attach_cube(job["overlay_cube"], shared_blocks)
+        return write_plot(**job)
+
+    finally:
+        # the views of the buffers, including any held by the closed figure,
+        # must be released before they can be closed
+        job = None
+        gc.collect()
+        for shared_block in shared_blocks:
+            shared_block.close()
+
+
+def _attach_cube(shared_cube, shared_blocks):
+    """
+    Give a cube from _share_cube a read only view of its data in shared memory.
+
+    """
+    cube, data_spec, mask_spec = shared_cube
+    data_block, data = from_shared_memory(data_spec)
+    shared_blocks.append(data_block)
+    data.flags.writeable = False
+    if mask_spec is not None:
+        mask_block, mask = from_shared_memory(mask_spec)
+        shared_blocks.append(mask_block)
+        mask.flags.writeable = False
+        data = np.ma.masked_array(data, mask=mask)
+
+    cube.data = data
+    return cube
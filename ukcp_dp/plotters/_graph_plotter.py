@@ -31,7 +31,9 @@ class GraphPlotter(BasePlotter):
         """
         Override base class method.
 
-        @param output_path (str): the full path to the file
+        @param output_path (str or file object or list): the full path to the
+            file or a binary file object, with a name ending in the image
+            format, or a list of these to save the plot in several formats
         @param plot_settings (StandardMap): an object containing plot settings
         """
         # By default we want to show the legend
@@ -95,7 +97,7 @@ class GraphPlotter(BasePlotter):
 
         # Output the plot
         #         plotgeneral.set_standard_margins(settings=None, fig=fig)
-        end_figure(output_path)
+        end_figure(output_path, dpi=plot_settings.dpi)
 
     def _generate_graph(self):
         """
@@ -1,17 +1,21 @@
 import logging
 
+from matplotlib.collections import LineCollection
 import matplotlib.pyplot as plt
-import numpy as np
-import shapefile as shp
 from ukcp_dp.constants import OVERLAY_COLOUR, OVERLAY_LINE_WIDTH, AreaType, InputType
 from ukcp_dp.plotters._base_plotter import BasePlotter
+from ukcp_dp.plotters.utils._map_template import MapTemplate, get_map_template
+from ukcp_dp.plotters.utils._map_utils import plot_standard_choropleth_map
 from ukcp_dp.plotters.utils._plotting_utils import (
+    RASTER_FORMATS,
     end_figure,
+    get_image_format,
     make_standard_bar,
+    set_font,
     start_standard_figure,
     wrap_string,
 )
-from ukcp_dp.plotters.utils._region_utils import reg_from_cube
+from ukcp_dp.plotters.utils._region_utils import get_overlay_segments, reg_from_cube
 from ukcp_dp.spatial_files import (
     OVERLAY_ADMIN,
     OVERLAY_COUNTRY,
@@ -25,6 +29,16 @@ from ukcp_dp.spatial_files import (
 
 LOG = logging.getLogger(__name__)
 
+# the high and low resolution shapefiles for each overlay
+OVERLAY_FILES = {
+    AreaType.COUNTRY: (OVERLAY_COUNTRY, OVERLAY_COUNTRY_SMALL),
+    AreaType.ADMIN_REGION: (OVERLAY_ADMIN, OVERLAY_ADMIN_SMALL),
+    AreaType.RIVER_BASIN: (OVERLAY_RIVER, OVERLAY_RIVER_SMALL),
+    # TODO use the low res version of the coast line for now as there is an
+    # issue with the high res version, OVERLAY_COASTLINE
+    "coast_line": (OVERLAY_COASTLINE_SMALL, OVERLAY_COASTLINE_SMALL),
+}
+
 
 class MapPlotter(BasePlotter):
     """
@@ -33,13 +47,25 @@ class MapPlotter(BasePlotter):
     This class extends BasePlotter with _generate_plot(self, output_path). This
     class should be extended with a _generate_subplots(self, cube,
     plot_settings, fig) method to plot the map.
+
+    Maps of regions that are saved as raster images are plotted on a
+    MapTemplate, which is kept between plots with the same layout, so that
+    the sub-plots and everything that does not depend on the data are only
+    created and drawn once. The sub-plots should be added with
+    _plot_region_map.
     """
 
+    def __init__(self):
+        super().__init__()
+        self._template = None
+
     def _generate_plot(self, output_path, plot_settings):
         """
         Override base class method.
 
-        @param output_path (str): the full path to the file
+        @param output_path (str or file object or list): the full path to the
+            file or a binary file object, with a name ending in the image
+            format, or a list of these to save the plot in several formats
         @param plot_settings (StandardMap): an object containing plot settings
         """
         # TODO we can only produce a map for a single scenario and variable
@@ -63,12 +89,106 @@ class MapPlotter(BasePlotter):
         plot_settings.dygrid = 1000
         plot_settings.gridlcol = None
 
-        # First create the figure
-        fig, _, _ = start_standard_figure(plot_settings)
+        # First create the figure, or get the template
+        fig = self._start_figure(cube, plot_settings, output_path)
+        try:
+            self._plot_figure(cube, plot_settings, fig, output_path)
+        finally:
+            if self._template is not None:
+                self._template.clear()
+
+    def _start_figure(self, cube, plot_settings, output_path):
+        """
+        Create a new figure, with the logo and metadata box, or get the
+        figure of the template for this layout.
+
+        @param cube (iris cube): a cube containing the selected data
+        @param plot_settings (StandardMap): an object containing plot settings
+        @param output_path (str or file object or list): the full path to the
+            file or a binary file object, or a list of these
+
+        @return a matplotlib.figure.Figure
+        """
+        template_key = self._get_template_key(cube, plot_settings, output_path)
+        if template_key is None:
+            self._template = None
+            fig, _, _ = start_standard_figure(plot_settings)
+            # Add the logo and metadata box
+            self._add_logo(fig)
+            return fig
+
+        self._template = get_map_template(template_key)
+        if self._template is None:
+            LOG.debug("creating a map template")
+            fig, _, _ = start_standard_figure(plot_settings)
+            # the date stamp is not part of the template
+            self._add_logo(fig, add_date_stamp=False)
+            self._template = MapTemplate(template_key, fig, plot_settings.dpi)
+        else:
+            set_font(plot_settings.fontfam, plot_settings.fsize)
+
+        if self.input_data.get_value(InputType.PLOT_TITLE) is not None:
+            self._add_date_stamp(self._template.fig)
+        return self._template.fig
 
-        # Add the logo and metadata box
-        self._add_logo(fig)
+    def _get_template_key(self, cube, plot_settings, output_path):
+        """
+        Get the key of the template for this plot. Only maps of regions, which
+        are always of the whole of the UK, use a template. As the background
+        is kept as an image a template is not used for vector formats, i.e.
+        PDF.
+
+        @param cube (iris cube): a cube containing the selected data
+        @param plot_settings (StandardMap): an object containing plot settings
+        @param output_path (str or file object or list): the full path to the
+            file or a binary file object, or a list of these
+
+        @return a tuple, or None if a template should not be used
+        """
+        if self.input_data.get_area_type() == AreaType.BBOX:
+            return None
+        if not isinstance(output_path, list):
+            output_path = [output_path]
+        if any(get_image_format(path) not in RASTER_FORMATS for path in output_path):
+            return None
+
+        return (
+            type(self).__name__,
+            self._get_layout(cube),
+            self.input_data.get_value(InputType.IMAGE_SIZE),
+            plot_settings.proj,
+            self.input_data.get_value(InputType.SHOW_BOUNDARIES),
+            tuple(plot_settings.cmsize),
+            plot_settings.dpi,
+            plot_settings.fontfam,
+            plot_settings.fsize,
+            str(plot_settings.maskcol),
+            str(plot_settings.figbackgroundcol),
+            tuple(plot_settings.xlims),
+            tuple(plot_settings.ylims),
+        )
+
+    def _get_layout(self, cube):
+        """
+        Get a description of the layout of the sub-plots, for the key of the
+        template. This should be overridden if the layout depends on the data.
+
+        @param cube (iris cube): a cube containing the selected data
 
+        @return a hashable value
+        """
+        return None
+
+    def _plot_figure(self, cube, plot_settings, fig, output_path):
+        """
+        Plot the maps, title and colour bar, and save the figure.
+
+        @param cube (iris cube): a cube containing the selected data
+        @param plot_settings (StandardMap): an object containing plot settings
+        @param fig (matplotlib.figure.Figure)
+        @param output_path (str or file object or list): the full path to the
+            file or a binary file object, or a list of these
+        """
         # Call the method to generate the maps
         result = self._generate_subplots(cube, plot_settings, fig)
 
@@ -97,7 +217,10 @@ class MapPlotter(BasePlotter):
 
         # Set the margins, and save/display & close the plot:
         #         plotgeneral.set_standard_margins(settings=None, fig=fig)
-        end_figure(output_path)
+        if self._template is None:
+            end_figure(output_path, dpi=plot_settings.dpi)
+        else:
+            self._template.save(output_path, plot_settings.dpi)
 
     def _generate_subplots(self, cube, plot_settings, fig):
         """
@@ -109,6 +232,39 @@ class MapPlotter(BasePlotter):
         """
         raise NotImplementedError
 
+    def _plot_region_map(self, fig, grid, plot_settings, cube):
+        """
+        Plot a choropleth map of the regions in a sub-plot.
+
+        If a template is being used the sub-plot is taken from the template,
+        in the order in which they were added, and only the data are plotted.
+
+        @param fig (matplotlib.figure.Figure)
+        @param grid (SubplotSpec): the position of the sub-plot
+        @param plot_settings (StandardMap): an object containing plot settings
+        @param cube (iris cube): a cube containing the data for the regions
+
+        @return a tuple of the axes and the ScalarMappable of the colours
+        """
+        if self._template is None:
+            ax = fig.add_subplot(grid, projection=plot_settings.proj)
+        else:
+            ax = self._template.get_axes(grid, plot_settings)
+
+        # Setting bar_orientation="none" here to override (prevent) drawing
+        # the colour bar
+        return plot_standard_choropleth_map(
+            cube,
+            plot_settings,
+            fig=fig,
+            ax=ax,
+            barlab=None,
+            bar_orientation="none",
+            outfnames=None,
+            hi_res=False,
+            draw_background=self._template is None,
+        )
+
     def _is_landscape(self, cube, scaling_factor=1):
         """
         Return True if the range of the x coordinates is larger than the range
@@ -139,53 +295,24 @@ class MapPlotter(BasePlotter):
 
         @param overlay (str): the name of the overlay
         """
-        if overlay is None:
+        if overlay not in OVERLAY_FILES:
             overlay = "coast_line"
-
-        if overlay == AreaType.COUNTRY:
-            if hi_res:
-                sf = shp.Reader(OVERLAY_COUNTRY)
-            else:
-                sf = shp.Reader(OVERLAY_COUNTRY_SMALL)
-        elif overlay == AreaType.ADMIN_REGION:
-            if hi_res:
-                sf = shp.Reader(OVERLAY_ADMIN)
-            else:
-                sf = shp.Reader(OVERLAY_ADMIN_SMALL)
-        elif overlay == AreaType.RIVER_BASIN:
-            if hi_res:
-                sf = shp.Reader(OVERLAY_RIVER)
-            else:
-                sf = shp.Reader(OVERLAY_RIVER_SMALL)
+        if hi_res:
+            overlay_file = OVERLAY_FILES[overlay][0]
         else:
-            overlay = "coast_line"
-            if hi_res:
-                # sf = shp.Reader(OVERLAY_COASTLINE)
-                # TODO use the low res version for now as there is an issue with
-                # the high res version
-                sf = shp.Reader(OVERLAY_COASTLINE_SMALL)
-            else:
-                sf = shp.Reader(OVERLAY_COASTLINE_SMALL)
+            overlay_file = OVERLAY_FILES[overlay][1]
         LOG.debug("adding overlay for %s", overlay)
 
-        for shape in list(sf.iterShapes()):
-            npoints = len(shape.points)  # total points
-            nparts = len(shape.parts)  # total parts
-            # loop over parts of each shape, plot separately
-            for ip in range(nparts):
-                i0 = shape.parts[ip]
-                if ip < nparts - 1:
-                    i1 = shape.parts[ip + 1] - 1
-                else:
-                    i1 = npoints
-
-                seg = shape.points[i0 : i1 + 1]
-                x_lon = np.zeros((len(seg), 1))
-                y_lat = np.zeros((len(seg), 1))
-                for ip in range(len(seg)):
-                    x_lon[ip] = seg[ip][0]
-                    y_lat[ip] = seg[ip][1]
-                plt.plot(
-                    x_lon, y_lat, color=OVERLAY_COLOUR, linewidth=OVERLAY_LINE_WIDTH
-                )
+        # all of the lines are drawn as a single collection, the style matches
+        # that of plt.plot
+        plt.gca().add_collection(
+            LineCollection(
+                get_overlay_segments(overlay_file),
+                colors=OVERLAY_COLOUR,
+                linewidths=OVERLAY_LINE_WIDTH,
+                capstyle="projecting",
+                joinstyle="round",
+                zorder=2,
+            )
+        )
         LOG.debug("overlay added")
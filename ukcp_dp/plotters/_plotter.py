@@ -2,10 +2,11 @@
 This module provides the public entry point write_plot to the plotters package.
 
 """
-import os
+import io
 from time import gmtime, strftime
 
 from ukcp_dp.constants import PlotType
+from ukcp_dp.exception import UKCPDPInvalidParameterException
 from ukcp_dp.plotters._cdf_plotter import CdfPlotter
 from ukcp_dp.plotters._jp_plotter import JpPlotter
 from ukcp_dp.plotters._pdf_plotter import PdfPlotter
@@ -14,6 +15,7 @@ from ukcp_dp.plotters._postage_stamp_map_plotter import PostageStampMapPlotter
 from ukcp_dp.plotters._single_map_plotter import SingleMapPlotter
 from ukcp_dp.plotters._three_map_plotter import ThreeMapPlotter
 from ukcp_dp.plotters._time_series_plotter import TimeSeriesPlotter
+from ukcp_dp.utils import get_output_sink
 
 
 def write_plot(
@@ -31,9 +33,11 @@ def write_plot(
     Generate a plot based on the plot type.
 
     @param plot_type (PlotType): the type of plot to generate
-    @param output_path (str): the full path to the file
-    @param image_format (ImageFormat): the format of the image to create,
-        i.e. jpg, png
+    @param output_path (str or OutputSink): the full path to the output
+        directory or the sink to write the image to
+    @param image_format (ImageFormat or list(ImageFormat)): the format of the
+        image to create, i.e. jpg, png, or a list of formats. The plot is only
+        generated once and then saved in each of the formats
     @param input_data (InputData): an object containing user defined values
     @param cubes (list(iris cube)): a list of cubes containing the
         selected data
@@ -41,9 +45,25 @@ def write_plot(
     @param vocab (Vocab): an instance of the ukcp_dp Vocab class
     @param plot_settings (StandardMap): an object containing plot settings
 
+    @return the path of the image, from the sink, or a list of the paths if a
+        list of formats was given
+
     """
+    if isinstance(image_format, str):
+        image_formats = [image_format]
+    else:
+        image_formats = list(image_format)
+    if not image_formats or len(set(image_formats)) != len(image_formats):
+        raise UKCPDPInvalidParameterException(
+            f"Invalid image formats: {image_formats}, each format may only be used "
+            "once"
+        )
 
-    image_file = _get_image_file(output_path, image_format, plot_type)
+    sink = get_output_sink(output_path)
+    image_files = [
+        sink.get_path(_get_image_file_name(format_name, plot_type))
+        for format_name in image_formats
+    ]
 
     if plot_type == PlotType.CDF_PLOT:
         plotter = CdfPlotter()
@@ -64,19 +84,51 @@ def write_plot(
     else:
         raise Exception("Invalid plot type: {}".format(plot_type))
 
-    plotter.generate_plot(
-        input_data, cube_list, overlay_cube, image_file, title, vocab, plot_settings
-    )
+    if len(image_files) == 1:
+        with sink.open(image_files[0], "wb") as image_stream:
+            plotter.generate_plot(
+                input_data,
+                cube_list,
+                overlay_cube,
+                image_stream,
+                title,
+                vocab,
+                plot_settings,
+            )
+
+    else:
+        # a sink may only have one file open at a time, i.e. a ZipSink, so the
+        # images are saved to memory and then written to the sink in turn
+        image_streams = []
+        for image_file in image_files:
+            image_stream = io.BytesIO()
+            image_stream.name = image_file
+            image_streams.append(image_stream)
+
+        plotter.generate_plot(
+            input_data,
+            cube_list,
+            overlay_cube,
+            image_streams,
+            title,
+            vocab,
+            plot_settings,
+        )
+
+        for image_stream in image_streams:
+            with sink.open(image_stream.name, "wb") as output_stream:
+                output_stream.write(image_stream.getbuffer())
 
-    return image_file
+    if isinstance(image_format, str):
+        return image_files[0]
+    return image_files
 
 
-def _get_image_file(output_path, image_format, plot_type):
+def _get_image_file_name(image_format, plot_type):
     timestamp = strftime("%Y-%m-%dT%H-%M-%S", gmtime())
     plot_type_string = ""
     if plot_type is not None:
         plot_type_string = "{}_".format(plot_type.lower())
-    file_name = "{plot_type}{timestamp}.{image_format}".format(
+    return "{plot_type}{timestamp}.{image_format}".format(
         plot_type=plot_type_string, timestamp=timestamp, image_format=image_format
     )
-    return os.path.join(output_path, file_name)
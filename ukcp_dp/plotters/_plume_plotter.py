@@ -9,6 +9,7 @@ import logging
 import iris
 from labellines import labelLines
 from matplotlib import patheffects
+from matplotlib.collections import LineCollection
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -26,7 +27,11 @@ from ukcp_dp.constants import (
     SCENARIO_GREYSCALES,
 )
 from ukcp_dp.plotters._graph_plotter import GraphPlotter
-from ukcp_dp.plotters.utils._plotting_utils import get_time_series, set_x_limits
+from ukcp_dp.plotters.utils._plotting_utils import (
+    decimate_line,
+    get_time_series,
+    set_x_limits,
+)
 
 
 LOG = logging.getLogger(__name__)
@@ -181,9 +186,14 @@ class PlumePlotter(GraphPlotter):
             if self.input_data.get_value(InputType.COLOUR_MODE) == "c":
                 line_colour = SCENARIO_COLOURS[cube.attributes["scenario"]][0]
 
-            ax.plot(
+            x_values, y_values = decimate_line(
                 t_points,
                 percentile_cube.data,
+                self.input_data.get_value(InputType.IMAGE_SIZE),
+            )
+            ax.plot(
+                x_values,
+                y_values,
                 color=line_colour,
                 linewidth=self.line_width,
             )
@@ -322,19 +332,30 @@ class PlumePlotter(GraphPlotter):
             highlighted_line_width = 2
             lowlighted_line_width = 1
 
-        highlighted_counter = 0
-        for ensemble_slice in cube.slices_over("ensemble_member"):
-            ensemble = ensemble_slice.coord("ensemble_member").points[0]
+        # the data as a 2-D array of (ensemble member, time)
+        ensembles = cube.coord("ensemble_member").points
+        ensemble_dims = cube.coord_dims("ensemble_member")
+        data = cube.data
+        if ensemble_dims:
+            data = np.moveaxis(data, ensemble_dims[0], 0)
+        data = data.reshape(len(ensembles), -1)
 
+        # there is no need to draw more points than the image has pixels
+        image_size = self.input_data.get_value(InputType.IMAGE_SIZE)
+
+        highlighted_counter = 0
+        lowlighted = np.ones(len(ensembles), dtype=bool)
+        for i, ensemble in enumerate(ensembles):
             # highlighted ensembles should be included in the legend
             if ensemble in highlighted_ensemble_members:
                 if ensemble < 10:
                     label = f"Member 0{ensemble}"
                 else:
                     label = f"Member {ensemble}"
+                x_values, y_values = decimate_line(t_points, data[i], image_size)
                 ax.plot(
-                    t_points,
-                    ensemble_slice.data,
+                    x_values,
+                    y_values,
                     label=label,
                     linestyle=linestyle[highlighted_counter],
                     color=colours[highlighted_counter],
@@ -342,15 +363,27 @@ class PlumePlotter(GraphPlotter):
                     linewidth=highlighted_line_width,
                 )
                 highlighted_counter += 1
-            else:
-                ax.plot(
-                    t_points,
-                    ensemble_slice.data,
-                    linestyle="dotted",
-                    color=ENSEMBLE_LOWLIGHT,
+                lowlighted[i] = False
+
+        if lowlighted.any():
+            # the other members are drawn as a single collection, masked values
+            # are set to NaN so they leave a gap, as they do in a line
+            x_values = np.asarray(t_points, dtype=float)
+            y_values = np.ma.filled(data[lowlighted].astype(float), np.nan)
+            segments = [
+                np.column_stack(decimate_line(x_values, member_values, image_size))
+                for member_values in y_values
+            ]
+            ax.add_collection(
+                LineCollection(
+                    segments,
+                    linestyles="dotted",
+                    colors=ENSEMBLE_LOWLIGHT,
                     zorder=1,
-                    linewidth=lowlighted_line_width,
+                    linewidths=lowlighted_line_width,
                 )
+            )
+            ax.autoscale_view()
 
         if highlighted_counter == 0:
             self.show_legend = False
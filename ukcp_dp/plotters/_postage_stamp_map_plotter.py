@@ -1,21 +1,10 @@
 import logging
 
-import iris
-
 import matplotlib.gridspec as gridspec
-from ukcp_dp.constants import (
-    AreaType,
-    InputType,
-    COLLECTION_CPM,
-    COLLECTION_RCM,
-    COLLECTION_RCM_GWL,
-    GWL,
-)
+import numpy as np
+from ukcp_dp.constants import AreaType, InputType
 from ukcp_dp.plotters._map_plotter import MapPlotter
-from ukcp_dp.plotters.utils._map_utils import (
-    plot_standard_map,
-    plot_standard_choropleth_map,
-)
+from ukcp_dp.plotters.utils._map_utils import get_data_stats, plot_standard_map
 
 
 LOG = logging.getLogger(__name__)
@@ -216,72 +205,32 @@ class PostageStampMapPlotter(MapPlotter):
 
         return result
 
-    def _plot_maps_mean_order(self, cube, fig, grid, plot_settings, title_font_size):
-        # cube_means, key = ensemble id, value = mean
-        ensemble_cube_means = {}
-
-        if self.input_data.get_area_type() == AreaType.BBOX:
-
-            if self.input_data.get_value(InputType.COLLECTION) in [
-                COLLECTION_RCM,
-                COLLECTION_RCM_GWL,
-            ] or (
-                self.input_data.get_value(InputType.COLLECTION) == COLLECTION_CPM
-                and self.input_data.get_value(InputType.VARIABLE) == "wsgmax10m"
-            ):
-                # RCM is on a rotated grid
-                ensemble_mean_cube = cube.collapsed(
-                    [
-                        "projection_x_coordinate",
-                        "projection_y_coordinate",
-                        "grid_latitude",
-                        "grid_longitude",
-                    ],
-                    iris.analysis.MEAN,
-                )
-            elif (self.input_data.get_value(InputType.SCENARIO)[0] in GWL or 
-                  self.input_data.get_value(InputType.COLLECTION) == COLLECTION_CPM):
-                ensemble_mean_cube = cube.collapsed(
-                    ["projection_x_coordinate", "projection_y_coordinate"],
-                    iris.analysis.MEAN,
-                )
-            else:
-                ensemble_mean_cube = cube.collapsed(
-                    [
-                        "projection_x_coordinate",
-                        "projection_y_coordinate",
-                        "latitude",
-                        "longitude",
-                    ],
-                    iris.analysis.MEAN,
-                )
-
-        else:
-            ensemble_mean_cube = cube.collapsed(["region"], iris.analysis.MEAN)
+    def _get_layout(self, cube):
+        """
+        Override base class method, the layout depends on the number of
+        ensemble members.
 
-        for ensemble_slice in ensemble_mean_cube.slices_over("ensemble_member"):
-            ensemble_id = int(ensemble_slice.coord("ensemble_member").points[0])
-            ensemble_cube_means[ensemble_id] = ensemble_slice.data.item()
+        @param cube (iris cube): a cube containing the selected data
 
-        # ensemble_cubes, key = mean, value = cube
-        ensemble_cubes = {}
+        @return the number of ensemble members
+        """
+        return len(cube.coord("ensemble_member").points)
 
-        for ensemble_slice in cube.slices_over("ensemble_member"):
-            ensemble_id = int(ensemble_slice.coord("ensemble_member").points[0])
-            mean_value = ensemble_cube_means[ensemble_id]
-            ensemble_cubes[mean_value] = ensemble_slice
+    def _plot_maps_mean_order(self, cube, fig, grid, plot_settings, title_font_size):
+        # the mean of each ensemble member, in the order of the ensemble_member
+        # coordinate
+        _, _, ensemble_means = get_data_stats(cube, "ensemble_member")
+        ensemble_slices = list(cube.slices_over("ensemble_member"))
 
-        i = 0
-        for ensemble_mean in sorted(ensemble_cubes.keys()):
+        for i, ensemble_index in enumerate(np.argsort(ensemble_means, kind="stable")):
             result = self._plot_map(
                 fig,
                 grid,
                 plot_settings,
-                ensemble_cubes[ensemble_mean],
+                ensemble_slices[ensemble_index],
                 i,
                 title_font_size,
             )
-            i += 1
 
         return result
 
@@ -301,11 +250,10 @@ class PostageStampMapPlotter(MapPlotter):
 
         LOG.debug("generating postage stamp map for ensemble %s", ensemble_no)
 
-        ax = fig.add_subplot(grid[i], projection=plot_settings.proj)
-
         # Setting bar_orientation="none" here to override (prevent) drawing
         # the colour bar:
         if self.input_data.get_area_type() == AreaType.BBOX:
+            ax = fig.add_subplot(grid[i], projection=plot_settings.proj)
             result = plot_standard_map(
                 ensemble_cube,
                 plot_settings,
@@ -318,16 +266,8 @@ class PostageStampMapPlotter(MapPlotter):
             # add a coast line
             self.plot_overlay("", False)
         else:
-            result = plot_standard_choropleth_map(
-                ensemble_cube,
-                plot_settings,
-                fig=fig,
-                ax=ax,
-                barlab=None,
-                bar_orientation="none",
-                outfnames=None,
-                hi_res=False,
-            )
+            result = self._plot_region_map(fig, grid[i], plot_settings, ensemble_cube)
+            ax = result[0]
             # don't need the overlay for the choropleth map as the region
             # geometry contains them.
 
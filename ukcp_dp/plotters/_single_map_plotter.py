@@ -6,16 +6,10 @@ method from the MapPlotter base class.
 import logging
 import math
 
-import iris
-
 import matplotlib.gridspec as gridspec
-import numpy.ma as ma
 from ukcp_dp.constants import AreaType, InputType, COLOUR_RANGE_STARTS_AT_ZERO
 from ukcp_dp.plotters._map_plotter import MapPlotter
-from ukcp_dp.plotters.utils._map_utils import (
-    plot_standard_map,
-    plot_standard_choropleth_map,
-)
+from ukcp_dp.plotters.utils._map_utils import get_data_stats, plot_standard_map
 
 
 LOG = logging.getLogger(__name__)
@@ -100,29 +94,11 @@ class SingleMapPlotter(MapPlotter):
 
     def _get_data_range(self, cube):
 
-        if self.input_data.get_area_type() == AreaType.BBOX:
-            cube_min = cube.collapsed(
-                [
-                    "projection_x_coordinate",
-                    "projection_y_coordinate",
-                    "latitude",
-                    "longitude",
-                ],
-                iris.analysis.MIN,
-            ).data.item()
-            cube_max = cube.collapsed(
-                [
-                    "projection_x_coordinate",
-                    "projection_y_coordinate",
-                    "latitude",
-                    "longitude",
-                ],
-                iris.analysis.MAX,
-            ).data.item()
-        else:
-            cube.data = ma.masked_invalid(cube.data)
-            cube_min = cube.collapsed(["region"], iris.analysis.MIN).data.item()
-            cube_max = cube.collapsed(["region"], iris.analysis.MAX).data.item()
+        cube_min, cube_max, _ = get_data_stats(cube)
+
+        if math.isnan(cube_min):
+            # there is no valid data, use a fixed range
+            return [0, 2], 1
 
         if cube_max - cube_min > 11:
             cube_min = math.floor(cube_min / 2) * 2
@@ -142,11 +118,10 @@ class SingleMapPlotter(MapPlotter):
         return [cube_min, cube_max], step
 
     def _add_sub_plot(self, fig, grid, plot_settings, data):
-        ax = fig.add_subplot(grid, projection=plot_settings.proj)
-
         # Setting bar_orientation="none" here to override (prevent) drawing
         # the colorbar
         if self.input_data.get_area_type() == AreaType.BBOX:
+            ax = fig.add_subplot(grid, projection=plot_settings.proj)
             result = plot_standard_map(
                 data,
                 plot_settings,
@@ -160,16 +135,7 @@ class SingleMapPlotter(MapPlotter):
                 self.input_data.get_value(InputType.SHOW_BOUNDARIES), hi_res=True
             )
         else:
-            result = plot_standard_choropleth_map(
-                data,
-                plot_settings,
-                fig=fig,
-                ax=ax,
-                barlab=None,
-                bar_orientation="none",
-                outfnames=None,
-                hi_res=False,
-            )
+            result = self._plot_region_map(fig, grid, plot_settings, data)
             # don't need the overlay for the choropleth map as the region
             # geometry contains them.
 
@@ -4,10 +4,7 @@ import iris
 import matplotlib.gridspec as gridspec
 from ukcp_dp.constants import AreaType, InputType
 from ukcp_dp.plotters._map_plotter import MapPlotter
-from ukcp_dp.plotters.utils._map_utils import (
-    plot_standard_map,
-    plot_standard_choropleth_map,
-)
+from ukcp_dp.plotters.utils._map_utils import plot_standard_map
 
 
 LOG = logging.getLogger(__name__)
@@ -71,11 +68,10 @@ class ThreeMapPlotter(MapPlotter):
         return result
 
     def _add_sub_plot(self, fig, grid, plot_settings, title, data):
-        ax = fig.add_subplot(grid, projection=plot_settings.proj)
-
         # Setting bar_orientation="none" here to override (prevent) drawing
         # the colorbar
         if self.input_data.get_area_type() == AreaType.BBOX:
+            ax = fig.add_subplot(grid, projection=plot_settings.proj)
             result = plot_standard_map(
                 data,
                 plot_settings,
@@ -89,16 +85,8 @@ class ThreeMapPlotter(MapPlotter):
                 self.input_data.get_value(InputType.SHOW_BOUNDARIES), hi_res=True
             )
         else:
-            result = plot_standard_choropleth_map(
-                data,
-                plot_settings,
-                fig=fig,
-                ax=ax,
-                barlab=None,
-                bar_orientation="none",
-                outfnames=None,
-                hi_res=False,
-            )
+            result = self._plot_region_map(fig, grid, plot_settings, data)
+            ax = result[0]
             # don't need the overlay for the choropleth map as the region
             # geometry contains them.
 
@@ -8,7 +8,11 @@ import logging
 import matplotlib.pyplot as plt
 from ukcp_dp.constants import PERCENTILE_LINE_COLOUR, InputType
 from ukcp_dp.plotters._graph_plotter import GraphPlotter
-from ukcp_dp.plotters.utils._plotting_utils import get_time_series, set_x_limits
+from ukcp_dp.plotters.utils._plotting_utils import (
+    decimate_line,
+    get_time_series,
+    set_x_limits,
+)
 
 LOG = logging.getLogger(__name__)
 
@@ -58,14 +62,16 @@ class TimeSeriesPlotter(GraphPlotter):
         if self.input_data.get_value(InputType.TIME_PERIOD) != "all":
             # if we are plotting one point a year then it is plotted on the year
             # boundary
-            year_points = []
-            for point in t_points:
-                year_points.append(int(point))
-            t_points = year_points
+            t_points = t_points.astype(int)
+
+        # there is no need to draw more points than the image has pixels
+        t_points, data = decimate_line(
+            t_points, cube.data, self.input_data.get_value(InputType.IMAGE_SIZE)
+        )
 
         ax.plot(
             t_points,
-            cube.data,
+            data,
             linestyle="solid",
             color=PERCENTILE_LINE_COLOUR,
             linewidth=line_width,
@@ -0,0 +1,11 @@
+"""
+This module provides common functions for the plotters.
+
+"""
+from ukcp_dp.plotters.utils._assets import (
+    get_colour_palette,
+    get_logo,
+    warm_assets,
+)
+
+__all__ = ["get_colour_palette", "get_logo", "warm_assets"]
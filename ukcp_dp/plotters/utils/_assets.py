@@ -0,0 +1,172 @@
+"""
+This module provides a process level cache of the assets used by the plotters,
+the logos and the colour palettes.
+
+The logos are decoded once per file, i.e. once per image size, and the colour
+palettes are built once per palette, reversal and number of colours. The cache
+can be filled before any plots are made, i.e. when a worker process is started,
+by calling warm_assets.
+
+"""
+import functools
+import glob
+import logging
+from os import path
+
+import matplotlib
+import matplotlib.colors as mpl_col
+import matplotlib.image as image
+import numpy as np
+from ukcp_dp.constants import LOGO_LARGE, LOGO_MEDIUM, LOGO_SMALL, ROOT_DIR
+
+
+LOG = logging.getLogger(__name__)
+
+# the directory containing the UKCP_*.txt colour palettes
+PALETTE_DIR = path.join(ROOT_DIR, "ukcp_dp/plotters/utils")
+
+# the prefix of the names of the palettes that are read from a file
+PALETTE_FILE_PREFIX = "UKCP_"
+
+# the number of colour palettes to keep in the cache
+PALETTE_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=None)
+def get_logo(logo_file):
+    """
+    Get a logo as an image array.
+
+    The array is shared between calls so it is read only.
+
+    @param logo_file (str): the full path to the image file of the logo
+
+    @return a numpy array containing the image
+    """
+    LOG.debug("Reading logo %s", logo_file)
+    logo = image.imread(logo_file)
+    logo.flags.writeable = False
+    return logo
+
+
+def get_colour_palette(cpal, ncols=None):
+    """
+    Get a colour map for a colour palette.
+
+    If cpal starts with "UKCP_" the palette is read from a text file, otherwise
+    it is one of the matplotlib colour maps. A name that ends in "_r" is the
+    reversed palette.
+
+    The colour map is a copy of the cached colour map, so its bad, over and
+    under colours can be set.
+
+    @param cpal (str): the name of the colour palette
+    @param ncols (int): the number of colours, if None the default number of
+        colours is used
+
+    @return a matplotlib Colormap
+    """
+    return _get_colour_palette(cpal, ncols).copy()
+
+
+def warm_assets():
+    """
+    Fill the cache with the logos and the colour palettes that are read from
+    files, so the first plot made by a process does not have to read them.
+
+    """
+    for logo_file in [LOGO_SMALL, LOGO_MEDIUM, LOGO_LARGE]:
+        get_logo(logo_file)
+
+    for palette_file in sorted(
+        glob.glob(path.join(PALETTE_DIR, f"{PALETTE_FILE_PREFIX}*.txt"))
+    ):
+        cpal = path.splitext(path.basename(palette_file))[0]
+        _get_colour_palette(cpal, None)
+        _get_colour_palette(f"{cpal}_r", None)
+
+
+@functools.lru_cache(maxsize=PALETTE_CACHE_SIZE)
+def _get_colour_palette(cpal, ncols):
+    """
+    Build the colour map for a colour palette, see get_colour_palette.
+
+    """
+    if not cpal.startswith(PALETTE_FILE_PREFIX):
+        # matplotlib.cm.get_cmap is no longer available
+        cmap = matplotlib.colormaps[cpal]
+        if ncols is not None:
+            cmap = cmap.resampled(ncols)
+        return cmap
+
+    reverse = cpal.endswith("_r")
+    filename = (cpal[:-2] if reverse else cpal) + ".txt"
+    cmap = _get_mplcolmap_from_file(
+        path.join(PALETTE_DIR, filename), reverse=reverse, ncols=ncols
+    )
+    return cmap
+
+
+@functools.lru_cache(maxsize=None)
+def _read_colour_palette_file(color_txt_file):
+    """
+    Read a text file of rgb colours, formatted as 3 space-separated values from
+    0 to 1 on each line, representing r,g,b.
+
+    """
+    LOG.debug("Attempting to read colour palette from %s", color_txt_file)
+    colours = np.loadtxt(color_txt_file)
+    colours.flags.writeable = False
+    return colours
+
+
+def _get_mplcolmap_from_file(color_txt_file, reverse=False, ncols=None):
+    """
+    This reads in a text file of rgb colours,
+    (formatted as 3 space-separeted values from 0 to 1 on each line,
+    representing r,g,b) and turns them into a matplotlib colormap.
+
+    This is based on a function Neil Kaye found online somewhere.
+    """
+    LinL = _read_colour_palette_file(color_txt_file)  # 12*3 element array
+
+    b3 = LinL[:, 2]  # n-element list: value of blue at each point.
+    b2 = LinL[:, 2]  # Same!
+    # position of each of the n values: ranges from 0 to 1
+    b1 = np.linspace(0, 1, len(b2))
+
+    # setting up columns for list
+    g3 = LinL[:, 1]
+    g2 = LinL[:, 1]
+    g1 = np.linspace(0, 1, len(g2))
+
+    r3 = LinL[:, 0]
+    r2 = LinL[:, 0]
+    r1 = np.linspace(0, 1, len(r2))
+
+    # creating list.
+    # Each are n-element lists of 3-element tuples
+    R = zip(r1, r2, r3)
+    G = zip(g1, g2, g3)
+    B = zip(b1, b2, b3)
+
+    # transposing list
+    # n-element list of 3-element tuples of 3-element tuples
+    RGB = zip(R, G, B)
+    rgb = zip(*RGB)  # 3-element list of 12-element tuple of 3-element tuples
+
+    # creating dictionary
+    keys = ["red", "green", "blue"]
+    LinearL = dict(zip(keys, rgb))  # makes a dictionary from 2 lists
+    # Value for each key is a 12-element tuple of 3-element tuples.
+
+    if ncols is None:
+        my_cmap = mpl_col.LinearSegmentedColormap("my_colormap", LinearL)
+    else:
+        my_cmap = mpl_col.LinearSegmentedColormap("my_colormap", LinearL, N=ncols)
+
+    if reverse:
+        # matplotlib.cm.revcmap is no longer available
+        my_cmap = my_cmap.reversed(name="my_colormap")
+
+    return my_cmap
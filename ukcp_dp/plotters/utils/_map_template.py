@@ -0,0 +1,184 @@
+"""
+This module provides the MapTemplate class and a cache of map templates.
+
+A template holds a figure with the parts of a map plot that do not depend on
+the data, i.e. the logo, the funder text, and the sub-plots with their
+background colour, extent and grid lines. These are drawn once, as an image,
+and the figure is reused for each plot with the same layout, so only the data,
+titles and colour bar are drawn for each plot.
+
+"""
+from collections import OrderedDict
+import logging
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import matplotlib.pyplot as plt
+import numpy as np
+from ukcp_dp.plotters.utils._map_utils import prepare_standard_choropleth_axes
+from ukcp_dp.plotters.utils._plotting_utils import end_figure
+
+
+LOG = logging.getLogger(__name__)
+
+# the number of map templates to keep in the cache
+MAP_TEMPLATE_CACHE_SIZE = 8
+
+# the map templates, keyed on the layout of the plot, the least recently used
+# first
+_MAP_TEMPLATES = OrderedDict()
+
+
+class MapTemplate:
+    """
+    A figure that is reused for map plots with the same layout.
+
+    The template is built by the first plot, which adds the logo and funder
+    text before creating the template and then gets its sub-plots from
+    get_axes. Once that plot has been saved the background is drawn and the
+    template is added to the cache. Later plots get the same sub-plots, in the
+    same order, from get_axes.
+
+    Everything that is added to the figure after the template has been built,
+    e.g. the data, the colour bar and the date stamp, is removed by clear. The
+    title of the figure and of each sub-plot are kept, and are set again by
+    each plot.
+    """
+
+    def __init__(self, key, fig, dpi):
+        """
+        Create a template from a new figure.
+
+        @param key (tuple): the key of the template in the cache
+        @param fig (matplotlib.figure.Figure): the figure, with the logo and
+            funder text
+        @param dpi (int): the resolution the plots will be saved at
+        """
+        # the figure is kept after pyplot closes its figures
+        plt.close(fig)
+        FigureCanvasAgg(fig)
+        fig.set_dpi(dpi)
+
+        self.key = key
+        self.fig = fig
+        self.axes = []
+        self._next_axes = 0
+        self._background = None
+        # the artists that are drawn as part of the background
+        self._static = {fig.patch, *fig.images, *fig.texts}
+        # the title is created now so that it is kept between plots
+        fig.suptitle("")
+        # the artists that are kept between plots
+        self._kept = set(fig.get_children())
+
+    def get_axes(self, grid, settings):
+        """
+        Get the next sub-plot for a choropleth map.
+
+        @param grid (SubplotSpec): the position of the sub-plot
+        @param settings (StandardMap): an object containing plot settings
+
+        @return a cartopy GeoAxes, that has been set up with
+            prepare_standard_choropleth_axes
+        """
+        if self._background is not None:
+            ax = self.axes[self._next_axes]
+            self._next_axes += 1
+            return ax
+
+        ax = self.fig.add_subplot(grid, projection=settings.proj)
+        prepare_standard_choropleth_axes(ax, settings)
+        self.axes.append(ax)
+        # the grid lines are artists of the axes
+        self._static.update([ax.patch, *ax.artists])
+        self._kept.update([ax, *ax.get_children()])
+        return ax
+
+    def save(self, output_path, dpi):
+        """
+        Save the plot. If this is the plot that built the template, the
+        background is then drawn and the template is added to the cache.
+
+        @param output_path (str or file object or list): the full path to the
+            file or a binary file object, with a name ending in the image
+            format, or a list of these. Only raster formats may be used.
+        @param dpi (int): the resolution of the image
+
+        @return a list of the names of the files that were saved
+        """
+        saved = end_figure(output_path, dpi=dpi, fig=self.fig)
+        if self._background is None:
+            self._draw_background()
+            _MAP_TEMPLATES[self.key] = self
+            if len(_MAP_TEMPLATES) > MAP_TEMPLATE_CACHE_SIZE:
+                _MAP_TEMPLATES.popitem(last=False)
+        return saved
+
+    def clear(self):
+        """
+        Remove everything that was added to the figure by the last plot.
+
+        """
+        for artist in self.fig.get_children():
+            if artist not in self._kept:
+                artist.remove()
+        for ax in self.axes:
+            for artist in ax.get_children():
+                if artist not in self._kept:
+                    artist.remove()
+        self._next_axes = 0
+
+    def _draw_background(self):
+        """
+        Draw the static artists, replace them with the image of them and hide
+        them.
+
+        """
+        LOG.debug("drawing the background of the map template")
+        live = [
+            artist
+            for artist in self.fig.get_children()
+            if artist not in self._static and artist not in self.axes
+        ]
+        for ax in self.axes:
+            live.extend(
+                artist for artist in ax.get_children() if artist not in self._static
+            )
+        live = [artist for artist in live if artist.get_visible()]
+
+        for artist in live:
+            artist.set_visible(False)
+        try:
+            self.fig.canvas.draw()
+            background = np.array(self.fig.canvas.buffer_rgba())
+        finally:
+            for artist in live:
+                artist.set_visible(True)
+
+        for artist in self._static:
+            artist.set_visible(False)
+        # the image is drawn first, under the sub-plots
+        self._background = self.fig.figimage(background, zorder=-1, origin="upper")
+        self._kept.add(self._background)
+
+
+def get_map_template(key):
+    """
+    Get a map template from the cache.
+
+    @param key (tuple): the key of the template, this should include
+        everything that changes the background of the plot
+
+    @return a MapTemplate, or None if there is not one for this key
+    """
+    template = _MAP_TEMPLATES.get(key)
+    if template is not None:
+        _MAP_TEMPLATES.move_to_end(key)
+    return template
+
+
+def clear_map_templates():
+    """
+    Remove all of the map templates from the cache.
+
+    """
+    _MAP_TEMPLATES.clear()
@@ -1,6 +1,5 @@
 import logging
 import math
-from os import path
 
 import matplotlib
 
@@ -8,20 +7,21 @@ import cartopy.crs as ccrs
 from cartopy.mpl.gridliner import LONGITUDE_FORMATTER, LATITUDE_FORMATTER
 import iris
 import iris.plot as iplt
-import matplotlib.cm as mpl_cm
+from matplotlib.collections import PathCollection
 import matplotlib.colors as mpl_col
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 import numpy as np
-from ukcp_dp.constants import DPI_DISPLAY, DPI_SAVING, ROOT_DIR
+from ukcp_dp.constants import DPI_DISPLAY, DPI_SAVING
+from ukcp_dp.plotters.utils._assets import get_colour_palette
 from ukcp_dp.plotters.utils._plotting_utils import (
     end_figure,
     make_colourbar,
     start_figure,
 )
-from ukcp_dp.plotters.utils._region_utils import UKSHAPES
-from ukcp_dp.plotters.utils._region_utils import get_ukcp_shapefile_regions
+from ukcp_dp.plotters.utils._region_utils import get_ukcp_region_paths
 from ukcp_dp.processors import add_mask, rectify_units
+from ukcp_dp.utils import normalise_region_name
 
 
 LOG = logging.getLogger(__name__)
@@ -140,12 +140,15 @@ def plot_standard_choropleth_map(
     bar_orientation=None,
     outfnames=["x11"],
     hi_res=True,
+    draw_background=True,
 ):
     """
     Wrapper to plot_choropleth_map(),
     where most of the settings are given
     in a StandardMap object called 'settings'
 
+    Set draw_background=False to only plot the data,
+    on an Axes already set up by prepare_standard_choropleth_axes().
     """
     try:
         resolution = thecube.attributes["resolution"]
@@ -160,14 +163,14 @@ def plot_standard_choropleth_map(
                 elif aux_coord.long_name == "River Basin":
                     resolution = "river"
 
-    shapefile_regions = get_ukcp_shapefile_regions(resolution, hi_res=hi_res)
+    region_paths = get_ukcp_region_paths(resolution, hi_res, settings.proj)
     if barlab is None:
         barlab = settings.default_barlabel
     if bar_orientation is None:
         bar_orientation = settings.bar_orientation
 
     result = plot_choropleth_map(
-        shapefile_regions,
+        region_paths,
         [thecube],
         fig=fig,
         ax=ax,
@@ -211,11 +214,77 @@ def plot_standard_choropleth_map(
         ygridax=settings.ygridax,
         axbackgroundcol=settings.maskcol,
         figbackgroundcol=settings.figbackgroundcol,
+        draw_background=draw_background,
     )
 
     return result
 
 
+def prepare_standard_choropleth_axes(ax, settings):
+    """
+    Set up the parts of a choropleth map that do not depend on the data,
+    i.e. the background colour, the extent and the grid lines,
+    where the settings are given in a StandardMap object called 'settings'.
+
+    This is done by plot_standard_choropleth_map(),
+    unless it is called with draw_background=False.
+    """
+    _prepare_choropleth_axes(
+        ax,
+        settings.proj,
+        settings.maskcol,
+        settings.showglobal,
+        settings.xlims,
+        settings.ylims,
+        False,
+        settings.dxgrid,
+        settings.dygrid,
+        settings.xgridax,
+        settings.ygridax,
+    )
+
+
+def get_data_stats(cube, member_coord=None):
+    """
+    Get the minimum and maximum of the data in a cube and, optionally, the mean
+    of each member, e.g. of each ensemble member.
+
+    Masked and NaN values are ignored. The statistics are calculated from the
+    data of the cube, without collapsing or changing the cube.
+
+    @param cube (iris cube): a cube containing the selected data
+    @param member_coord (str): optional, the name of the coordinate of the
+        members. If given, the mean of each member is calculated over all of
+        the other dimensions
+
+    @return a tuple of (minimum, maximum, means), where means is a numpy array
+        of the mean of each member, in the order of the points of the
+        member coordinate, or None if no member_coord is given. If all of the
+        values are masked or NaN the minimum and maximum are NaN
+    """
+    data = cube.data
+    values = np.ma.getdata(data)
+    if values.dtype.kind != "f":
+        # the initial values of the min and max are infinite
+        values = values.astype(np.float64)
+    mask = np.ma.getmask(data)
+    valid = True if mask is np.ma.nomask else ~mask
+
+    data_min = float(np.nanmin(values, where=valid, initial=np.inf))
+    data_max = float(np.nanmax(values, where=valid, initial=-np.inf))
+    if data_min > data_max:
+        # there is no valid data
+        data_min = data_max = np.nan
+
+    if member_coord is None:
+        return data_min, data_max, None
+
+    member_dims = cube.coord_dims(member_coord)
+    other_dims = tuple(dim for dim in range(cube.ndim) if dim not in member_dims)
+    means = np.nanmean(values, axis=other_dims, where=valid, dtype=np.float64)
+    return data_min, data_max, np.atleast_1d(means)
+
+
 def plot_map(
     dcube_input,
     fig=None,
@@ -636,14 +705,16 @@ def plot_choropleth_map(
     axbackgroundcol=None,
     figbackgroundcol=None,
     outfnames=["x11"],
+    draw_background=True,
 ):
     """
     All the gubbins required to make a nice choropleth map
     (i.e. a map where we shade in polygonal regions according to values,
     rather than contours or a grid of pixels),
 
-    regions is a list of cartopy.io.shapereader.Record objects,
-    e.g. as returned by get_ukcp_shapefile_regions() or get_shapefile_regions()
+    regions is a sequence of (region name, matplotlib Path) pairs,
+    with the paths already projected to proj,
+    e.g. as returned by get_ukcp_region_paths()
 
     regionaldata is a CubeList (in future: a cube?)
     with one element (a scalard Cube) per region.
@@ -660,6 +731,10 @@ def plot_choropleth_map(
 
     stock_img will underplot the standard Cartopy stock image.
 
+    Set draw_background=False to only plot the data
+    on an Axes that has already been set up,
+    i.e. the background colour, extent and gridlines are not changed.
+
 
     Other arguments are pretty much the same as for plot_maps()
     above. Note that we don't have a wrapper function
@@ -709,27 +784,18 @@ def plot_choropleth_map(
     #  otherwise we couldn't plot it)
     # -- the details of what we're doing here are likely to change later!
 
-    # This is used to look up metadata for the shapefiles:
-    try:
-        region_set = regionaldata[0].attributes["resolution"]
-    except KeyError:
-        # the Had UK Grid Obs do not have resolution
-        for aux_coord in regionaldata[0].aux_coords:
-            if aux_coord.var_name == "geo_region":
-                if aux_coord.long_name == "Country":
-                    region_set = "country"
-                elif aux_coord.long_name == "Administrative Region":
-                    region_set = "region"
-                elif aux_coord.long_name == "River Basin":
-                    region_set = "river"
-
-    reg_key = UKSHAPES[region_set]["attr_key"]
+    # The values of all of the regions are read from the data at once,
+    # rather than taking a slice of the cube for each region.
+    # Masked values become NaNs.
     regdata_dict = dict()
     for regcube in regionaldata:
-        for reg_slice in regcube.slices_over(["region"]):
-            regdata_dict[reg_slice.coords(var_name="geo_region")[0].points[0]] = float(
-                reg_slice.data
-            )
+        region_names = regcube.coords(var_name="geo_region")[0].points
+        region_dims = regcube.coord_dims("region")
+        values = np.ma.filled(np.ma.asarray(regcube.data, dtype=float), np.nan)
+        if region_dims:
+            values = np.moveaxis(values, region_dims[0], 0)
+        for region, value in zip(region_names, values.reshape(len(region_names))):
+            regdata_dict[normalise_region_name(region)] = float(value)
     regunits = regcube.units
     # Don't delete the CubeList - we'll probably want it later for
     # labelling...?
@@ -777,12 +843,20 @@ def plot_choropleth_map(
         LOG.debug("Axes object already exists,")
         LOG.debug("Not using plot_choropleth_map() argument: proj")
 
-    # Set the Axes background colour:
-    # The user can specify the alpha by using an rgba tuple,
-    # e.g. (1,0,1,0.5) would be semitransparent magenta.
-    if axbackgroundcol is not None:
-        ax.patch.set_facecolor(axbackgroundcol)
-        # ax.patch.set_alpha(1.0)
+    if draw_background:
+        _prepare_choropleth_axes(
+            ax,
+            proj,
+            axbackgroundcol,
+            showglobal,
+            xlims,
+            ylims,
+            stock_img,
+            dxgrid,
+            dygrid,
+            xgridax,
+            ygridax,
+        )
 
     do_categories = isinstance(cpal, (list, tuple))
 
@@ -838,142 +912,63 @@ def plot_choropleth_map(
     cmap.set_over(color=overcol)
     cmap.set_under(color=undercol)
 
-    # Set plot limits.
-    # For some projections (Robinson!),
-    # it only makes sense to use them globally,
-    # but setting global extents seems to confuse it.
-    # So we have an override option:
-    if showglobal:
-        ax.set_global()
-    else:
-        # A previous version prevented specifying Axes extents
-        # if we used the ccrs.OSGB() projection;
-        # now we have a better projection,
-        # I've removed that special case, letting it get confused
-        # if anyone uses it...
-
-        # Get the x/y limits from the data if they're not specified:
-        if not xlims:
-            raise UserWarning("Not sure how to get x-limits if not specified!")
-        if not ylims:
-            raise UserWarning("Not sure how to get y-limits if not specified!")
-
-        # And set the Axes limits in lat/lon coordinates:
-        ax.set_extent(xlims + ylims, crs=ccrs.PlateCarree())
-
-    # Only label the axes if we're in the Plate Carrée projection:
-    if proj == ccrs.PlateCarree():
-        ax.set_xlabel(r"Longitude")
-        ax.set_ylabel(r"Latitude")
-
-    if stock_img:
-        ax.stock_img()
-
     # Plot the data!
-    for i, region in enumerate(regions):
-        reg_name = region.attributes[reg_key]
-
-        # TODO Fix due to inconsistencies in shape file and netcdf
-        if reg_name == "Orkney and Shetland":
-            reg_name = "Orkney and Shetlands"
-
-        if reg_name not in regdata_dict.keys():
-            continue
-
-        val = regdata_dict[reg_name]
-
-        if math.isnan(val):
+    # All of the regions with a value are drawn as a single collection,
+    # the colours are looked up for all of the values at once.
+    region_paths = []
+    region_values = []
+    for reg_name, region_path in regions:
+        val = regdata_dict.get(reg_name)
+
+        if val is None or math.isnan(val):
             continue
 
-        facecolor = cmap(normalizer([val])).tolist()
-
-        # Project region, if necessary:
-        reg_proj = region.attributes["projection_forUKCP"]
-        if reg_proj != proj:
-            region_geometry = proj.project_geometry(region.geometry, src_crs=reg_proj)
-        else:
-            region_geometry = region.geometry
-
-        # Indicators about significance:
-        # NOTE that currently hatching styling is HARDCODED in the pdf backend,
-        #      so it will look different in the pdf and png outputs.
-        # e.g.
-        # http://matplotlib.org/examples/pylab_examples/contourf_hatching.html
-        # http://matplotlib.1069221.n5.nabble.com/Change-hatch-intensity-color-for-PDF-backend-td27412.html
-        # https://github.com/matplotlib/matplotlib/blob/9ca2c4118f684b4e145bd109008f77731d2d7cd4/lib/matplotlib/backends/backend_pdf.py#L1061
-        # So, I'll just use a fairly intense hatch for now,
-        # and see how we go.
-        #
-        # NOT IMPLEMENTED DATA STRUCTURES FOR THIS YET:
-        # if regional_sigs is not None:
-        #    if regional_sigs[region.tag]:
-        #        hatchsty = None
-        #        sigtag   = "*"
-        #        edgecolor= regionlcol
-        #    else:
-        #        #hatchsty = "..." # Dots are too faint in pdfs
-        #        hatchsty  = "////\\\\"
-        #        sigtag   = "-"
-        #        edgecolor= "black"
-        #        #facecolor="dimgrey"
-        # else:
-        #    hatchsty = None
-        #    sigtag   = "-"
-        #    edgecolor= regionlcol
-        hatchsty = None
-        edgecolor = regionlcol
-        #
-        # Output to terminal:
-        LOG.debug(
-            "Region %s: '%s'. Value = %s, colour =%s", i, reg_name, val, facecolor
-        )
-
-        # Plot it:
-        _ = ax.add_geometries(
-            [region_geometry],
-            proj,
-            facecolor=facecolor,
-            edgecolor=edgecolor,
-            linewidth=regionlw,
-            hatch=hatchsty,
-        )
-
-    # Add gridlines (and label them on the axes, IF we're in PlateCarree)
-    gridlabels = proj == ccrs.PlateCarree()
-    if gridlabels:
-        gl = ax.gridlines(
-            crs=ccrs.PlateCarree(), draw_labels=gridlabels, linewidth=0.5, color="grey"
+        LOG.debug("Region '%s'. Value = %s", reg_name, val)
+        region_paths.append(region_path)
+        region_values.append(val)
+
+    # Indicators about significance:
+    # NOTE that currently hatching styling is HARDCODED in the pdf backend,
+    #      so it will look different in the pdf and png outputs.
+    # e.g.
+    # http://matplotlib.org/examples/pylab_examples/contourf_hatching.html
+    # http://matplotlib.1069221.n5.nabble.com/Change-hatch-intensity-color-for-PDF-backend-td27412.html
+    # https://github.com/matplotlib/matplotlib/blob/9ca2c4118f684b4e145bd109008f77731d2d7cd4/lib/matplotlib/backends/backend_pdf.py#L1061
+    # So, I'll just use a fairly intense hatch for now,
+    # and see how we go.
+    #
+    # NOT IMPLEMENTED DATA STRUCTURES FOR THIS YET:
+    # if regional_sigs is not None:
+    #    if regional_sigs[region.tag]:
+    #        hatchsty = None
+    #        sigtag   = "*"
+    #        edgecolor= regionlcol
+    #    else:
+    #        #hatchsty = "..." # Dots are too faint in pdfs
+    #        hatchsty  = "////\\\\"
+    #        sigtag   = "-"
+    #        edgecolor= "black"
+    #        #facecolor="dimgrey"
+    # else:
+    #    hatchsty = None
+    #    sigtag   = "-"
+    #    edgecolor= regionlcol
+    hatchsty = None
+    edgecolor = regionlcol
+
+    if region_paths:
+        # zorder as for ax.add_geometries, under lines but over images
+        ax.add_collection(
+            PathCollection(
+                region_paths,
+                facecolors=cmap(normalizer(np.array(region_values))),
+                edgecolors=edgecolor,
+                linewidths=regionlw,
+                hatch=hatchsty,
+                zorder=1.5,
+            ),
+            autolim=False,
         )
-        # Options to switch on/off individual axes labels:
-        gl.xlabels_bottom = xgridax[0]
-        gl.xlabels_top = xgridax[1]
-        gl.ylabels_left = ygridax[0]
-        gl.ylabels_right = ygridax[1]
-    else:
-        gl = ax.gridlines(crs=ccrs.PlateCarree(), linewidth=0)
-
-    # Set limits for the grid separate to the plot's xlims/ylims:
-    if showglobal:
-        xlims_for_grid = [-180, 180]
-        ylims_for_grid = [-90, 90]
-    else:
-        xlims_for_grid = xlims
-        ylims_for_grid = ylims
-
-    xgridrange = [dxgrid * np.round(val / dxgrid) for val in xlims_for_grid]
-    ygridrange = [dygrid * np.round(val / dygrid) for val in ylims_for_grid]
-
-    xgridpts = np.arange(xgridrange[0], xgridrange[1] + dxgrid, dxgrid)
-    ygridpts = np.arange(ygridrange[0], ygridrange[1] + dygrid, dygrid)
-    # Filter in case the rounding meant we went off-grid!
-    xgridpts = [xgridpt for xgridpt in xgridpts if (xgridpt >= -180 and xgridpt <= 360)]
-    ygridpts = [ygridpt for ygridpt in ygridpts if (ygridpt >= -90 and ygridpt <= 90)]
-
-    gl.xlocator = mticker.FixedLocator(xgridpts)
-    gl.ylocator = mticker.FixedLocator(ygridpts)
-    if gridlabels:
-        gl.xformatter = LONGITUDE_FORMATTER
-        gl.yformatter = LATITUDE_FORMATTER
 
     # Adjust the margins:
     if newfig:
@@ -1039,55 +1034,99 @@ def plot_choropleth_map(
     return (ax, sm)
 
 
-def _get_mplcolmap_from_file(color_txt_file, reverse=False, ncols=None):
+def _prepare_choropleth_axes(
+    ax,
+    proj,
+    axbackgroundcol,
+    showglobal,
+    xlims,
+    ylims,
+    stock_img,
+    dxgrid,
+    dygrid,
+    xgridax,
+    ygridax,
+):
     """
-    This reads in a text file of rgb colours,
-    (formatted as 3 space-separeted values from 0 to 1 on each line,
-    representing r,g,b) and turns them into a matplotlib colormap.
+    Set up the parts of a choropleth map that do not depend on the data,
+    i.e. the background colour, the extent and the grid lines.
 
-    This is based on a function Neil Kaye found online somewhere.
+    The arguments are the same as for plot_choropleth_map().
     """
-    LinL = np.loadtxt(color_txt_file)  # 12*3 element array
-
-    b3 = LinL[:, 2]  # n-element list: value of blue at each point.
-    b2 = LinL[:, 2]  # Same!
-    # position of each of the n values: ranges from 0 to 1
-    b1 = np.linspace(0, 1, len(b2))
-
-    # setting up columns for list
-    g3 = LinL[:, 1]
-    g2 = LinL[:, 1]
-    g1 = np.linspace(0, 1, len(g2))
-
-    r3 = LinL[:, 0]
-    r2 = LinL[:, 0]
-    r1 = np.linspace(0, 1, len(r2))
-
-    # creating list.
-    # Each are n-element lists of 3-element tuples
-    R = zip(r1, r2, r3)
-    G = zip(g1, g2, g3)
-    B = zip(b1, b2, b3)
-
-    # transposing list
-    # n-element list of 3-element tuples of 3-element tuples
-    RGB = zip(R, G, B)
-    rgb = zip(*RGB)  # 3-element list of 12-element tuple of 3-element tuples
-
-    # creating dictionary
-    keys = ["red", "green", "blue"]
-    LinearL = dict(zip(keys, rgb))  # makes a dictionary from 2 lists
-    # Value for each key is a 12-element tuple of 3-element tuples.
-
-    if reverse:
-        LinearL = mpl_cm.revcmap(LinearL)
-
-    if ncols is None:
-        my_cmap = mpl_col.LinearSegmentedColormap("my_colormap", LinearL)
+    # Set the Axes background colour:
+    # The user can specify the alpha by using an rgba tuple,
+    # e.g. (1,0,1,0.5) would be semitransparent magenta.
+    if axbackgroundcol is not None:
+        ax.patch.set_facecolor(axbackgroundcol)
+        # ax.patch.set_alpha(1.0)
+
+    # Set plot limits.
+    # For some projections (Robinson!),
+    # it only makes sense to use them globally,
+    # but setting global extents seems to confuse it.
+    # So we have an override option:
+    if showglobal:
+        ax.set_global()
     else:
-        my_cmap = mpl_col.LinearSegmentedColormap("my_colormap", LinearL, N=ncols)
+        # A previous version prevented specifying Axes extents
+        # if we used the ccrs.OSGB() projection;
+        # now we have a better projection,
+        # I've removed that special case, letting it get confused
+        # if anyone uses it...
 
-    return my_cmap
+        # Get the x/y limits from the data if they're not specified:
+        if not xlims:
+            raise UserWarning("Not sure how to get x-limits if not specified!")
+        if not ylims:
+            raise UserWarning("Not sure how to get y-limits if not specified!")
+
+        # And set the Axes limits in lat/lon coordinates:
+        ax.set_extent(xlims + ylims, crs=ccrs.PlateCarree())
+
+    # Only label the axes if we're in the Plate Carrée projection:
+    if proj == ccrs.PlateCarree():
+        ax.set_xlabel(r"Longitude")
+        ax.set_ylabel(r"Latitude")
+
+    if stock_img:
+        ax.stock_img()
+
+    # Add gridlines (and label them on the axes, IF we're in PlateCarree)
+    gridlabels = proj == ccrs.PlateCarree()
+    if gridlabels:
+        gl = ax.gridlines(
+            crs=ccrs.PlateCarree(), draw_labels=gridlabels, linewidth=0.5, color="grey"
+        )
+        # Options to switch on/off individual axes labels:
+        gl.xlabels_bottom = xgridax[0]
+        gl.xlabels_top = xgridax[1]
+        gl.ylabels_left = ygridax[0]
+        gl.ylabels_right = ygridax[1]
+    else:
+        gl = ax.gridlines(crs=ccrs.PlateCarree(), linewidth=0)
+
+    # Set limits for the grid separate to the plot's xlims/ylims:
+    if showglobal:
+        xlims_for_grid = [-180, 180]
+        ylims_for_grid = [-90, 90]
+    else:
+        xlims_for_grid = xlims
+        ylims_for_grid = ylims
+
+    xgridrange = [dxgrid * np.round(val / dxgrid) for val in xlims_for_grid]
+    ygridrange = [dygrid * np.round(val / dygrid) for val in ylims_for_grid]
+
+    xgridpts = np.arange(xgridrange[0], xgridrange[1] + dxgrid, dxgrid)
+    ygridpts = np.arange(ygridrange[0], ygridrange[1] + dygrid, dygrid)
+    # Filter in case the rounding meant we went off-grid!
+    xgridpts = [xgridpt for xgridpt in xgridpts if (xgridpt >= -180 and xgridpt <= 360)]
+    ygridpts = [ygridpt for ygridpt in ygridpts if (ygridpt >= -90 and ygridpt <= 90)]
+
+    gl.xlocator = mticker.FixedLocator(xgridpts)
+    gl.ylocator = mticker.FixedLocator(ygridpts)
+    if gridlabels:
+        gl.xformatter = LONGITUDE_FORMATTER
+        gl.yformatter = LATITUDE_FORMATTER
 
 
 def _setup_colourmap(cpal, vrange, vstep, vmid=None):
@@ -1106,16 +1145,7 @@ def _setup_colourmap(cpal, vrange, vstep, vmid=None):
         # Usual case.
         # (note that specifying levels forces cmap to be discrete,
         #  but ensures consistency between contourf & pcolormesh)
-        if cpal.startswith("UKCP_"):
-            reverse = cpal.endswith("_r")
-            filename = (cpal[:-2] if reverse else cpal) + ".txt"
-            col_file = path.join(ROOT_DIR, "ukcp_dp/plotters/utils", filename)
-            LOG.debug("Attempting to read colour palette from %s", col_file)
-            cmap = _get_mplcolmap_from_file(
-                col_file, reverse=reverse, ncols=len(levels) - 1
-            )
-        else:
-            cmap = mpl_cm.get_cmap(cpal, len(levels) - 1)
+        cmap = get_colour_palette(cpal, len(levels) - 1)
 
     else:
         # Explicit midpoint specified, make an off-centre (skewed) colourbar.
@@ -1137,14 +1167,8 @@ def _setup_colourmap(cpal, vrange, vstep, vmid=None):
         vhi_frac = (vrange[1] - vfull[0]) / (2.0 * deltamax)  # 1 or less
         # (one of these two must be 0 or 1)
 
-        if cpal.startswith("UKCP_"):
-            reverse = cpal.endswith("_r")
-            filename = (cpal[:-2] if reverse else cpal) + ".txt"
-            col_file = path.join(ROOT_DIR, "ukcp_dp/plotters/utils", filename)
-            LOG.debug("Attempting to read colour palette from %s", col_file)
-            cmap_base = _get_mplcolmap_from_file(col_file, reverse=reverse)
-        else:
-            cmap_base = mpl_cm.get_cmap(cpal)  # maps the range 0-1 to colours
+        # maps the range 0-1 to colours
+        cmap_base = get_colour_palette(cpal)
 
         cols = cmap_base(np.linspace(vlo_frac, vhi_frac, ncols))
         cmap = mpl_col.LinearSegmentedColormap.from_list("skewed", cols, N=ncols)
@@ -1,11 +1,12 @@
-import calendar
+import functools
 import logging
 
 import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import matplotlib.image
 from matplotlib.ticker import MaxNLocator
 
 import cf_units
-import datetime as dt
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -17,6 +18,13 @@ LOG = logging.getLogger(__name__)
 # http://phyletica.org/matplotlib-fonts/
 matplotlib.rcParams["pdf.fonttype"] = 42
 
+# the raster formats that are saved from the Agg canvas, keyed on the file
+# extension, with the format name used by Pillow
+RASTER_FORMATS = {"jpeg": "jpeg", "jpg": "jpeg", "png": "png"}
+
+# the number of time coordinates to keep in the fractional year cache
+TIME_CACHE_SIZE = 32
+
 
 def start_figure(cmsize, dpi_display, fontfam, fsize, figbackgroundcol=None):
     """
@@ -38,7 +46,29 @@ def start_figure(cmsize, dpi_display, fontfam, fsize, figbackgroundcol=None):
     the original font family and size are returned,
     in a tuple alongsize the Figure object itself.
     """
+    oldfont_family, oldfont_size = set_font(fontfam, fsize)
+
+    # Set up the figure:
+    size_inches = [aside / 2.54 for aside in cmsize]
+    fig = plt.figure(figsize=size_inches, dpi=dpi_display)
 
+    # Specify the Figure background colour:
+    # The user can specify the alpha by using an rgba tuple,
+    # e.g. (1,0,1,0.5) would be semitransparent magenta.
+    if figbackgroundcol is not None:
+        fig.patch.set_facecolor(figbackgroundcol)
+        # fig.patch.set_alpha(1.0)
+
+    return fig, oldfont_family, oldfont_size
+
+
+def set_font(fontfam, fsize):
+    """
+    Set the font family and size globally, as start_figure() does,
+    e.g. before plotting on a figure that already exists.
+
+    Returns the original font family and size, as a tuple.
+    """
     # Change overall font family:
     oldfont_family = matplotlib.rcParams["font.family"]
     matplotlib.rcParams["font.family"] = fontfam
@@ -52,18 +82,7 @@ def start_figure(cmsize, dpi_display, fontfam, fsize, figbackgroundcol=None):
     oldfont_size = matplotlib.rcParams["font.size"]
     matplotlib.rcParams["font.size"] = fsize  # Default is 12
 
-    # Set up the figure:
-    size_inches = [aside / 2.54 for aside in cmsize]
-    fig = plt.figure(figsize=size_inches, dpi=dpi_display)
-
-    # Specify the Figure background colour:
-    # The user can specify the alpha by using an rgba tuple,
-    # e.g. (1,0,1,0.5) would be semitransparent magenta.
-    if figbackgroundcol is not None:
-        fig.patch.set_facecolor(figbackgroundcol)
-        # fig.patch.set_alpha(1.0)
-
-    return fig, oldfont_family, oldfont_size
+    return oldfont_family, oldfont_size
 
 
 def start_standard_figure(settings):
@@ -85,7 +104,7 @@ def start_standard_figure(settings):
     return fig, oldfont_family, oldfont_size
 
 
-def end_figure(outfnames, dpi=None, oldfont_family=None, oldfont_size=None):
+def end_figure(outfnames, dpi=None, oldfont_family=None, oldfont_size=None, fig=None):
     """
     Do all the complicated logic related to
     finishing off a figure - plotting to screen/file, and closing.
@@ -99,28 +118,65 @@ def end_figure(outfnames, dpi=None, oldfont_family=None, oldfont_size=None):
     oldfont_family and oldfont_size can be provided,
     in which case the matplotlib.rcParams are restored
     to those original values after plotting.
+
+    outfnames may contain binary file objects as well as file names, the
+    format is taken from the extension of the file object's name. The figure
+    is only built once, so saving it in several formats costs little more
+    than saving it in one.
+
+    fig is the Figure object to save, by default the current figure.
+    It is saved directly, rather than through pyplot,
+    which would draw the figure again after saving it.
+
+    Returns the list of the file names that the figure was saved to.
     """
     # Loop over strings in the outfnames list
     # (allows us to write to different devices efficiently):
 
+    if fig is None:
+        fig = plt.gcf()
     if dpi is None:
-        dpi = plt.gcf().dpi
+        dpi = fig.dpi
 
     # First, ensure that outfnames IS a list:
-    if isinstance(outfnames, str):
+    if isinstance(outfnames, str) or hasattr(outfnames, "write"):
         outfnames = [outfnames]
     showit = False
+    saved = []
+    raster_drawn = False
     for outf in outfnames:
-        extn = outf.split(".")[-1].lower()
+        outf_name = outf if isinstance(outf, str) else outf.name
+        extn = get_image_format(outf)
         if extn == "x11":
             showit = True
+        elif raster_drawn and extn in RASTER_FORMATS:
+            # The figure has already been drawn at this dpi, save the same
+            # pixels rather than drawing it again:
+            with matplotlib.rc_context({"savefig.facecolor": "white"}):
+                matplotlib.image.imsave(
+                    outf,
+                    fig.canvas.buffer_rgba(),
+                    format=RASTER_FORMATS[extn],
+                    origin="upper",
+                    dpi=dpi,
+                )
+            LOG.debug("Plot saved to %s", outf_name)
+            saved.append(outf_name)
         else:
             # We have to explicitly set the "saved" Figure colour
             # to what we (might have) specified earlier:
-            plt.savefig(
-                outf, dpi=dpi, facecolor=plt.gcf().get_facecolor(), edgecolor="none"
+            fig.savefig(
+                outf,
+                format=extn,
+                dpi=dpi,
+                facecolor=fig.get_facecolor(),
+                edgecolor="none",
+            )
+            LOG.debug("Plot saved to %s", outf_name)
+            saved.append(outf_name)
+            raster_drawn = extn in RASTER_FORMATS and isinstance(
+                fig.canvas, FigureCanvasAgg
             )
-            LOG.debug("Plot saved to %s", outf)
 
     if showit:
         plt.show()  # Have to do this last, it clears the Figure
@@ -138,6 +194,17 @@ def end_figure(outfnames, dpi=None, oldfont_family=None, oldfont_size=None):
         LOG.debug("Resetting font size")
         matplotlib.rcParams["font.size"] = oldfont_size
 
+    return saved
+
+
+def get_image_format(outf):
+    """
+    Get the image format of a file name, or a binary file object,
+    from the extension of its name, in lower case.
+    """
+    outf_name = outf if isinstance(outf, str) else outf.name
+    return outf_name.split(".")[-1].lower()
+
 
 def get_time_series(cube, slice_and_sel_coord):
     """
@@ -148,61 +215,142 @@ def get_time_series(cube, slice_and_sel_coord):
     @param cube (Cube): an iris data cube
     @param slice_and_sel_coord (str): the name of the coord to slice over
 
-    @return a list of time values
+    @return a numpy array of time values
 
     """
     if slice_and_sel_coord is not None:
-        tcoord = cube.slices_over(slice_and_sel_coord).next().coord("time")
+        tcoord = next(cube.slices_over(slice_and_sel_coord)).coord("time")
     else:
         tcoord = cube.coord("time")
 
     if tcoord.units.calendar is not None:
-        tsteps = list(tcoord.units.num2date(tcoord.points))
-
-        if (
-            isinstance(tsteps[0], (dt.date, dt.datetime))
-            or tcoord.units.calendar == "standard"
-        ):
-            tpoints = [
-                t.year
-                + t.timetuple().tm_yday / (366.0 if calendar.isleap(t.year) else 365.0)
-                for t in tsteps
-            ]
-
-        elif isinstance(
-            tsteps[0],
-            (cf_units.cftime.datetime, cf_units.cftime._cftime.Datetime360Day),
-        ):
-            if tcoord.units.calendar == "360_day":
-                tpoints = [t.year + t.dayofyr / 360.0 for t in tsteps]
-            else:
-                raise Exception(
-                    "Got time points as cftime objects, "
-                    "but NOT on a 360-day calendar."
-                )
+        return get_fractional_years(tcoord)
 
-        else:
-            LOG.warning(
-                "Using num2date on the time coord points didn't give "
-                "standard or netcdf date/datetime objects. The time "
-                "coord units were:%s, num2date gave objects of type "
-                "%s",
-                units=tcoord.units,
-                type=type(tsteps[0]),
-            )
-            raise Exception("Unrecognised time coord data type, cannot plot")
+    # Non-date time coord, like a year! Simples!
+    LOG.info(
+        "Time coord points are not date-like objects, ASSUMEING they "
+        "are in year-fractions."
+    )
+    return tcoord.points
 
-    else:
-        # Non-date time coord, like a year! Simples!
-        LOG.info(
-            "Time coord points are not date-like objects, ASSUMEING they "
-            "are in year-fractions."
+
+def get_fractional_years(tcoord):
+    """
+    Convert the points of a time coordinate into fractions of years.
+
+    The points are converted as numbers, without creating a date for each point.
+    On the standard calendar a point is the year plus the day of the year divided
+    by the number of days in the year, on the 360 day calendar it is the year
+    plus the day of the year divided by 360. The conversion is cached for each
+    time coordinate, so the array is read only.
+
+    @param tcoord (Coord): an iris time coordinate, with units of days, hours,
+        minutes or seconds since a reference time
+
+    @return a numpy array of the fractions of years
+    """
+    points = np.ascontiguousarray(tcoord.points)
+    return _get_fractional_years(
+        tcoord.units.origin, tcoord.units.calendar, points.tobytes(), points.dtype.str
+    )
+
+
+@functools.lru_cache(maxsize=TIME_CACHE_SIZE)
+def _get_fractional_years(units_origin, calendar, points_bytes, dtype):
+    """
+    Convert time points into fractions of years, see get_fractional_years.
+
+    """
+    if calendar not in [cf_units.CALENDAR_STANDARD, cf_units.CALENDAR_360_DAY]:
+        raise Exception(
+            f"Got time points on a {calendar} calendar, but can only handle "
+            "standard and 360-day calendars."
         )
-        tpoints = tcoord.points
 
+    units = cf_units.Unit(units_origin, calendar=calendar)
+    period = cf_units.Unit(units_origin.split()[0])
+    if not period.is_convertible("days") or period.convert(1, "days") > 1:
+        raise Exception(
+            f"Time coord units are {units_origin} but I can only handle days, "
+            "hours, minutes and seconds!"
+        )
+
+    # the points as whole microseconds since the reference time
+    points = np.frombuffer(points_bytes, dtype=dtype)
+    microseconds = np.round(points * period.convert(1, "microseconds")).astype(np.int64)
+    reference = units.num2date(0)
+    reference_time = (
+        (reference.hour * 60 + reference.minute) * 60 + reference.second
+    ) * 10**6 + reference.microsecond
+
+    if calendar == cf_units.CALENDAR_360_DAY:
+        # the days since the start of year 0
+        days = (microseconds + reference_time) // (86400 * 10**6)
+        days += reference.year * 360 + (reference.month - 1) * 30 + reference.day - 1
+        tpoints = days // 360 + (days % 360 + 1) / 360.0
+
+    else:
+        times = np.datetime64(
+            f"{reference.year:04d}-{reference.month:02d}-{reference.day:02d}", "us"
+        ) + (microseconds + reference_time).astype("timedelta64[us]")
+        years = times.astype("datetime64[Y]")
+        year_starts = years.astype("datetime64[D]")
+        day_of_year = (times.astype("datetime64[D]") - year_starts).astype(int) + 1
+        days_in_year = ((years + 1).astype("datetime64[D]") - year_starts).astype(int)
+        tpoints = years.astype(int) + 1970 + day_of_year / days_in_year
+
+    tpoints.flags.writeable = False
     return tpoints
 
 
+def decimate_line(x_points, y_points, n_buckets):
+    """
+    Reduce the number of points in a line to those needed to draw it at the
+    width of the image.
+
+    The x range is split into n_buckets equal intervals, i.e. one per pixel
+    column, and the first, last, minimum and maximum points of each interval are
+    kept, in their original order. The line through these points covers the
+    same pixels as the full line.
+
+    The line is returned unchanged if it does not have more than four points per
+    interval, if the x values are not in ascending order or if any of the y
+    values are masked or not finite, as these leave gaps in the line.
+
+    @param x_points (array like): the x values
+    @param y_points (array like): the y values
+    @param n_buckets (int): the number of intervals, i.e. the width of the
+        image in pixels
+
+    @return a tuple of the x and y values
+    """
+    if len(x_points) <= 4 * n_buckets or np.ma.is_masked(y_points):
+        return x_points, y_points
+
+    x_values = np.asarray(x_points, dtype=float)
+    y_values = np.ma.getdata(y_points)
+    x_range = x_values[-1] - x_values[0]
+    if (
+        x_range <= 0
+        or np.any(np.diff(x_values) < 0)
+        or not np.all(np.isfinite(y_values))
+    ):
+        return x_points, y_points
+
+    buckets = np.minimum(
+        ((x_values - x_values[0]) * (n_buckets / x_range)).astype(int), n_buckets - 1
+    )
+    firsts = np.flatnonzero(np.diff(buckets, prepend=-1))
+    lasts = np.append(firsts[1:], len(buckets)) - 1
+
+    # the buckets are contiguous, so sorting by bucket then value puts the
+    # minimum of each bucket at its first index and the maximum at its last
+    order = np.lexsort((y_values, buckets))
+    keep = np.unique(np.concatenate([firsts, lasts, order[firsts], order[lasts]]))
+
+    return x_values[keep], y_values[keep]
+
+
 def make_colourbar(
     fig,
     bar_orientation,
@@ -318,30 +466,10 @@ def set_x_limits(cube, ax):
     @param ax (AxesSubplot): the sub-plot
 
     """
-    # Get x-axis limits from the Cube's time coord.
+    # Get x-axis limits from the Cube's time coord, in fractions of years.
     tcoord = cube.coord("time")
-    # Do this differently for datetime-like coords vs integer coords:
     if tcoord.units.calendar is not None:
-        if tcoord.units.name.startswith("hour"):
-            # Can't easily use dt.timedelta objects with netcdfdatetimes,
-            # which is likely to be what these are.
-            xlims = [
-                tcoord.units.num2date(tcoord.points[0]),
-                tcoord.units.num2date(tcoord.points[-1]),
-            ]
-        elif tcoord.units.name.startswith("day"):
-            # Can't easily use dt.timedelta objects with netcdfdatetimes,
-            # which is likely to be what these are.
-            xlims = [
-                tcoord.units.num2date(tcoord.points[0]),
-                tcoord.units.num2date(tcoord.points[-1]),
-            ]
-        else:
-            raise Exception(
-                "Time coord units are "
-                + str(tcoord.units)
-                + " but I can only handle days and hours!"
-            )
+        tsteps = get_fractional_years(tcoord)
     else:
         # x-axis will be in units of integer years.
         LOG.info(
@@ -349,38 +477,7 @@ def set_x_limits(cube, ax):
             "are in year-fractions."
         )
         tsteps = tcoord.points
-        xlims = [tsteps[0], tsteps[-1]]
-
-    # Now we've got proposed x-axis limits (as some data type),
-    # we convert those x-axis limits into fractions of years.
-    if isinstance(xlims[0], (dt.date, dt.datetime)):
-        xlims_touse = [
-            t.year
-            + t.timetuple().tm_yday / (366.0 if calendar.isleap(t.year) else 365.0)
-            for t in xlims
-        ]
-
-    elif isinstance(
-        xlims[0], (cf_units.cftime.datetime, cf_units.cftime._cftime.Datetime360Day)
-    ):
-        # Strictly-speaking, this might not be on a 360-day calendar,
-        # but in practice we're unlikely to get this kind of object
-        # unless a 360-day calendar is involved.
-        LOG.info(
-            "Time axis limits specified with cftime.datetime "
-            "objects, ASSUMEING they're on a 360-day calendar."
-        )
-        xlims_touse = [t.year + t.dayofyr / 360.0 for t in xlims]
-
-    elif isinstance(xlims[0], (float, int)):
-        xlims_touse = xlims
-
-    else:
-        raise Exception(
-            "Unacceptable format for x-limits! Please use "
-            "standard or netcdf date/datetime objects, or ints or "
-            "floats."
-        )
+    xlims_touse = [tsteps[0], tsteps[-1]]
 
     # Finally, apply the limits:
     ax.set_xlim(xlims_touse)
@@ -1,6 +1,10 @@
+import functools
 import logging
 
 import cartopy.io.shapereader as shpreader
+import cartopy.mpl.path as cpath
+import numpy as np
+import shapefile as shp
 from ukcp_dp.constants import UKCP_OSGB
 from ukcp_dp.spatial_files import (
     OVERLAY_ADMIN,
@@ -10,10 +14,14 @@ from ukcp_dp.spatial_files import (
     OVERLAY_RIVER_SMALL,
     OVERLAY_ADMIN_SMALL,
 )
+from ukcp_dp.utils import normalise_region_name
 
 
 LOG = logging.getLogger(__name__)
 
+# the number of shapefiles to keep in the cache
+SHAPEFILE_CACHE_SIZE = 16
+
 
 def reg_from_cube(
     acube,
@@ -99,6 +107,70 @@ def get_ukcp_shapefile_regions(regionset, region_names=None, hi_res=True):
     return shapefregs
 
 
+@functools.lru_cache(maxsize=SHAPEFILE_CACHE_SIZE)
+def get_ukcp_region_paths(regionset, hi_res, proj):
+    """
+    Get the outlines of all of the regions in one of the standard UKCP18
+    shapefiles, projected to proj, as matplotlib paths.
+
+    The paths are cached, so each region is only projected once per process
+    for each projection. The paths are shared between calls so they should not
+    be modified.
+
+    @param regionset (str): one of the keys in the UKSHAPES dictionary
+    @param hi_res (bool): if True use the high resolution shapefile
+    @param proj (cartopy.crs.CRS): the projection of the map
+
+    @return a tuple of (region name, matplotlib Path) pairs, in the order of
+        the shapefile. The region names are normalised, see
+        utils.normalise_region_name
+    """
+    attr_key = UKSHAPES[regionset.lower()]["attr_key"]
+    region_paths = []
+    for region in get_ukcp_shapefile_regions(regionset, hi_res=hi_res):
+        reg_proj = region.attributes["projection_forUKCP"]
+        if reg_proj != proj:
+            region_geometry = proj.project_geometry(region.geometry, src_crs=reg_proj)
+        else:
+            region_geometry = region.geometry
+
+        region_paths.append(
+            (
+                normalise_region_name(region.attributes[attr_key]),
+                cpath.shapely_to_path(region_geometry),
+            )
+        )
+
+    LOG.debug("Projected %s %s regions", len(region_paths), regionset)
+    return tuple(region_paths)
+
+
+@functools.lru_cache(maxsize=SHAPEFILE_CACHE_SIZE)
+def get_overlay_segments(sourcefile):
+    """
+    Get the vertices of the lines of a shapefile, for use as an overlay.
+
+    The shapefile is only read once per process, the arrays are shared between
+    calls so they are read only.
+
+    @param sourcefile (str): the file/directory of the shapefile
+
+    @return a tuple of numpy arrays, one (n, 2) array of the x and y values for
+        each part of each shape
+    """
+    LOG.debug("Reading overlay shapefile %s", sourcefile)
+    segments = []
+    with shp.Reader(sourcefile) as reader:
+        for shape in reader.iterShapes():
+            if len(shape.points) == 0:
+                continue
+            points = np.array(shape.points, dtype=float)[:, :2]
+            points.flags.writeable = False
+            # each part starts at the index given in shape.parts
+            segments.extend(np.split(points, shape.parts[1:]))
+    return tuple(segments)
+
+
 # Shapefile locations & other metadata:
 UKSHAPES = dict(
     # This includes 16 subnational administrative regions:
@@ -167,28 +239,28 @@ def _get_shapefile_regions(
     called   get_ukcp_shapefile_regions().
     """
 
-    LOG.debug("Reading shapefile %s", sourcefile)
-    # Create the shapefile Reader object:
-    regfileReader = shpreader.Reader(sourcefile)
+    records = _read_shapefile_records(sourcefile)
 
     try:
-        if attr_vals is None:
-            LOG.debug("All available regions selected")
-            attr_vals = _list_regions(regfileReader.records(), attr_key)
-
-        # Note that this DOESN'T preserve the ordering given in attr_vals!
-        selected_regions = [
-            rec
-            for rec in regfileReader.records()
-            if rec.attributes[attr_key] in attr_vals
-        ]
-
+        index = _get_shapefile_index(sourcefile, attr_key)
     except KeyError:
         LOG.error("Failed to extract shapefile regions using key %s", attr_key)
         LOG.error("Available keys in the shapefile are:")
-        LOG.error("\t".join(sorted(_list_keys(regfileReader.records()))))
+        LOG.error("\t".join(sorted(_list_keys(records))))
         raise KeyError()
 
+    if attr_vals is None:
+        LOG.debug("All available regions selected")
+        attr_vals = _list_regions(records, attr_key)
+        selected_regions = list(records)
+    else:
+        # the regions are in the order given in attr_vals
+        selected_regions = [
+            index[normalise_region_name(attr_val)]
+            for attr_val in attr_vals
+            if normalise_region_name(attr_val) in index
+        ]
+
     if len(selected_regions) != len(attr_vals):
         LOG.warning("Failed to return a region for all requested attribute " "values!")
         LOG.warning("Found %s regions:", len(selected_regions))
@@ -197,7 +269,7 @@ def _get_shapefile_regions(
         )
         LOG.warning("But you requested %s", attr_vals)
         LOG.warning("Available regions:")
-        LOG.warning("\n".join(_list_regions(regfileReader.records(), attr_key)))
+        LOG.warning("\n".join(_list_regions(records, attr_key)))
         raise UserWarning("Region mismatch")
 
     if projection is not None:
@@ -208,6 +280,40 @@ def _get_shapefile_regions(
     return selected_regions
 
 
+@functools.lru_cache(maxsize=SHAPEFILE_CACHE_SIZE)
+def _read_shapefile_records(sourcefile):
+    """
+    Read the records of a shapefile, once per process.
+
+    The records are shared between calls. A record creates its geometry the
+    first time it is used and then keeps it, so each geometry is only built
+    once.
+
+    @param sourcefile (str): the file/directory of the shapefile
+
+    @return a tuple of cartopy.io.shapereader.Record objects
+    """
+    LOG.debug("Reading shapefile %s", sourcefile)
+    return tuple(shpreader.Reader(sourcefile).records())
+
+
+@functools.lru_cache(maxsize=SHAPEFILE_CACHE_SIZE)
+def _get_shapefile_index(sourcefile, attr_key):
+    """
+    Get the records of a shapefile keyed on the normalised value of an
+    attribute, see utils.normalise_region_name.
+
+    @param sourcefile (str): the file/directory of the shapefile
+    @param attr_key (str): the key of the attribute to index the records on
+
+    @return a dict of cartopy.io.shapereader.Record objects
+    """
+    index = {}
+    for rec in _read_shapefile_records(sourcefile):
+        index.setdefault(normalise_region_name(rec.attributes[attr_key]), rec)
+    return index
+
+
 def _list_keys(records):
     """
     Simple utility function to return a list of
@@ -217,7 +323,7 @@ def _list_keys(records):
     This can be handy to find out how to access
     the regions available in a given shapefile.
     """
-    reg = records.next()
+    reg = next(iter(records))
     return list(reg.attributes)
 
 
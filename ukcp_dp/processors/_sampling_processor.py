@@ -1,4 +1,3 @@
-import copy
 import logging
 import random
 
@@ -167,22 +166,23 @@ class SamplingProcessor:
 
     def get_input_data(self, variable, time_period):
         """
-        Make a deep copy of self.get_input_data then update variable,
+        Derive a copy of self.input_data with an updated variable,
         time_period and temporal_average_type
         """
-        input_data = copy.deepcopy(self.input_data)
-        input_data.set_values(InputType.VARIABLE, [variable])
-        input_data.set_value(InputType.TIME_PERIOD, time_period)
-
         if time_period in self.vocab.get_collection_terms(TemporalAverageType.MONTHLY):
             temporal_average_type = TemporalAverageType.MONTHLY
         elif time_period == TemporalAverageType.ANNUAL:
             temporal_average_type = TemporalAverageType.ANNUAL
         else:
             temporal_average_type = TemporalAverageType.SEASONAL
-        input_data.set_value(InputType.TEMPORAL_AVERAGE_TYPE, temporal_average_type)
 
-        return input_data
+        return self.input_data.derive(
+            **{
+                InputType.VARIABLE: [variable],
+                InputType.TIME_PERIOD: time_period,
+                InputType.TEMPORAL_AVERAGE_TYPE: temporal_average_type,
+            }
+        )
 
     def _get_percentile_ids(self, cube, sampling_percentile):
         """
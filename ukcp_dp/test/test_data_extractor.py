@@ -1,6 +1,8 @@
 from os import path
 import unittest
 
+import numpy as np
+
 from ukcp_dp import InputType
 from ukcp_dp.data_extractor import DataExtractor
 from ukcp_dp._input_data import InputData
@@ -105,5 +107,41 @@ class DataEtractorPromoteXYTestCase(unittest.TestCase):
                 self.assertEqual(dim_coords[3], "projection_x_coordinate")
 
 
+class DataEtractorCubeCacheTestCase(unittest.TestCase):
+    def test_cube_cache(self):
+        """
+        Test that a shared cube cache gives the same results as loading the
+        files for each set of inputs.
+        """
+        inputs = [
+            (get_ls2_test_bbox_data()),
+            (get_ls2_test_y_line_data()),
+            (get_ls2_test_x_line_data()),
+            (get_ls2_test_dot_line_data()),
+        ]
+
+        vocab = Vocab()
+        cube_cache = {}
+        for data, input_files in inputs:
+            with self.subTest(data=data, input_files=input_files):
+                input_data = InputData(vocab)
+                input_data.set_inputs(data)
+
+                expected = DataExtractor(input_files, input_data, None).get_cubes()
+                cached = DataExtractor(
+                    input_files, input_data, None, cube_cache
+                ).get_cubes()
+
+                self.assertEqual(len(cached), len(expected))
+                for cached_cube, expected_cube in zip(cached, expected):
+                    self.assertEqual(cached_cube.coords(), expected_cube.coords())
+                    np.testing.assert_array_equal(
+                        cached_cube.data, expected_cube.data
+                    )
+
+        # all of the inputs use the same files
+        self.assertEqual(len(cube_cache), 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,60 @@
+import io
+
+from cf_units import Unit
+from iris.coords import DimCoord
+import numpy as np
+
+from ukcp_dp.file_writers._base_csv_writer import value_to_string, values_to_strings
+from ukcp_dp.file_writers._utils import array_to_strings, get_time_labels, write_rows
+
+
+def test_array_to_strings_matches_percent_s():
+    data = np.ma.masked_array(
+        np.array([[1.5, 1e-08, -0.0], [123456789.0, 0.1, 2.25]], dtype=np.float32),
+        mask=[[False, False, True], [False, False, False]],
+    )
+    expected = [["%s" % value for value in row] for row in data]
+
+    assert array_to_strings(data).tolist() == expected
+
+
+def test_write_rows():
+    output = io.StringIO()
+    labels = np.array([12000.0, 24000.0])
+    data = np.ma.masked_array(
+        np.array([[1, 2], [3, 4]], dtype=np.int32), mask=[[False, True], [False, False]]
+    )
+
+    write_rows(output, labels, data)
+
+    assert output.getvalue() == "12000.0,1,--\n24000.0,3,4\n"
+
+
+def test_values_to_strings_matches_value_to_string():
+    values = np.array([1.23456, 2.0004, -0.0005, 1e20], dtype=np.float32)
+    for variable in [None, "tas", "extremeSeaLevel"]:
+        expected = [value_to_string(value, variable) for value in values]
+
+        assert values_to_strings(values, variable).tolist() == expected
+
+
+def test_get_time_labels_matches_cell_strftime():
+    for calendar in ["360_day", "standard"]:
+        coord = DimCoord(
+            np.arange(0, 24 * 360 * 3, 24 * 30 + 6, dtype=np.float64),
+            standard_name="time",
+            units=Unit("hours since 1970-01-01 00:00:00", calendar=calendar),
+        )
+
+        for date_format in ["%Y-%m-%d", "%Y-%m-%dT%H:%M"]:
+            expected = [
+                coord[i].cell(0).point.strftime(date_format)
+                for i in range(coord.shape[0])
+            ]
+            assert list(get_time_labels(coord, date_format)) == expected
+
+
+def test_get_time_labels_is_cached_on_points():
+    coord = DimCoord([0.0, 30.0], standard_name="time", units="days since 2000-01-01")
+
+    assert get_time_labels(coord) is get_time_labels(coord.copy())
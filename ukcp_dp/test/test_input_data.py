@@ -0,0 +1,91 @@
+import pytest
+
+from ukcp_dp._input_data import InputData
+from ukcp_dp.constants import InputType
+from ukcp_dp.vocab_manager import Vocab
+
+
+def _get_input_data(vocab, **overrides):
+    data = {}
+    data[InputType.AREA] = ["bbox", -84667.14, -114260.0, 676489.68, 1230247.3]
+    data[InputType.COLLECTION] = "land-gcm"
+    data[InputType.VARIABLE] = "tas"
+    data[InputType.SCENARIO] = "rcp26"
+    data[InputType.TIME_PERIOD] = "mam"
+    data[InputType.TEMPORAL_AVERAGE_TYPE] = "seas"
+    data[InputType.YEAR_MINIMUM] = 2018
+    data[InputType.YEAR_MAXIMUM] = 2028
+    data[InputType.ENSEMBLE] = ["01", "02", "03"]
+    data[InputType.IMAGE_SIZE] = 1200
+    data[InputType.DATA_FORMAT] = "csv"
+    data.update(overrides)
+
+    input_data = InputData(vocab)
+    input_data.set_inputs(data)
+    return input_data
+
+
+def test_fingerprint_ignores_multi_value_order():
+    vocab = Vocab()
+    input_1 = _get_input_data(vocab)
+    input_2 = _get_input_data(vocab, ensemble=["03", "01", "02"])
+
+    assert (
+        input_1.get_data_selection_fingerprint()
+        == input_2.get_data_selection_fingerprint()
+    )
+
+
+def test_fingerprint_normalises_area():
+    vocab = Vocab()
+    input_1 = _get_input_data(vocab, area=["bbox", 0, 0, 100000, 100000])
+    input_2 = _get_input_data(vocab, area=["bbox", 0.0, 0.0, 100000.0, 100000.0])
+
+    assert (
+        input_1.get_data_selection_fingerprint()
+        == input_2.get_data_selection_fingerprint()
+    )
+
+
+def test_fingerprints_are_independent():
+    vocab = Vocab()
+    input_1 = _get_input_data(vocab)
+    input_2 = _get_input_data(vocab, image_size=900, data_format="netcdf")
+    input_3 = _get_input_data(vocab, time_period="jja")
+
+    assert (
+        input_1.get_data_selection_fingerprint()
+        == input_2.get_data_selection_fingerprint()
+    )
+    assert input_1.get_rendering_fingerprint() != input_2.get_rendering_fingerprint()
+    assert (
+        input_1.get_output_format_fingerprint()
+        != input_2.get_output_format_fingerprint()
+    )
+
+    assert (
+        input_1.get_data_selection_fingerprint()
+        != input_3.get_data_selection_fingerprint()
+    )
+    assert input_1.get_rendering_fingerprint() == input_3.get_rendering_fingerprint()
+
+
+def test_derive():
+    vocab = Vocab()
+    input_data = _get_input_data(vocab)
+    derived = input_data.derive(time_period="jja", variable=["pr"])
+
+    assert derived.get_value(InputType.TIME_PERIOD) == "jja"
+    assert derived.get_value(InputType.VARIABLE) == ["pr"]
+    assert derived.get_value(InputType.ENSEMBLE) == ["01", "02", "03"]
+    assert derived.vocab is vocab
+
+    # the original is unchanged
+    assert input_data.get_value(InputType.TIME_PERIOD) == "mam"
+    assert input_data.get_value(InputType.VARIABLE) == ["tas"]
+
+
+def test_derive_invalid_value():
+    input_data = _get_input_data(Vocab())
+    with pytest.raises(Exception, match="time_period"):
+        input_data.derive(time_period="smarch")
@@ -0,0 +1,122 @@
+import io
+import os
+import zipfile
+
+import iris
+import pytest
+
+from ukcp_dp import PlotType
+from ukcp_dp._input_data import InputData
+from ukcp_dp.constants import DataFormat
+from ukcp_dp.exception import UKCPDPInvalidParameterException
+from ukcp_dp.file_writers import write_file
+from ukcp_dp.test.test_write_shp_postage_stamp_map import get_ls2_test_bbox_data
+from ukcp_dp.utils import DirectorySink, MemorySink, ZipSink, get_output_sink
+from ukcp_dp.vocab_manager import Vocab
+
+
+def test_get_output_sink():
+    sink = get_output_sink("/tmp")
+    assert isinstance(sink, DirectorySink)
+    assert sink.get_path("a.csv") == os.path.join("/tmp", "a.csv")
+
+    memory_sink = MemorySink()
+    assert get_output_sink(memory_sink) is memory_sink
+
+    with pytest.raises(UKCPDPInvalidParameterException):
+        get_output_sink(io.BytesIO())
+
+
+def test_memory_sink():
+    sink = MemorySink()
+    with sink.open("a.csv") as output_file:
+        output_file.write("header,°C\n")
+    with sink.open("a.csv", "a") as output_file:
+        output_file.write("1,2\n")
+    with sink.open("b.png", "wb") as output_file:
+        output_file.write(b"\x89PNG")
+        assert output_file.name == "b.png"
+    with sink.local_file("c.nc") as local_file_name:
+        with open(local_file_name, "wb") as local_file:
+            local_file.write(b"CDF")
+
+    assert list(sink.files) == ["a.csv", "b.png", "c.nc"]
+    assert sink.files["a.csv"].getvalue() == "header,°C\n1,2\n".encode("utf-8")
+    assert sink.files["b.png"].getvalue() == b"\x89PNG"
+    assert sink.files["c.nc"].getvalue() == b"CDF"
+
+
+def test_zip_sink():
+    target = io.BytesIO()
+    with ZipSink(target) as sink:
+        with sink.open("a.csv") as output_file:
+            output_file.write("header\n")
+        with sink.open("a.csv", "a") as output_file:
+            output_file.write("1,2\n")
+        with sink.open("b.png", "wb") as output_file:
+            output_file.write(b"\x89PNG")
+        with sink.local_file("c.nc") as local_file_name:
+            with open(local_file_name, "wb") as local_file:
+                local_file.write(b"CDF")
+
+        # a.csv was completed when b.png was started
+        with pytest.raises(UKCPDPInvalidParameterException):
+            with sink.open("a.csv", "a"):
+                pass
+
+    with zipfile.ZipFile(target) as zip_file:
+        assert zip_file.namelist() == ["a.csv", "b.png", "c.nc"]
+        assert zip_file.read("a.csv") == b"header\n1,2\n"
+        assert zip_file.read("b.png") == b"\x89PNG"
+        assert zip_file.read("c.nc") == b"CDF"
+
+
+def test_write_file_to_sinks(tmp_path):
+    data, input_files, _, _ = get_ls2_test_bbox_data()
+    vocab = Vocab()
+    input_data = InputData(vocab)
+    input_data.set_inputs(data)
+    cube_list = iris.cube.CubeList([iris.load_cube(input_files)])
+
+    expected = []
+    for data_format in [DataFormat.CSV, DataFormat.SHAPEFILE]:
+        directory = tmp_path / data_format
+        directory.mkdir()
+        file_list = write_file(
+            cube_list,
+            None,
+            str(directory),
+            data_format,
+            input_data,
+            PlotType.POSTAGE_STAMP_MAPS,
+            "0.0.0TEST",
+            vocab,
+        )
+        for path in file_list:
+            with open(path, "rb") as output_file:
+                expected.append(output_file.read())
+
+    memory_sink = MemorySink()
+    zip_target = io.BytesIO()
+    file_lists = {"memory": [], "zip": []}
+    with ZipSink(zip_target) as zip_sink:
+        for data_format in [DataFormat.CSV, DataFormat.SHAPEFILE]:
+            for name, sink in [("memory", memory_sink), ("zip", zip_sink)]:
+                file_lists[name].extend(
+                    write_file(
+                        cube_list,
+                        None,
+                        sink,
+                        data_format,
+                        input_data,
+                        PlotType.POSTAGE_STAMP_MAPS,
+                        "0.0.0TEST",
+                        vocab,
+                    )
+                )
+
+    assert [memory_sink.files[path].getvalue() for path in file_lists["memory"]] == (
+        expected
+    )
+    with zipfile.ZipFile(zip_target) as zip_file:
+        assert [zip_file.read(path) for path in file_lists["zip"]] == expected
@@ -18,7 +18,43 @@ def run_plot_test(
     image_format,
     overlay_file_name=None,
 ):
+    output_file = write_plot(
+        **get_plot_job(
+            data,
+            input_files,
+            plot_type,
+            title,
+            image_format,
+            "/tmp",
+            overlay_file_name,
+        )
+    )
+
+    diff = ""
+
+    output_hash = imagehash.average_hash(Image.open(output_file), hash_size=32)
+    reference_hash = imagehash.average_hash(Image.open(reference_file), hash_size=32)
+
+    if output_hash != reference_hash:
+        print(f"Files differ: {output_file}, {reference_file}\n")
+        diff = f"Files differ: {output_file}, {reference_file}\n"
+
+    return diff
+
+
+def get_plot_job(
+    data,
+    input_files,
+    plot_type,
+    title,
+    image_format,
+    output_path,
+    overlay_file_name=None,
+):
+    """
+    Get the arguments of write_plot for a test plot.
 
+    """
     vocab = Vocab()
     input_data = InputData(vocab)
     input_data.set_inputs(data)
@@ -52,25 +88,14 @@ def run_plot_test(
         input_data.get_value(InputType.COLLECTION),
     )
 
-    output_file = write_plot(
-        plot_type,
-        "/tmp",
-        image_format,
-        input_data,
-        cube_list,
-        overlay_cube,
-        title,
-        vocab,
-        plot_settings,
-    )
-
-    diff = ""
-
-    output_hash = imagehash.average_hash(Image.open(output_file), hash_size=32)
-    reference_hash = imagehash.average_hash(Image.open(reference_file), hash_size=32)
-
-    if output_hash != reference_hash:
-        print(f"Files differ: {output_file}, {reference_file}\n")
-        diff = f"Files differ: {output_file}, {reference_file}\n"
-
-    return diff
+    return {
+        "plot_type": plot_type,
+        "output_path": output_path,
+        "image_format": image_format,
+        "input_data": input_data,
+        "cube_list": cube_list,
+        "overlay_cube": overlay_cube,
+        "title": title,
+        "vocab": vocab,
+        "plot_settings": plot_settings,
+    }
@@ -0,0 +1,54 @@
+from os import path
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from ukcp_dp.constants import LOGO_SMALL
+from ukcp_dp.plotters.utils import get_colour_palette, get_logo, warm_assets
+from ukcp_dp.plotters.utils._assets import (
+    PALETTE_DIR,
+    _get_colour_palette,
+    _read_colour_palette_file,
+)
+
+
+def test_get_logo():
+    logo = get_logo(LOGO_SMALL)
+    assert get_logo(LOGO_SMALL) is logo
+    assert not logo.flags.writeable
+
+    # the shared array can be added to a figure
+    fig = plt.figure()
+    fig.figimage(logo, 5, 5)
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def test_get_colour_palette():
+    cmap = get_colour_palette("UKCP_GrYl", 10)
+    assert cmap.N == 10
+
+    # a copy is returned so that it can be changed
+    cmap.set_bad(color="magenta")
+    cmap_2 = get_colour_palette("UKCP_GrYl", 10)
+    assert cmap_2 is not cmap
+    assert cmap_2.get_bad().tolist() != cmap.get_bad().tolist()
+
+    # the end colours are those of the file
+    colours = _read_colour_palette_file(path.join(PALETTE_DIR, "UKCP_GrYl.txt"))
+    np.testing.assert_allclose(cmap(0.0)[:3], colours[0])
+    np.testing.assert_allclose(cmap(1.0)[:3], colours[-1])
+
+    # the reversed palette
+    np.testing.assert_allclose(
+        get_colour_palette("UKCP_GrYl_r", 10)(np.linspace(0, 1, 10)),
+        cmap(np.linspace(1, 0, 10)),
+    )
+
+    assert get_colour_palette("RdBu_r", 8).N == 8
+
+
+def test_warm_assets():
+    _get_colour_palette.cache_clear()
+    warm_assets()
+    assert _get_colour_palette.cache_info().currsize == 8
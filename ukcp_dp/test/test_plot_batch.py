@@ -0,0 +1,90 @@
+import os
+from os import path
+
+from ukcp_dp import ImageFormat, PlotType
+from ukcp_dp.plotters import render_batch, start_render_pool
+from ukcp_dp.test.test_plot import get_plot_job
+from ukcp_dp.test.test_plot_plume import (
+    get_ls1_test_prob_point_data,
+    get_ls2_test_point_colour_data,
+    get_ls2_test_point_data,
+)
+from ukcp_dp.utils import MemorySink
+
+
+def _get_jobs(output_dir):
+    jobs = []
+    for inx, (data, input_files, _, overlay_input_files) in enumerate(
+        [
+            get_ls1_test_prob_point_data(),
+            get_ls2_test_point_data(),
+            get_ls2_test_point_colour_data(),
+        ]
+    ):
+        output_path = path.join(output_dir, str(inx))
+        os.makedirs(output_path)
+        jobs.append(
+            get_plot_job(
+                data,
+                input_files,
+                PlotType.PLUME_PLOT,
+                "Plume Test Plot",
+                ImageFormat.PNG,
+                output_path,
+                overlay_input_files,
+            )
+        )
+    return jobs
+
+
+def _read(file_name):
+    with open(file_name, "rb") as image_file:
+        return image_file.read()
+
+
+def test_render_batch_parallel(tmp_path):
+    """
+    Test that the plots generated by worker processes are the same as those
+    generated in turn.
+
+    """
+    jobs = _get_jobs(str(tmp_path / "sequential"))
+    image_files = render_batch(jobs)
+
+    parallel_jobs = _get_jobs(str(tmp_path / "parallel"))
+    # one plot is kept in memory so it is generated in this process
+    memory_sink = MemorySink()
+    parallel_jobs[1]["output_path"] = memory_sink
+    # the same cubes are used by two plots
+    parallel_jobs.append(dict(parallel_jobs[0]))
+    parallel_jobs[-1]["output_path"] = str(tmp_path / "parallel" / "3")
+    os.makedirs(parallel_jobs[-1]["output_path"])
+
+    with start_render_pool(2) as executor:
+        parallel_files = render_batch(parallel_jobs, executor=executor)
+
+    assert path.dirname(parallel_files[0]) == str(tmp_path / "parallel" / "0")
+    assert _read(parallel_files[0]) == _read(image_files[0])
+    assert memory_sink.files[parallel_files[1]].getvalue() == _read(image_files[1])
+    assert _read(parallel_files[2]) == _read(image_files[2])
+    assert _read(parallel_files[3]) == _read(image_files[0])
+
+
+def test_render_batch_memory_sinks(tmp_path, monkeypatch):
+    """
+    Test that no pool is started when all of the plots are kept in memory.
+
+    """
+    jobs = _get_jobs(str(tmp_path))
+    memory_sinks = [MemorySink() for _ in jobs]
+    for job, memory_sink in zip(jobs, memory_sinks):
+        job["output_path"] = memory_sink
+
+    def no_pool(max_workers=None):
+        raise AssertionError("a pool should not be started")
+
+    monkeypatch.setattr("ukcp_dp.plotters._batch.start_render_pool", no_pool)
+    image_files = render_batch(jobs, max_workers=2)
+
+    for image_file, memory_sink in zip(image_files, memory_sinks):
+        assert list(memory_sink.files) == [image_file]
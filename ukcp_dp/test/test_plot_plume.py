@@ -1,8 +1,12 @@
+import io
 from os import path
 import unittest
 
 from ukcp_dp import ImageFormat, InputType, PlotType
-from ukcp_dp.test.test_plot import run_plot_test
+from ukcp_dp.exception import UKCPDPInvalidParameterException
+from ukcp_dp.plotters import write_plot
+from ukcp_dp.test.test_plot import get_plot_job, run_plot_test
+from ukcp_dp.utils import MemorySink, ZipSink
 
 
 def get_ls1_test_prob_point_data():
@@ -275,6 +279,48 @@ class PlumePlotTestCase(unittest.TestCase):
                 )
                 self.assertEqual(diff, "", diff)
 
+    def test_plume_plot_formats(self):
+        """
+        Test that the plume plotter writes the same images when it is asked
+        for several formats.
+
+        """
+        data, input_files, _, overlay_input_files = get_ls2_test_point_colour_data()
+        formats = [ImageFormat.PNG, ImageFormat.JPG]
+
+        sink = MemorySink()
+        job = get_plot_job(
+            data,
+            input_files,
+            PlotType.PLUME_PLOT,
+            "Plume Test Plot",
+            formats,
+            sink,
+            overlay_input_files,
+        )
+        image_files = write_plot(**job)
+        self.assertEqual(len(image_files), 2)
+
+        for image_format, image_file in zip(formats, image_files):
+            self.assertTrue(image_file.endswith(f".{image_format}"))
+            single_sink = MemorySink()
+            single_file = write_plot(
+                **dict(job, image_format=image_format, output_path=single_sink)
+            )
+            self.assertEqual(
+                sink.files[image_file].getvalue(),
+                single_sink.files[single_file].getvalue(),
+            )
+
+        # the images are written in turn to a zip file
+        with ZipSink(io.BytesIO()) as zip_sink:
+            self.assertEqual(
+                len(write_plot(**dict(job, output_path=zip_sink))), len(formats)
+            )
+
+        with self.assertRaises(UKCPDPInvalidParameterException):
+            write_plot(**dict(job, image_format=[ImageFormat.PNG, ImageFormat.PNG]))
+
 
 if __name__ == "__main__":
     unittest.main()
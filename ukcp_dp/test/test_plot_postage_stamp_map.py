@@ -2,7 +2,10 @@ from os import path
 import unittest
 
 from ukcp_dp import AreaType, ImageFormat, InputType, PlotType
-from ukcp_dp.test.test_plot import run_plot_test
+from ukcp_dp.plotters import write_plot
+from ukcp_dp.plotters.utils._map_template import _MAP_TEMPLATES, clear_map_templates
+from ukcp_dp.test.test_plot import get_plot_job, run_plot_test
+from ukcp_dp.utils import MemorySink
 
 
 def get_ls2_test_bbox_28_data():
@@ -350,6 +353,36 @@ class PostagestampMapTestCase(unittest.TestCase):
                 )
                 self.assertEqual(diff, "")
 
+    def test_postagestamp_map_template(self):
+        """
+        Test that a region map plotted from a template is the same as the map
+        that built the template, and that a template is not used for a PDF.
+
+        """
+        data, input_files, _ = get_ls2_test_region_data()
+        job = get_plot_job(
+            data,
+            input_files,
+            PlotType.POSTAGE_STAMP_MAPS,
+            "Postage Stamp Map Test Plot",
+            ImageFormat.PNG,
+            None,
+        )
+
+        clear_map_templates()
+        images = []
+        for _ in range(3):
+            sink = MemorySink()
+            image_file = write_plot(**dict(job, output_path=sink))
+            images.append(sink.files[image_file].getvalue())
+        self.assertEqual(len(_MAP_TEMPLATES), 1)
+        self.assertEqual(images[1], images[0])
+        self.assertEqual(images[2], images[0])
+
+        clear_map_templates()
+        write_plot(**dict(job, output_path=MemorySink(), image_format=ImageFormat.PDF))
+        self.assertEqual(len(_MAP_TEMPLATES), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,131 @@
+import calendar
+
+import cf_units
+import iris.coords
+import iris.cube
+import numpy as np
+import pytest
+
+from ukcp_dp.plotters.utils._map_utils import get_data_stats
+from ukcp_dp.plotters.utils._plotting_utils import decimate_line, get_fractional_years
+
+
+def test_decimate_line():
+    x_points = np.linspace(1981, 2001, 100000)
+    y_points = np.sin(x_points * 50) + np.random.default_rng(0).normal(size=100000)
+
+    x_values, y_values = decimate_line(x_points, y_points, 100)
+    assert len(x_values) <= 400
+    assert np.all(np.diff(x_values) > 0)
+
+    # the end points and the extremes of each bucket are kept
+    assert (x_values[0], x_values[-1]) == (x_points[0], x_points[-1])
+    for bucket in np.array_split(np.arange(100000), 100):
+        in_bucket = (x_values >= x_points[bucket[0]]) & (
+            x_values <= x_points[bucket[-1]]
+        )
+        assert y_values[in_bucket].min() == y_points[bucket].min()
+        assert y_values[in_bucket].max() == y_points[bucket].max()
+
+
+def test_decimate_line_unchanged():
+    # short lines
+    x_points = list(range(400))
+    y_points = np.arange(400.0)
+    assert decimate_line(x_points, y_points, 100) == (x_points, y_points)
+
+    # lines with gaps
+    y_points = np.ma.masked_array(np.arange(1000.0), mask=False)
+    y_points[10] = np.ma.masked
+    assert decimate_line(range(1000), y_points, 100)[1] is y_points
+    y_points = np.arange(1000.0)
+    y_points[10] = np.nan
+    assert decimate_line(range(1000), y_points, 100)[1] is y_points
+
+
+def test_get_fractional_years():
+    # 1 Jan, 2 Jan and 31 Dec 2000, 1 Jan 2001 at 12:00
+    tcoord = iris.coords.DimCoord(
+        [12, 36, 8772, 8796],
+        standard_name="time",
+        units=cf_units.Unit("hours since 2000-01-01 00:00:00", calendar="standard"),
+    )
+    tpoints = get_fractional_years(tcoord)
+    np.testing.assert_allclose(
+        tpoints, [2000 + 1 / 366, 2000 + 2 / 366, 2001, 2001 + 1 / 365]
+    )
+    assert not tpoints.flags.writeable
+    assert get_fractional_years(tcoord.copy()) is tpoints
+
+    # 1 Jan, 30 Dec and 1 Jan 1971 on a 360 day calendar
+    tcoord = iris.coords.DimCoord(
+        [0.5, 359.5, 360.5],
+        standard_name="time",
+        units=cf_units.Unit("days since 1970-01-01", calendar="360_day"),
+    )
+    np.testing.assert_allclose(
+        get_fractional_years(tcoord), [1970 + 1 / 360, 1971, 1971 + 1 / 360]
+    )
+
+
+def test_get_fractional_years_num2date():
+    # the same as converting the dates one at a time
+    units = cf_units.Unit("hours since 1970-01-01 00:00:00", calendar="standard")
+    points = np.arange(-100000.0, 1000000.0, 997.5)
+    tpoints = get_fractional_years(
+        iris.coords.DimCoord(points, standard_name="time", units=units)
+    )
+    expected = [
+        t.year + t.timetuple().tm_yday / (366.0 if calendar.isleap(t.year) else 365.0)
+        for t in units.num2date(points)
+    ]
+    np.testing.assert_array_equal(tpoints, expected)
+
+
+def test_get_fractional_years_invalid():
+    tcoord = iris.coords.DimCoord(
+        [0, 1],
+        standard_name="time",
+        units=cf_units.Unit("days since 1970-01-01", calendar="365_day"),
+    )
+    with pytest.raises(Exception, match="365_day calendar"):
+        get_fractional_years(tcoord)
+
+    tcoord.units = cf_units.Unit("months since 1970-01-01", calendar="360_day")
+    with pytest.raises(Exception, match="months since"):
+        get_fractional_years(tcoord)
+
+
+def test_get_data_stats():
+    data = np.ma.masked_array(
+        [[1.0, np.nan, 3.0], [-9.0, 5.0, 6.0], [2.0, 2.0, 2.0]],
+        mask=[[False, False, False], [True, False, False], [False, False, False]],
+    )
+    cube = iris.cube.Cube(data.copy())
+    cube.add_dim_coord(iris.coords.DimCoord([1, 2, 3], long_name="region"), 1)
+    cube.add_dim_coord(iris.coords.DimCoord([1, 4, 5], long_name="ensemble_member"), 0)
+
+    # masked and NaN values are ignored
+    assert get_data_stats(cube) == (1.0, 6.0, None)
+
+    data_min, data_max, means = get_data_stats(cube, "ensemble_member")
+    assert (data_min, data_max) == (1.0, 6.0)
+    np.testing.assert_allclose(means, [2.0, 5.5, 2.0])
+
+    # the cube is not changed
+    np.testing.assert_array_equal(cube.data.data, data.data)
+    np.testing.assert_array_equal(cube.data.mask, data.mask)
+
+    # integer data
+    cube.data = np.ma.masked_array(
+        [[1, 2, 3], [-9, 5, 6], [2, 2, 2]], mask=data.mask, dtype=np.int32
+    )
+    data_min, data_max, means = get_data_stats(cube, "ensemble_member")
+    assert (data_min, data_max) == (1.0, 6.0)
+    np.testing.assert_allclose(means, [2.0, 5.5, 2.0])
+
+    # there is no valid data
+    cube.data = np.ma.masked_array(data.data, mask=~np.isnan(data.data))
+    data_min, data_max, means = get_data_stats(cube, "ensemble_member")
+    assert np.isnan(data_min) and np.isnan(data_max)
+    assert np.isnan(means).all()
@@ -0,0 +1,115 @@
+import cartopy.crs as ccrs
+import numpy as np
+import shapefile as shp
+
+from ukcp_dp.constants import UKCP_OSGB
+from ukcp_dp.plotters.utils._region_utils import (
+    UKSHAPES,
+    _get_shapefile_regions,
+    get_overlay_segments,
+    get_ukcp_region_paths,
+)
+from ukcp_dp.utils import (
+    get_netcdf_region_name,
+    get_region_shapefile,
+    normalise_region_name,
+)
+
+
+REGIONS = ["North East England", "Orkney and Shetland", "Solway"]
+
+
+def _write_region_shapefile(tmp_path):
+    file_name = str(tmp_path / "regions")
+    with shp.Writer(file_name) as shape_writer:
+        shape_writer.field("geo_region", "C", 27)
+        shape_writer.field("x_coord", "N", decimal=6)
+        shape_writer.field("y_coord", "N", decimal=6)
+        for inx, region in enumerate(REGIONS):
+            shape_writer.poly([[[inx, 0], [inx, 1], [inx + 1, 1], [inx + 1, 0]]])
+            shape_writer.record(region, inx + 0.5, 0.5)
+    return file_name
+
+
+def test_region_names():
+    assert normalise_region_name("Orkney and Shetlands") == "Orkney and Shetland"
+    assert normalise_region_name("Orkney and Shetland") == "Orkney and Shetland"
+    assert normalise_region_name("Solway") == "Solway"
+    assert get_netcdf_region_name("Orkney and Shetland") == "Orkney and Shetlands"
+    assert get_netcdf_region_name("Orkney and Shetlands") == "Orkney and Shetlands"
+    assert get_netcdf_region_name("Solway") == "Solway"
+
+
+def test_get_region_shapefile(tmp_path):
+    file_name = _write_region_shapefile(tmp_path)
+    region_shape_file = get_region_shapefile(file_name)
+
+    # the shapefile is only read once
+    assert get_region_shapefile(file_name) is region_shape_file
+
+    assert region_shape_file.get_region_names() == REGIONS
+    shape_record = region_shape_file.get("Solway")
+    assert shape_record.record["geo_region"] == "Solway"
+    assert shape_record.record["x_coord"] == 2.5
+    assert list(shape_record.shape.bbox) == [2, 0, 3, 1]
+
+    # the netCDF name of the region is also found
+    assert (
+        region_shape_file.get("Orkney and Shetlands").record["geo_region"]
+        == "Orkney and Shetland"
+    )
+    assert region_shape_file.get("Thames") is None
+
+
+def test_get_shapefile_regions(tmp_path):
+    file_name = _write_region_shapefile(tmp_path)
+
+    regions = _get_shapefile_regions(file_name, "geo_region", None, UKCP_OSGB)
+    assert [region.attributes["geo_region"] for region in regions] == REGIONS
+    assert regions[0].attributes["projection_forUKCP"] == UKCP_OSGB
+
+    # the records, and their geometries, are shared between calls
+    regions_2 = _get_shapefile_regions(
+        file_name, "geo_region", ["Solway", "Orkney and Shetlands"], UKCP_OSGB
+    )
+    assert regions_2 == [regions[2], regions[1]]
+    assert regions_2[0].geometry is regions[2].geometry
+
+
+def test_get_ukcp_region_paths(tmp_path, monkeypatch):
+    file_name = _write_region_shapefile(tmp_path)
+    monkeypatch.setitem(UKSHAPES, "test", dict(UKSHAPES["river"], sourcefile=file_name))
+
+    region_paths = get_ukcp_region_paths("test", True, UKCP_OSGB)
+    assert [name for name, _ in region_paths] == REGIONS
+    np.testing.assert_allclose(
+        region_paths[2][1].get_extents().bounds, [2, 0, 1, 1], atol=1e-6
+    )
+
+    # the regions are only projected once for each projection
+    assert get_ukcp_region_paths("test", True, UKCP_OSGB) is region_paths
+    projected_paths = get_ukcp_region_paths("test", True, ccrs.PlateCarree())
+    assert projected_paths is not region_paths
+    assert projected_paths[0][1].get_extents().x0 < 0
+
+
+def test_get_overlay_segments(tmp_path):
+    file_name = str(tmp_path / "lines")
+    with shp.Writer(file_name, shapeType=shp.POLYLINE) as shape_writer:
+        shape_writer.field("name", "C", 10)
+        shape_writer.line([[[0, 0], [1, 1], [2, 0]], [[5, 5], [6, 6]]])
+        shape_writer.record("a")
+        shape_writer.line([[[10, 10], [11, 10]]])
+        shape_writer.record("b")
+
+    segments = get_overlay_segments(file_name)
+
+    # one array per part of each shape
+    assert len(segments) == 3
+    np.testing.assert_array_equal(segments[0], [[0, 0], [1, 1], [2, 0]])
+    np.testing.assert_array_equal(segments[1], [[5, 5], [6, 6]])
+    np.testing.assert_array_equal(segments[2], [[10, 10], [11, 10]])
+    assert not segments[0].flags.writeable
+
+    # the shapefile is only read once
+    assert get_overlay_segments(file_name) is segments
@@ -0,0 +1,41 @@
+from ukcp_dp.constants import InputType
+from ukcp_dp.validator import Validator
+from ukcp_dp.vocab_manager import Vocab
+
+
+def _get_inputs():
+    data = {}
+    data[InputType.AREA] = ["point", 387500.0, 287500.0]
+    data[InputType.COLLECTION] = "land-gcm"
+    data[InputType.VARIABLE] = "tas"
+    data[InputType.SCENARIO] = "rcp26"
+    data[InputType.TIME_PERIOD] = "mam"
+    data[InputType.TEMPORAL_AVERAGE_TYPE] = "seas"
+    data[InputType.YEAR_MINIMUM] = 2018
+    data[InputType.YEAR_MAXIMUM] = 2028
+    data[InputType.ENSEMBLE] = ["01", "02"]
+    return data
+
+
+def test_validate_many():
+    valid = _get_inputs()
+
+    bad_years = _get_inputs()
+    bad_years[InputType.YEAR] = 2020
+
+    bad_year_and_period = _get_inputs()
+    bad_year_and_period[InputType.YEAR] = 2020
+    bad_year_and_period[InputType.TIME_PERIOD] = "jan"
+
+    unknown_value = _get_inputs()
+    unknown_value[InputType.COLLECTION] = "no-such-collection"
+
+    results = Validator(Vocab()).validate_many(
+        [valid, bad_years, bad_year_and_period, unknown_value]
+    )
+
+    assert len(results) == 4
+    assert results[0] == []
+    assert [error["check"] for error in results[1]] == ["time_slice"]
+    assert [error["check"] for error in results[2]] == ["time_slice", "time_period"]
+    assert [error["check"] for error in results[3]] == ["inputs"]
@@ -0,0 +1,17 @@
+from ukcp_dp.vocab_manager import Vocab
+
+
+def test_get_collection_term_value_exact():
+    vocab = Vocab()
+    assert vocab.get_collection_term_value("time_period", "January") == "jan"
+
+
+def test_get_collection_term_value_case_insensitive():
+    vocab = Vocab()
+    assert vocab.get_collection_term_value("time_period", " JANUARY ") == "jan"
+
+
+def test_get_collection_term_value_unknown():
+    vocab = Vocab()
+    assert vocab.get_collection_term_value("time_period", "Smarch") is None
+    assert vocab.get_collection_term_value("no_such_collection", "January") is None
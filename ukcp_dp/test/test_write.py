@@ -18,6 +18,7 @@ def run_write_test(
     plot_type=None,
     overlay_file_name=None,
     data_format="csv",
+    max_workers=None,
 ):
 
     vocab = Vocab()
@@ -45,6 +46,7 @@ def run_write_test(
         plot_type,
         process_version="0.0.0TEST",
         vocab=vocab,
+        max_workers=max_workers,
     )
 
     diff = ""
@@ -110,6 +110,22 @@ class PostagestampCsvTestCase(unittest.TestCase):
                 )
                 self.assertEqual(diff, "", diff)
 
+    def test_postagestamp_csv_parallel(self):
+        """
+        Test that the postage stamp csv writer writes the same files per ensemble
+        when using worker processes.
+        """
+        data, input_files, reference_files, output_file_index = get_ls2_test_bbox_data()
+        diff = run_write_test(
+            data,
+            input_files,
+            reference_files,
+            output_file_index,
+            PlotType.POSTAGE_STAMP_MAPS,
+            max_workers=2,
+        )
+        self.assertEqual(diff, "", diff)
+
 
 if __name__ == "__main__":
     unittest.main()
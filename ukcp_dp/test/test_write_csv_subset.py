@@ -426,6 +426,24 @@ class SubsetCsvTestCase(unittest.TestCase):
                 )
                 self.assertEqual(diff, "", diff)
 
+    def test_subset_csv_parallel(self):
+        """
+        Test that the subset csv writer writes the same files per ensemble when
+        using worker processes.
+        """
+        inputs = [(get_ls2_test_bbox_data()), (get_ls2_test_bbox_anom_data())]
+
+        for data, input_files, reference_files, output_file_index in inputs:
+            with self.subTest(data=data, input_files=input_files):
+                diff = run_write_test(
+                    data,
+                    input_files,
+                    reference_files,
+                    output_file_index,
+                    max_workers=2,
+                )
+                self.assertEqual(diff, "", diff)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,15 @@
 from os import path
 import unittest
 
+import iris
+import netCDF4
+import numpy as np
+import pytest
+
 from ukcp_dp import InputType, PlotType
 from ukcp_dp.constants import DataFormat
+from ukcp_dp.exception import UKCPDPInvalidParameterException
+from ukcp_dp.file_writers import write_file
 from ukcp_dp.test.test_write import run_write_test
 from ukcp_dp.test.test_write_csv_plume import get_ls2_test_point_data
 
@@ -69,5 +76,80 @@ class NetcdfTestCase(unittest.TestCase):
                 self.assertEqual(diff, "", diff)
 
 
+def _write_bbox_netcdf(output_path, format_options):
+    input_file = path.join(
+        path.abspath(path.dirname(__file__)),
+        "data",
+        "input_files",
+        "LS2_Subset_01_bbox_seasonal.nc",
+    )
+    cube = iris.load_cube(input_file)
+    file_list = write_file(
+        iris.cube.CubeList([cube]),
+        None,
+        str(output_path),
+        DataFormat.NET_CDF,
+        None,
+        None,
+        "0.0.0TEST",
+        None,
+        format_options=format_options,
+    )
+    return cube, file_list[0]
+
+
+def test_netcdf_format_options(tmp_path):
+    (tmp_path / "plain").mkdir()
+    (tmp_path / "map").mkdir()
+    (tmp_path / "time_series").mkdir()
+
+    cube, plain_file = _write_bbox_netcdf(tmp_path / "plain", None)
+    _, map_file = _write_bbox_netcdf(
+        tmp_path / "map", {"complevel": 5, "chunking": "map"}
+    )
+    _, time_series_file = _write_bbox_netcdf(
+        tmp_path / "time_series",
+        {"complevel": 1, "chunking": "time_series", "least_significant_digit": 2},
+    )
+
+    x_dim = cube.coord_dims("projection_x_coordinate")[0]
+    y_dim = cube.coord_dims("projection_y_coordinate")[0]
+    time_dim = cube.coord_dims("time")[0]
+
+    with netCDF4.Dataset(plain_file) as dataset:
+        variable = dataset.variables[cube.var_name]
+        assert not variable.filters()["zlib"]
+        plain_data = variable[:]
+
+    with netCDF4.Dataset(map_file) as dataset:
+        variable = dataset.variables[cube.var_name]
+        assert variable.filters()["zlib"]
+        assert variable.filters()["complevel"] == 5
+        assert variable.filters()["shuffle"]
+        chunking = variable.chunking()
+        assert chunking[x_dim] == cube.shape[x_dim]
+        assert chunking[y_dim] == cube.shape[y_dim]
+        assert chunking[time_dim] == 1
+        # compression is lossless
+        np.testing.assert_array_equal(variable[:], plain_data)
+
+    with netCDF4.Dataset(time_series_file) as dataset:
+        variable = dataset.variables[cube.var_name]
+        assert variable.chunking()[time_dim] == cube.shape[time_dim]
+        np.testing.assert_allclose(variable[:], plain_data, atol=0.01)
+
+
+def test_netcdf_invalid_format_options(tmp_path):
+    for format_options in [
+        {"complevel": 10},
+        {"chunking": "rows"},
+        {"chunking": (1, 2)},
+        {"least_significant_digit": 0.5},
+        {"compression": "zlib"},
+    ]:
+        with pytest.raises(UKCPDPInvalidParameterException):
+            _write_bbox_netcdf(tmp_path, format_options)
+
+
 if __name__ == "__main__":
     unittest.main()
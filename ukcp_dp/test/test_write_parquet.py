@@ -0,0 +1,118 @@
+from os import path
+
+import iris
+import numpy as np
+import pytest
+
+from ukcp_dp._input_data import InputData
+from ukcp_dp.constants import DataFormat
+from ukcp_dp.exception import UKCPDPInvalidParameterException
+from ukcp_dp.file_writers import write_file
+from ukcp_dp.test.test_write_csv_subset import get_ls2_test_bbox_data
+from ukcp_dp.vocab_manager import Vocab
+
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def _get_input_file(file_name):
+    return path.join(
+        path.abspath(path.dirname(__file__)), "data", "input_files", file_name
+    )
+
+
+def test_parquet_bbox(tmp_path):
+    data, input_files, _, _ = get_ls2_test_bbox_data()
+    vocab = Vocab()
+    input_data = InputData(vocab)
+    input_data.set_inputs(data)
+    cube = iris.load_cube(input_files)
+
+    file_list = write_file(
+        iris.cube.CubeList([cube]),
+        None,
+        str(tmp_path),
+        DataFormat.PARQUET,
+        input_data,
+        None,
+        "0.0.0TEST",
+        vocab,
+    )
+
+    assert len(file_list) == 1
+    table = pq.read_table(file_list[0])
+    assert table.num_rows == cube.data.size
+
+    # one column per coordinate of each dimension, then the values
+    assert table.column_names[-1] == cube.name()
+    for coord in cube.coords(dim_coords=True):
+        assert coord.name() in table.column_names
+    np.testing.assert_array_equal(
+        table.column(cube.name()).to_numpy(), cube.data.ravel()
+    )
+
+    # the rows follow the order of the data
+    x_dim = cube.coord_dims("projection_x_coordinate")[0]
+    x_points = np.broadcast_to(
+        cube.coord("projection_x_coordinate").points.reshape(
+            [-1 if dim == x_dim else 1 for dim in range(cube.ndim)]
+        ),
+        cube.shape,
+    )
+    np.testing.assert_array_equal(
+        table.column("projection_x_coordinate").to_numpy(), x_points.ravel()
+    )
+
+    # 360 day calendar dates are strings
+    assert table.column("time")[0].as_py() == "2018-04-16T00:00:00"
+    assert (
+        table.schema.field(cube.name()).metadata[b"units"] == str(cube.units).encode()
+    )
+
+    metadata = table.schema.metadata
+    assert metadata[b"Software Version"] == b"0.0.0TEST"
+    for key, value in input_data.get_user_inputs().items():
+        assert metadata[str(key).encode()] == str(value).encode()
+
+
+def test_parquet_obs_region(tmp_path):
+    cube = iris.load_cube(_get_input_file("LS6_Subset_01_all_admin_monthly.nc"))
+    cube.data = np.ma.masked_less(cube.data, 5)
+
+    file_list = write_file(
+        iris.cube.CubeList([cube]),
+        None,
+        str(tmp_path),
+        DataFormat.PARQUET,
+        None,
+        None,
+        "0.0.0TEST",
+        None,
+        format_options={"compression": "gzip"},
+    )
+
+    table = pq.read_table(file_list[0])
+    times = cube.coord("time").units.num2date(cube.coord("time").points)
+    assert table.column("time")[0].as_py() == times[0]
+    assert table.column("Administrative Region")[1].as_py() == "East of England"
+
+    # masked values are null
+    values = table.column(cube.name())
+    assert values.null_count == np.ma.count_masked(cube.data)
+    assert values.to_pylist() == cube.data.ravel().tolist()
+
+
+def test_parquet_invalid_format_options(tmp_path):
+    cube = iris.load_cube(_get_input_file("LS6_Subset_01_all_admin_monthly.nc"))
+    with pytest.raises(UKCPDPInvalidParameterException):
+        write_file(
+            iris.cube.CubeList([cube]),
+            None,
+            str(tmp_path),
+            DataFormat.PARQUET,
+            None,
+            None,
+            "0.0.0TEST",
+            None,
+            format_options={"complevel": 4},
+        )
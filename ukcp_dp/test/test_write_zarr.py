@@ -0,0 +1,132 @@
+from os import path
+import zipfile
+
+import iris
+import numpy as np
+import pytest
+
+from ukcp_dp.constants import DataFormat
+from ukcp_dp.exception import UKCPDPInvalidParameterException
+from ukcp_dp.file_writers import write_file
+from ukcp_dp.utils import MemorySink
+
+
+zarr = pytest.importorskip("zarr")
+
+
+def _load_bbox_cube():
+    return iris.load_cube(
+        path.join(
+            path.abspath(path.dirname(__file__)),
+            "data",
+            "input_files",
+            "LS2_Subset_01_bbox_seasonal.nc",
+        )
+    )
+
+
+def _write_zarr(cube, output_path, format_options=None):
+    return write_file(
+        iris.cube.CubeList([cube]),
+        None,
+        output_path,
+        DataFormat.ZARR,
+        None,
+        None,
+        "0.0.0TEST",
+        None,
+        format_options=format_options,
+    )
+
+
+def test_zarr_directory(tmp_path):
+    cube = _load_bbox_cube()
+    file_list = _write_zarr(cube, str(tmp_path))
+
+    # the data are written from the lazy data
+    assert cube.has_lazy_data()
+
+    group = zarr.open_group(file_list[0], mode="r")
+    data = group[cube.var_name]
+    np.testing.assert_array_equal(data[:], cube.data)
+
+    # chunked by map
+    assert data.chunks == (1, 1) + cube.shape[2:]
+    assert data.metadata.dimension_names == (
+        "ensemble_member",
+        "time",
+        "projection_y_coordinate",
+        "projection_x_coordinate",
+    )
+    assert data.attrs["units"] == "degC"
+    assert data.attrs["cell_methods"] == "time: mean"
+    assert data.attrs["grid_mapping"] == "transverse_mercator"
+    assert data.attrs["plot_label"] == cube.attributes["plot_label"]
+    assert "plot_label" not in group.attrs
+    assert group.attrs["title"] == cube.attributes["title"]
+
+    np.testing.assert_array_equal(group["time"][:], cube.coord("time").points)
+    assert group["time"].attrs["calendar"] == "360_day"
+    np.testing.assert_array_equal(group["time_bnds"][:], cube.coord("time").bounds)
+    assert group["season"][:].tolist() == cube.coord("season").points.tolist()
+    assert group["transverse_mercator"].attrs["semi_major_axis"] == 6377563.396
+
+
+def test_zarr_zip_masked(tmp_path):
+    cube = _load_bbox_cube()
+    cube.data = np.ma.masked_less(cube.data, 10)
+    sink = MemorySink()
+
+    file_list = _write_zarr(
+        cube, sink, {"store": "zip", "chunking": "time_series", "complevel": 9}
+    )
+
+    assert file_list[0].endswith(".zarr.zip")
+    zip_path = tmp_path / "output.zarr.zip"
+    zip_path.write_bytes(sink.files[file_list[0]].getvalue())
+    with zipfile.ZipFile(zip_path) as zip_file:
+        assert "zarr.json" in zip_file.namelist()
+
+    group = zarr.open_group(zarr.storage.ZipStore(zip_path, mode="r"), mode="r")
+    data = group[cube.var_name]
+    assert data.chunks[1] == cube.shape[1]
+    np.testing.assert_array_equal(data[:], cube.data.filled(1e20))
+    assert data.fill_value == np.float32(1e20)
+
+
+def test_zarr_missing_chunking_dims(tmp_path):
+    # there is no time dimension
+    cube = _load_bbox_cube()[:, 0]
+    (tmp_path / "bbox").mkdir()
+    file_list = _write_zarr(cube, str(tmp_path / "bbox"), {"chunking": "time_series"})
+    data = zarr.open_group(file_list[0], mode="r")[cube.var_name]
+    assert data.chunks == cube.shape
+    np.testing.assert_array_equal(data[:], cube.data)
+
+    # masked integer data with no X and Y dimensions
+    cube = iris.cube.Cube(
+        np.ma.masked_array(
+            [[1, 2, 3], [4, 5, 6]], dtype=np.int32, mask=[[0, 1, 0], [0, 1, 0]]
+        ),
+        var_name="count",
+    )
+    cube.add_dim_coord(iris.coords.DimCoord([1, 2], long_name="ensemble_member"), 0)
+    cube.add_dim_coord(iris.coords.DimCoord([1, 2, 3], long_name="region"), 1)
+    (tmp_path / "region").mkdir()
+    file_list = _write_zarr(cube, str(tmp_path / "region"), {"chunking": "map"})
+    data = zarr.open_group(file_list[0], mode="r")["count"]
+    assert data.chunks == cube.shape
+    assert data.fill_value == -2147483647
+    np.testing.assert_array_equal(data[:], cube.data.filled(-2147483647))
+
+
+def test_zarr_invalid_format_options(tmp_path):
+    cube = _load_bbox_cube()
+    for output_path, format_options in [
+        (str(tmp_path), {"store": "tar"}),
+        (str(tmp_path), {"complevel": 0}),
+        (str(tmp_path), {"compression": "zstd"}),
+        (MemorySink(), None),
+    ]:
+        with pytest.raises(UKCPDPInvalidParameterException):
+            _write_zarr(cube, output_path, format_options)
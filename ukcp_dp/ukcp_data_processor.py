@@ -7,6 +7,10 @@ the entry point for this package.
 
 """
 
+import itertools
+import logging
+import os
+
 from ukcp_dp._input_data import InputData
 from ukcp_dp.constants import COLLECTION_PROB, InputType, VERSION
 from ukcp_dp.data_extractor import DataExtractor
@@ -19,6 +23,20 @@ from ukcp_dp.vocab_manager import Vocab
 from ukcp_dp.utils import get_plot_settings
 
 
+LOG = logging.getLogger(__name__)
+
+# the attributes that are changed by each request of a sweep
+SWEEP_STATE = [
+    "cube_list",
+    "input_data",
+    "overlay_cube",
+    "plot_settings",
+    "plot_type",
+    "title",
+    "validated",
+]
+
+
 class UKCPDataProcessor:
     def __init__(self, process_version=None):
         self.cube_list = None
@@ -101,7 +119,19 @@ class UKCPDataProcessor:
             self.validate_inputs()
 
         file_lists = get_file_lists(self.input_data)
+        self._extract_data(file_lists)
 
+        return get_absolute_paths(file_lists)
+
+    def _extract_data(self, file_lists, cube_cache=None):
+        """
+        Extract the data from the files, using the selection criteria from the
+        validated inputs.
+
+        @param file_lists (dict): the files, as returned by get_file_lists
+        @param cube_cache (dict): optional, a cache of loaded cubes to pass to
+            the DataExtractor
+        """
         # The plot settings are customised to the first variable in the list
         # We may want to change this in the future
         if (
@@ -120,7 +150,9 @@ class UKCPDataProcessor:
             self.input_data.get_value(InputType.COLLECTION),
         )
 
-        data_extractor = DataExtractor(file_lists, self.input_data, self.plot_settings)
+        data_extractor = DataExtractor(
+            file_lists, self.input_data, self.plot_settings, cube_cache
+        )
 
         self.title = data_extractor.get_title()
         self.cube_list = data_extractor.get_cubes()
@@ -132,8 +164,6 @@ class UKCPDataProcessor:
             )
             self.cube_list = sampling_processor.get_cubes()
 
-        return get_absolute_paths(file_lists)
-
     def write_plot(self, plot_type, output_path, image_format=None, title=None):
         """
         Generate a plot.
@@ -143,11 +173,16 @@ class UKCPDataProcessor:
         to write_data_files will only write out the data used for the plot.
 
         @param plot_type (PlotType): the type of plot to generate
-        @param output_path (str): the full path to the file
-        @param image_format (ImageFormat): the format of the image to generate.
-            If None the value from the inputs will be used.
+        @param output_path (str or OutputSink): the full path to the output
+            directory or a sink, e.g. a MemorySink or ZipSink
+        @param image_format (ImageFormat or list(ImageFormat)): the format of
+            the image to generate, or a list of formats to save the same plot
+            in each of them. If None the value from the inputs will be used.
         @param title (str): optional. If a title is not provided one will be
             generated.
+
+        @return the path of the image, or a list of the paths if a list of
+            formats was given
         """
         if self.cube_list is None:
             self.select_data()
@@ -176,13 +211,42 @@ class UKCPDataProcessor:
 
         return image_file
 
-    def write_data_files(self, output_data_file_path, data_format=None):
+    def write_data_files(
+        self,
+        output_data_file_path,
+        data_format=None,
+        max_workers=None,
+        format_options=None,
+    ):
         """
         Write the data to a file.
 
-        @param output_data_file_path (str): the full path to the file
+        @param output_data_file_path (str or OutputSink): the full path to the
+            output directory or a sink, e.g. a MemorySink or ZipSink
         @param data_format (DataFormat): the type of the output data.
             If None the value from the inputs will be used.
+        @param max_workers (int): the maximum number of worker processes to use
+            when one file is written per ensemble, i.e. for CSV files and
+            shapefiles of postage stamp maps or subsets of a bbox. If None the
+            files are written in turn.
+        @param format_options (dict): options for the data format. For netCDF
+            these are:
+                complevel (int): the zlib compression level, 1 to 9. If None,
+                    the default, the files are not compressed
+                shuffle (bool): use the shuffle filter when compressing, the
+                    default is True
+                chunking (str or tuple): "map" or "time_series" to suit how the
+                    data will be read, or the chunk shape
+                least_significant_digit (int): quantise the data to this power
+                    of ten
+            For Parquet these are:
+                compression (str): the compression codec, the default is "zstd"
+                compression_level (int): the level for the codec
+            For Zarr these are:
+                store (str): "directory", the default, or "zip". A directory
+                    store can only be written to an output directory
+                chunking (str or tuple): as for netCDF, the default is "map"
+                complevel (int): the Blosc zstd compression level, 1 to 9
         """
         # validate the value of data_format
         if data_format is None:
@@ -215,6 +279,164 @@ class UKCPDataProcessor:
             self.plot_type,
             self.process_version,
             self.vocab,
+            max_workers,
+            format_options,
         )
         self.plot_type = None
         return output_file_list
+
+    def sweep(
+        self,
+        inputs,
+        axes,
+        output_path,
+        plot_type=None,
+        image_format=None,
+        data_format=None,
+        allowed_values=None,
+    ):
+        """
+        Generate the outputs for every combination of the values of the sweep
+        axes.
+
+        The inputs are expanded into one request per combination of the axes
+        values, i.e. for every region and every month. The requests are grouped
+        by the files they need, each set of files is loaded once and the data
+        for each request is then selected from the loaded data.
+
+        The outputs of each request are written to their own directory,
+        output_path/<index>, where index is the position of the request in
+        the manifest. A failure of one request does not stop the others from
+        being processed, instead the error is recorded in the manifest.
+
+        @param inputs (dict): the base inputs, as used by set_inputs
+        @param axes (dict):
+            key(string) - this should match a value from the INPUT_TYPES list
+            value(list) - the values to sweep over, each value is used in
+                place of the value of the input in the base inputs
+        @param output_path (str): the full path to the output directory
+        @param plot_type (PlotType): optional, the type of plot to generate for
+            each request
+        @param image_format (ImageFormat or list(ImageFormat)): the format of
+            the image to generate, or a list of formats. If None the value from
+            the inputs will be used.
+        @param data_format (DataFormat): optional, the format of the data files
+            to write for each request. If None the value from the inputs, if
+            any, will be used.
+        @param allowed_values (dict): optional, see set_inputs
+
+        @return a list of dicts, one per request, in the order of the
+            expansion of the axes. Each dict has the keys:
+                'axes' - a dict of the axes values for the request
+                'output_path' - the output directory for the request
+                'image_file' - the path of the plot, a list of paths if a list
+                    of image formats was given, or None
+                'data_files' - a list of the paths of the data files or None
+                'error' - a str describing an error or None
+        """
+        axis_names = list(axes.keys())
+        manifest = []
+        # the requests to process, grouped by their files
+        groups = {}
+
+        for index, values in enumerate(
+            itertools.product(*[axes[name] for name in axis_names])
+        ):
+            request_axes = dict(zip(axis_names, values))
+            entry = {
+                "axes": request_axes,
+                "output_path": os.path.join(output_path, str(index)),
+                "image_file": None,
+                "data_files": None,
+                "error": None,
+            }
+            manifest.append(entry)
+
+            request_inputs = dict(inputs)
+            request_inputs.update(request_axes)
+            try:
+                input_data = InputData(self.vocab)
+                input_data.set_inputs(request_inputs, allowed_values)
+                input_data = self.validator.validate(input_data)
+                file_lists = get_file_lists(input_data)
+            except Exception as ex:
+                LOG.warning("Sweep request %s is invalid: %s", request_axes, ex)
+                entry["error"] = str(ex)
+                continue
+
+            key = tuple(sorted(get_absolute_paths(file_lists)))
+            groups.setdefault(key, []).append((entry, input_data, file_lists))
+
+        LOG.info(
+            "Sweep of %s requests using %s sets of files", len(manifest), len(groups)
+        )
+
+        # the requests are processed using the state of this object, which is
+        # restored afterwards so that the sweep does not replace the inputs
+        # and data of set_inputs
+        saved_state = {name: getattr(self, name) for name in SWEEP_STATE}
+        try:
+            for requests in groups.values():
+                cube_cache = {}
+                for entry, input_data, file_lists in requests:
+                    try:
+                        self._sweep_request(
+                            entry,
+                            input_data,
+                            file_lists,
+                            cube_cache,
+                            plot_type,
+                            image_format,
+                            data_format,
+                        )
+                    except Exception as ex:
+                        LOG.warning("Sweep request %s failed: %s", entry["axes"], ex)
+                        entry["error"] = str(ex)
+        finally:
+            for name, value in saved_state.items():
+                setattr(self, name, value)
+
+        return manifest
+
+    def _sweep_request(
+        self,
+        entry,
+        input_data,
+        file_lists,
+        cube_cache,
+        plot_type,
+        image_format,
+        data_format,
+    ):
+        """
+        Generate the outputs for one request of a sweep.
+
+        @param entry (dict): the manifest entry for the request, this is
+            updated with the output files
+        @param input_data (InputData): the validated inputs for the request
+        @param file_lists (dict): the files, as returned by get_file_lists
+        @param cube_cache (dict): the cache of cubes loaded from the files
+        @param plot_type (PlotType): the type of plot to generate, may be None
+        @param image_format (ImageFormat or list(ImageFormat)): the format of the
+            image to generate
+        @param data_format (DataFormat): the format of the data files to write,
+            may be None
+        """
+        self.input_data = input_data
+        self.validated = True
+        self.plot_type = None
+        self._extract_data(file_lists, cube_cache)
+
+        os.makedirs(entry["output_path"], exist_ok=True)
+
+        if plot_type is not None:
+            entry["image_file"] = self.write_plot(
+                plot_type, entry["output_path"], image_format
+            )
+
+        if data_format is not None or (
+            input_data.get_value(InputType.DATA_FORMAT) is not None
+        ):
+            entry["data_files"] = self.write_data_files(
+                entry["output_path"], data_format
+            )
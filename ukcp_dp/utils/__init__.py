@@ -2,10 +2,39 @@
 This module provides common functions.
 
 """
+from ukcp_dp.utils._output_sink import (
+    DirectorySink,
+    MemorySink,
+    OutputSink,
+    ZipSink,
+    get_output_sink,
+)
+from ukcp_dp.utils._region_shapefile import (
+    RegionShapefile,
+    get_netcdf_region_name,
+    get_region_shapefile,
+    normalise_region_name,
+)
+from ukcp_dp.utils._shared_memory import from_shared_memory, to_shared_memory
 from ukcp_dp.utils._utils import (
     get_baseline_range,
     get_plot_settings,
     get_spatial_resolution_m,
 )
 
-__all__ = ["get_baseline_range", "get_plot_settings", "get_spatial_resolution_m"]
+__all__ = [
+    "DirectorySink",
+    "MemorySink",
+    "OutputSink",
+    "RegionShapefile",
+    "ZipSink",
+    "from_shared_memory",
+    "get_baseline_range",
+    "get_netcdf_region_name",
+    "get_output_sink",
+    "get_plot_settings",
+    "get_region_shapefile",
+    "get_spatial_resolution_m",
+    "normalise_region_name",
+    "to_shared_memory",
+]
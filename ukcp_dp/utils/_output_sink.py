@@ -0,0 +1,266 @@
+"""
+This module contains the output sinks. A sink is the destination that the file
+writers and plotters write their files to, a directory, memory or a zip archive.
+
+"""
+import contextlib
+import io
+import logging
+import os
+import shutil
+import tempfile
+import zipfile
+
+from ukcp_dp.exception import UKCPDPInvalidParameterException
+
+
+LOG = logging.getLogger(__name__)
+
+
+class OutputSink:
+    """
+    The base class for output sinks.
+
+    A writer gets the path for each new file from get_path and then writes the
+    file with open or local_file. The paths are what the writer returns to the
+    caller in its list of files.
+
+    """
+
+    # True if the sink can be written to by worker processes
+    supports_workers = False
+
+    def get_path(self, file_name):
+        """
+        Get the path for a new file.
+
+        @param file_name (str): the name of the file
+
+        @return a str containing the path to pass to open or local_file
+        """
+        return file_name
+
+    def open(self, path, mode="w", encoding="utf-8"):
+        """
+        Open a file for writing.
+
+        @param path (str): the path of the file, from get_path
+        @param mode (str): one of "w", "a", "wb" or "ab"
+        @param encoding (str): the encoding to use for a text file
+
+        @return a context manager that provides a file object
+        """
+        raise NotImplementedError
+
+    def local_file(self, path):
+        """
+        Get a path on the local file system for a library that can only write
+        to a named file, i.e. netCDF. The file is added to the sink when the
+        context exits.
+
+        @param path (str): the path of the file, from get_path
+
+        @return a context manager that provides the local path
+        """
+        raise NotImplementedError
+
+
+class DirectorySink(OutputSink):
+    """
+    A sink that writes the files to a directory.
+
+    """
+
+    supports_workers = True
+
+    def __init__(self, directory):
+        """
+        @param directory (str): the full path to the directory
+        """
+        self.directory = directory
+
+    def get_path(self, file_name):
+        return os.path.join(self.directory, file_name)
+
+    @contextlib.contextmanager
+    def open(self, path, mode="w", encoding="utf-8"):
+        _check_mode(mode)
+        if "b" in mode:
+            encoding = None
+
+        try:
+            with open(path, mode, encoding=encoding) as output_file:
+                yield output_file
+        except BaseException:
+            # do not leave a partly written new file behind
+            if mode.startswith("w") and os.path.exists(path):
+                os.remove(path)
+            raise
+
+    @contextlib.contextmanager
+    def local_file(self, path):
+        yield path
+
+
+class MemorySink(OutputSink):
+    """
+    A sink that keeps the files in memory.
+
+    The files are available from the files attribute, a dict of BytesIO
+    objects keyed on path, in the order that they were created.
+
+    """
+
+    def __init__(self):
+        self.files = {}
+
+    @contextlib.contextmanager
+    def open(self, path, mode="w", encoding="utf-8"):
+        _check_mode(mode)
+        if mode.startswith("w") or path not in self.files:
+            self.files[path] = io.BytesIO()
+            self.files[path].name = path
+
+        output_file = self.files[path]
+        output_file.seek(0, io.SEEK_END)
+        with _as_text_or_binary(output_file, mode, encoding) as stream:
+            yield stream
+
+    @contextlib.contextmanager
+    def local_file(self, path):
+        with _temporary_file(path) as local_path:
+            yield local_path
+            with open(local_path, "rb") as local_file:
+                self.files[path] = io.BytesIO(local_file.read())
+                self.files[path].name = path
+
+
+class ZipSink(OutputSink):
+    """
+    A sink that writes the files to a zip archive.
+
+    The archive is written as a stream, so the target does not need to be
+    seekable. A file can be appended to until another file is started, after
+    which it is complete. The sink should be closed, or used as a context
+    manager, to finish the archive.
+
+    """
+
+    def __init__(self, target, compression=zipfile.ZIP_DEFLATED):
+        """
+        @param target (str or file object): the path of the zip file or a
+            writable binary file object
+        @param compression (int): the zipfile compression method
+        """
+        self._zip_file = zipfile.ZipFile(target, "w", compression=compression)
+        self._entry = None
+        self._entry_path = None
+        self._paths = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Finish the archive.
+
+        """
+        self._close_entry()
+        self._zip_file.close()
+
+    @contextlib.contextmanager
+    def open(self, path, mode="w", encoding="utf-8"):
+        _check_mode(mode)
+        if path != self._entry_path or mode.startswith("w"):
+            self._start_entry(path)
+
+        with _as_text_or_binary(self._entry, mode, encoding) as stream:
+            yield stream
+
+    @contextlib.contextmanager
+    def local_file(self, path):
+        with _temporary_file(path) as local_path:
+            yield local_path
+            self._close_entry()
+            self._check_new_path(path)
+            self._zip_file.write(local_path, arcname=path)
+
+    def _start_entry(self, path):
+        self._close_entry()
+        self._check_new_path(path)
+        self._entry = self._zip_file.open(path, "w", force_zip64=True)
+        self._entry.name = path
+        self._entry_path = path
+
+    def _close_entry(self):
+        if self._entry is not None:
+            self._entry.close()
+            LOG.debug("%s added to zip file", self._entry_path)
+        self._entry = None
+        self._entry_path = None
+
+    def _check_new_path(self, path):
+        if path in self._paths:
+            raise UKCPDPInvalidParameterException(
+                f"Cannot write to {path}, it is already complete in the zip file"
+            )
+        self._paths.add(path)
+
+
+def get_output_sink(output):
+    """
+    Get the sink for the output of a writer or plotter.
+
+    @param output (str or OutputSink): the full path to an output directory or
+        a sink
+
+    @return an OutputSink
+    """
+    if isinstance(output, OutputSink):
+        return output
+    if isinstance(output, (str, os.PathLike)):
+        return DirectorySink(os.fspath(output))
+    raise UKCPDPInvalidParameterException(
+        f"The output must be a directory or an OutputSink, not {type(output)}"
+    )
+
+
+def _check_mode(mode):
+    if mode not in ["w", "a", "wb", "ab"]:
+        raise UKCPDPInvalidParameterException(f"Invalid file mode: {mode}")
+
+
+@contextlib.contextmanager
+def _as_text_or_binary(output_file, mode, encoding):
+    """
+    Provide a binary file object as it is or, for a text mode, wrapped for
+    writing str. Closing the wrapper must not close the underlying file object.
+
+    """
+    if "b" in mode:
+        yield output_file
+        return
+
+    stream = io.TextIOWrapper(output_file, encoding=encoding, newline="")
+    try:
+        yield stream
+    finally:
+        stream.flush()
+        stream.detach()
+
+
+@contextlib.contextmanager
+def _temporary_file(path):
+    """
+    Provide the path to a file, with the same name as path, in a new temporary
+    directory, which is removed afterwards.
+
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        yield os.path.join(directory, os.path.basename(path))
+    finally:
+        shutil.rmtree(directory)
@@ -0,0 +1,116 @@
+"""
+This module provides a process level cache of the region shapefiles.
+
+A region shapefile is read once per process, its shapes and records are kept
+in memory with an index on the region name, so the record for a region can be
+found without scanning the file.
+
+"""
+import functools
+import logging
+
+import shapefile as shp
+
+
+LOG = logging.getLogger(__name__)
+
+# the name of the field that holds the region name
+REGION_NAME_FIELD = "geo_region"
+
+# region names that differ between the netCDF files and the shapefiles, the key
+# is the name used in the netCDF files and the value the name used in the
+# shapefiles and the vocabulary
+REGION_NAME_ALIASES = {"Orkney and Shetlands": "Orkney and Shetland"}
+
+# the number of shapefiles to keep in the cache
+REGION_SHAPEFILE_CACHE_SIZE = 16
+
+
+def normalise_region_name(region):
+    """
+    Get the name of a region as it is used in the shapefiles.
+
+    @param region (str): the name of the region, as used in the netCDF files or
+        the shapefiles
+
+    @return a str containing the name of the region
+    """
+    region = str(region)
+    return REGION_NAME_ALIASES.get(region, region)
+
+
+def get_netcdf_region_name(region):
+    """
+    Get the name of a region as it is used in the netCDF files.
+
+    @param region (str): the name of the region, as used in the netCDF files or
+        the shapefiles
+
+    @return a str containing the name of the region
+    """
+    region = normalise_region_name(region)
+    for netcdf_name, shapefile_name in REGION_NAME_ALIASES.items():
+        if region == shapefile_name:
+            return netcdf_name
+    return region
+
+
+class RegionShapefile:
+    """
+    The shapes and records of a region shapefile, indexed by region name.
+
+    The instances are shared via get_region_shapefile so they should not be
+    modified.
+
+    """
+
+    def __init__(self, file_name, name_field=REGION_NAME_FIELD):
+        """
+        Read the shapefile.
+
+        @param file_name (str): the path to the shapefile
+        @param name_field (str): the name of the field that holds the region
+            name
+        """
+        LOG.debug("Reading region shapefile: %s", file_name)
+        self.file_name = file_name
+        with shp.Reader(file_name) as reader:
+            self.fields = reader.fields
+            self.shape_records = list(reader.iterShapeRecords())
+
+        self._index = {}
+        for shape_record in self.shape_records:
+            region = normalise_region_name(shape_record.record[name_field])
+            # keep the first record for a region, as a scan of the file would
+            self._index.setdefault(region, shape_record)
+
+    def get(self, region):
+        """
+        Get the shape and record of a region.
+
+        @param region (str): the name of the region, the netCDF and shapefile
+            names are both accepted
+
+        @return a shapefile ShapeRecord, or None if the region is not in the file
+        """
+        return self._index.get(normalise_region_name(region))
+
+    def get_region_names(self):
+        """
+        Get the names of the regions in the file.
+
+        @return a list of the region names, as used in the shapefile
+        """
+        return list(self._index)
+
+
+@functools.lru_cache(maxsize=REGION_SHAPEFILE_CACHE_SIZE)
+def get_region_shapefile(file_name):
+    """
+    Get a region shapefile from the cache, reading it if it is not in the cache.
+
+    @param file_name (str): the path to the shapefile
+
+    @return a RegionShapefile
+    """
+    return RegionShapefile(file_name)
@@ -0,0 +1,43 @@
+"""
+This module provides functions to pass arrays to worker processes in shared
+memory, rather than having them pickled.
+
+"""
+import logging
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+LOG = logging.getLogger(__name__)
+
+
+def to_shared_memory(array, shared_blocks):
+    """
+    Copy an array into a new block of shared memory.
+
+    @param array (numpy array): the array to copy
+    @param shared_blocks (list): the list to add the new SharedMemory to, the
+        caller is responsible for closing and unlinking it
+
+    @return a tuple of (name, shape, dtype) that can be passed to
+        from_shared_memory
+    """
+    shared_block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared_blocks.append(shared_block)
+    shared_array = np.ndarray(array.shape, dtype=array.dtype, buffer=shared_block.buf)
+    shared_array[...] = array
+    return shared_block.name, array.shape, array.dtype.str
+
+
+def from_shared_memory(spec):
+    """
+    Attach to a block of shared memory created by to_shared_memory.
+
+    @param spec (tuple): the (name, shape, dtype) of the block
+
+    @return a tuple of the SharedMemory and a numpy array using its buffer
+    """
+    name, shape, dtype = spec
+    shared_block = shared_memory.SharedMemory(name=name)
+    return shared_block, np.ndarray(shape, dtype=dtype, buffer=shared_block.buf)
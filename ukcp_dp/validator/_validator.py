@@ -23,34 +23,92 @@ from ukcp_dp.constants import (
     AreaType,
     TemporalAverageType,
 )
+from ukcp_dp._input_data import InputData
 from ukcp_dp.vocab_manager import get_ensemble_member_set
 
 
 LOG = logging.getLogger(__name__)
 
 
+# the names of the checks, in the order that they are run, the method for a
+# check is _validate_<name>
+CHECKS = [
+    "spatial_rep",
+    "convert_to_percentiles",
+    "overlay_probability_levels",
+    "time_slice",
+    "colour_mode",
+    "ensemble_members",
+    "highlighted_ensemble_members",
+    "time_period",
+    "baseline",
+    "sampling",
+    "data_type",
+]
+
+
 class Validator:
     def __init__(self, vocab):
         self.vocab = vocab
         self.input_data = None
+        self._checks = [
+            (check, getattr(self, "_validate_{}".format(check))) for check in CHECKS
+        ]
+        # allowed ensemble members, keyed by collection
+        self._allowed_ensembles = {}
+        self._min_year = None
 
     def validate(self, input_data):
         LOG.debug("validate")
         self.input_data = input_data
-        self._validate_spatial_rep()
-        self._validate_convert_to_percentiles()
-        self._validate_overlay_probability_levels()
-        self._validate_time_slice()
-        self._validate_colour_mode()
-        self._validate_ensemble_members()
-        self._validate_highlighted_ensemble_members()
-        self._validate_time_period()
-        self._validate_baseline()
-        self._validate_sampling()
-        self._validate_data_type()
+        for _, check in self._checks:
+            check()
 
         return self.input_data
 
+    def validate_many(self, list_of_inputs, allowed_values=None):
+        """
+        Validate a list of user inputs.
+
+        Unlike validate, which stops at the first problem, every check is run
+        for each set of inputs so that all of the problems are reported. The
+        vocabulary and the validator are shared between all of the inputs.
+
+        @param list_of_inputs (list(dict)): a list of user inputs, each in the
+            form expected by InputData.set_inputs
+        @param allowed_values (dict): an optional dict of allowed values, see
+            InputData.set_inputs, applied to all of the inputs
+
+        @return a list containing a list of errors for each set of inputs, in
+            the same order as list_of_inputs. Each error is a dict with the
+            keys:
+                'check' - the name of the check that failed, 'inputs' if
+                    the inputs were not accepted by InputData
+                'message' - the error message
+            The list of errors is empty if the inputs are valid.
+        """
+        LOG.debug("validate_many: %s sets of inputs", len(list_of_inputs))
+        results = []
+        for inputs in list_of_inputs:
+            input_data = InputData(self.vocab)
+            try:
+                input_data.set_inputs(inputs, allowed_values)
+            except Exception as ex:
+                results.append([{"check": "inputs", "message": str(ex)}])
+                continue
+
+            self.input_data = input_data
+            errors = []
+            for name, check in self._checks:
+                try:
+                    check()
+                except Exception as ex:
+                    errors.append({"check": name, "message": str(ex)})
+            results.append(errors)
+
+        self.input_data = None
+        return results
+
     def _validate_collection(self):
         # this must always be set
         if self.input_data.get_value(InputType.COLLECTION) is None:
@@ -188,7 +246,9 @@ class Validator:
         elif self.input_data.get_value(InputType.COLLECTION) == COLLECTION_OBS:
             min_allowed_year = COLLECTION_OBS_MIN_YEAR
         else:
-            min_allowed_year = min(self.vocab.get_collection_terms("year_minimum"))
+            if self._min_year is None:
+                self._min_year = min(self.vocab.get_collection_terms("year_minimum"))
+            min_allowed_year = self._min_year
 
         if self.input_data.get_value(InputType.YEAR_MINIMUM) < min_allowed_year:
             raise Exception(
@@ -235,14 +295,9 @@ class Validator:
         self._validate_ensembles(ensembles, InputType.HIGHLIGHTED_ENSEMBLE_MEMBERS)
 
     def _validate_ensembles(self, ensembles, input_type):
-        allowed_ensembles = get_ensemble_member_set(
+        allowed_ensembles = self._get_allowed_ensembles(
             self.input_data.get_value(InputType.COLLECTION)
         )
-        if self.input_data.get_value(InputType.COLLECTION) in [
-            COLLECTION_CPM,
-            COLLECTION_RCM,
-        ]:
-            allowed_ensembles.extend(get_ensemble_member_set("land-cmip5_4"))
         if allowed_ensembles is None:
             raise Exception(
                 "Unable to get list of valid ensembles for {}".format(
@@ -260,6 +315,27 @@ class Validator:
                     )
                 )
 
+    def _get_allowed_ensembles(self, collection):
+        """
+        Get the set of ensemble members that are valid for the collection.
+
+        @param collection (str): the name of the collection
+
+        @return a set of ensemble members or None if the collection does not
+            have ensemble members
+        """
+        try:
+            return self._allowed_ensembles[collection]
+        except KeyError:
+            pass
+        allowed_ensembles = get_ensemble_member_set(collection)
+        if allowed_ensembles is not None:
+            allowed_ensembles = set(allowed_ensembles)
+            if collection in [COLLECTION_CPM, COLLECTION_RCM]:
+                allowed_ensembles.update(get_ensemble_member_set("land-cmip5_4"))
+        self._allowed_ensembles[collection] = allowed_ensembles
+        return allowed_ensembles
+
     def _validate_time_period(self):
         # if a temporal average type is set then check the time period is valid
         # for that type
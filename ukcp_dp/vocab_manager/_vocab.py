@@ -106,7 +106,9 @@ class Vocab:
             "none": "Don't save the data",
             "csv": "CSV",
             "netcdf": "CF-netCDF",
+            "parquet": "Apache Parquet",
             "shp": "Shapefile",
+            "zarr": "Zarr",
         },
         "gwl": {
             "gwl1.0": "1.0°C above pre-industrial",
@@ -260,6 +262,31 @@ class Vocab:
         self._load_cv(CV_Type.RIVER_BASIN)
         self.vocab[CV_Type.RIVER_BASIN]["all"] = "All river basins"
 
+        self._build_label_indexes()
+
+    def _build_label_indexes(self):
+        """
+        Build the reverse (label to value) indexes used by
+        get_collection_term_value.
+
+        Two indexes are built for each collection, one keyed on the exact label
+        and one keyed on the case normalised label. Where more than one term
+        has the same label the first term is used, as per the order of the
+        collection.
+        """
+        self._label_index = {}
+        self._normalised_label_index = {}
+        for collection, terms in self.vocab.items():
+            if not isinstance(terms, dict):
+                continue
+            label_index = {}
+            normalised_label_index = {}
+            for value, label in terms.items():
+                label_index.setdefault(label, value)
+                normalised_label_index.setdefault(_normalise(label), value)
+            self._label_index[collection] = label_index
+            self._normalised_label_index[collection] = normalised_label_index
+
     def _load_cv(self, cv_type):
         """
         Load in UKCP18 vocab.
@@ -320,6 +347,9 @@ class Vocab:
         """
         Get the value associated with a given collection term label.
 
+        An exact match of the label is preferred, otherwise the label is
+        matched ignoring case and surrounding white space.
+
         @param collection (str): the name of the collection
         @param label (str): the label off a term from the collection
 
@@ -327,13 +357,17 @@ class Vocab:
             label
         """
         try:
-            label_dict = self.vocab[collection]
+            label_index = self._label_index[collection]
         except KeyError:
             return None
-        for key in label_dict.keys():
-            if label_dict[key] == label:
-                return key
-        return None
+        try:
+            return label_index[label]
+        except (KeyError, TypeError):
+            pass
+        try:
+            return self._normalised_label_index[collection][_normalise(label)]
+        except (KeyError, TypeError):
+            return None
 
     def get_collection_label(self, collection):
         """
@@ -349,6 +383,20 @@ class Vocab:
             return collection
 
 
+def _normalise(label):
+    """
+    Normalise a label for case insensitive matching.
+
+    @param label (obj): the label, only str labels are altered
+
+    @return the label, in lower case and stripped of surrounding white space if
+        it is a str
+    """
+    if isinstance(label, str):
+        return label.strip().lower()
+    return label
+
+
 def _get_range(min_value, max_value):
     values = {}
     for i in range(min_value, max_value):